@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import DailyProductSales, DailySales
+
+
+@admin.register(DailySales)
+class DailySalesAdmin(admin.ModelAdmin):
+    """Rollup গুলো শুধু দেখার জন্য (rollups.py update করে)"""
+    list_display = ['date', 'city', 'payment_method', 'orders', 'units', 'revenue', 'shipping']
+    list_filter = ['payment_method']
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(DailySalesAdmin):
+    list_display = ['date', 'product_name', 'category', 'units', 'revenue']
+    list_filter = []
+    list_select_related = ['category']
@@ -0,0 +1,25 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Order history থেকে sales rollup tables আবার বানাও (chunk করে)। '
+        'চলার সময় নতুন order একবারই ধরা হয়, কিন্তু পুরনো order এর status বদলালে '
+        'সেটা ভুল হতে পারে, তাই কম traffic এর সময় চালাও'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=date.fromisoformat,
+            help='YYYY-MM-DD: শুধু এই দিন থেকে rebuild করো (না দিলে সব)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='প্রতি transaction এ কয়টা order')
+
+    def handle(self, *args, **options):
+        counted = rebuild(since=options['since'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'{counted} order(s) rolled up'))
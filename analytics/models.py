@@ -0,0 +1,64 @@
+# analytics/models.py
+
+from django.db import models
+from products.models import Category, Product
+
+
+class DailySales(models.Model):
+    """
+    📊 দিন + city + payment method অনুযায়ী sales এর running total
+    (cancelled order বাদে; analytics.rollups incremental ভাবে update করে)
+    """
+    date = models.DateField()
+    city = models.CharField(max_length=50)
+    payment_method = models.CharField(max_length=20)
+
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    shipping = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'city', 'payment_method'], name='unique_daily_sales'),
+        ]
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date} {self.city} {self.payment_method}: {self.revenue}"
+
+
+class DailyProductSales(models.Model):
+    """
+    📦 দিন + product অনুযায়ী units ও revenue (category order এর সময়ের)
+    Product delete হলেও rollup থাকে, তাই database constraint নেই; তখন product
+    NULL আর row টা product_name দিয়ে চেনা যায় (rollups.detach_product)
+    """
+    date = models.DateField()
+    product = models.ForeignKey(
+        Product, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, related_name='+')
+    category = models.ForeignKey(
+        Category, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, related_name='+')
+    product_name = models.CharField(max_length=200)
+
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'product'], name='unique_daily_product_sales'),
+            models.UniqueConstraint(
+                fields=['date', 'product_name'], condition=models.Q(product__isnull=True),
+                name='unique_daily_deleted_product_sales'),
+        ]
+        indexes = [
+            models.Index(fields=['category', 'date'], name='product_sales_category_idx'),
+        ]
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date} {self.product_name}: {self.units}"
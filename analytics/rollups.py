@@ -0,0 +1,292 @@
+"""
+Sales rollups
+
+Order history scan না করে report দেওয়ার জন্য DailySales ও DailyProductSales
+এ running total রাখা হয়:
+
+    place_order()            -> record_order() (checkout এর transaction এ)
+    অন্যভাবে তৈরি order       -> signals.py: order (তখনকার items সহ) ও পরে
+                                যোগ হওয়া প্রতিটা OrderItem (admin, shell, fixture)
+    Order status/city/... বদল -> signals.py, পুরনো row থেকে বাদ, নতুন row এ যোগ
+    rebuild_sales_rollups    -> history থেকে chunk করে আবার বানাও
+
+Cancelled order rollup এ ধরা হয় না। Product delete হলে OrderItem.product NULL
+হয়ে যায়; সেই items বাদ না দিয়ে product_name দিয়ে key করা row এ ধরা হয়
+(product_key), যাতে যোগ, বিয়োগ ও rebuild সবসময় একই items দেখে।
+প্রতিটা update এ query সংখ্যা
+order এর item সংখ্যার উপর নির্ভর করে না: missing rows একটা
+INSERT .. ON CONFLICT DO NOTHING এ তৈরি হয়, তারপর এক UPDATE এ
+CASE দিয়ে সব row এর total বাড়ে/কমে।
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Max, Q, Sum, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from orders.filters import start_of_day
+from orders.models import Order, OrderItem
+from .models import DailyProductSales, DailySales
+
+EXCLUDED_STATUSES = ('cancelled',)
+SNAPSHOT_FIELDS = ('status', 'created_at', 'city', 'payment_method',
+                   'total_amount', 'shipping_cost')
+
+# SQLite এ লম্বা OR chain এর expression depth limit আছে
+UPDATE_BATCH_SIZE = 200
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def order_snapshot(order):
+    """
+    Rollup এ order টা কোথায় কতটা ধরা আছে: (date, city, payment_method,
+    total_amount, shipping_cost), cancelled হলে False। Field deferred থাকলে None
+    """
+    values = order.__dict__
+    if any(values.get(name) is None for name in SNAPSHOT_FIELDS):
+        return None
+    if values['status'] in EXCLUDED_STATUSES:
+        return False
+    return (
+        timezone.localdate(values['created_at']),
+        values['city'],
+        values['payment_method'],
+        values['total_amount'],
+        values['shipping_cost'],
+    )
+
+
+def item_values(items):
+    """OrderItem queryset -> record_order এর items format"""
+    return list(items.values(
+        'product_id', 'product_name', 'quantity',
+        price=F('product_price'), category_id=F('product__category_id')))
+
+
+def order_items(order):
+    """Rollup এর জন্য order এর সব items (product delete হয়ে গেলে product_id None)"""
+    return item_values(OrderItem.objects.filter(order=order))
+
+
+def product_key(date, product_id, product_name):
+    """DailyProductSales এর row: product থাকলে id দিয়ে, delete হয়ে গেলে নাম দিয়ে"""
+    if product_id is None:
+        return {'date': date, 'product_id': None, 'product_name': product_name}
+    return {'date': date, 'product_id': product_id}
+
+
+class RollupDelta:
+    """কয়েকটা order এর যোগ/বিয়োগ জমা করে একবারে save করে"""
+
+    def __init__(self):
+        self.sales = defaultdict(Counter)
+        self.products = defaultdict(Counter)
+        self.product_info = {}
+
+    def add(self, snapshot, items, sign=1, count_order=True):
+        """count_order=False: order আগেই গোনা, শুধু items এর units/revenue"""
+        if not snapshot:
+            return
+        date, city, payment_method, total_amount, shipping_cost = snapshot
+        sales = self.sales[(date, city, payment_method)]
+        if count_order:
+            sales['orders'] += sign
+            sales['revenue'] += sign * total_amount
+            sales['shipping'] += sign * shipping_cost
+        for item in items:
+            sales['units'] += sign * item['quantity']
+            key = (date, item['product_id'],
+                   item['product_name'] if item['product_id'] is None else None)
+            self.products[key]['units'] += sign * item['quantity']
+            self.products[key]['revenue'] += sign * item['price'] * item['quantity']
+            self.product_info.setdefault(key, {
+                'category_id': item['category_id'],
+                'product_name': item['product_name'],
+            })
+
+    def save(self):
+        increment(DailySales, [
+            ({'date': date, 'city': city, 'payment_method': payment_method}, {}, deltas)
+            for (date, city, payment_method), deltas in self.sales.items()
+        ])
+        increment(DailyProductSales, [
+            (product_key(*key), self.product_info[key], deltas)
+            for key, deltas in self.products.items()
+        ])
+
+
+def increment(model, rows):
+    """
+    rows: [(key, defaults, {field: delta})] — row না থাকলে তৈরি করো, তারপর
+    এক UPDATE এ সব row এর field গুলো delta পরিমাণ বাড়াও
+    """
+    rows = [
+        (key, defaults, {field: delta for field, delta in deltas.items() if delta})
+        for key, defaults, deltas in rows
+    ]
+    rows = [row for row in rows if row[2]]
+    for start in range(0, len(rows), UPDATE_BATCH_SIZE):
+        batch = rows[start:start + UPDATE_BATCH_SIZE]
+        model.objects.bulk_create(
+            [model(**{**defaults, **key}) for key, defaults, _ in batch],
+            ignore_conflicts=True)
+
+        condition = Q()
+        cases = defaultdict(list)
+        for key, _, deltas in batch:
+            match = Q(**key)
+            condition |= match
+            for field, delta in deltas.items():
+                cases[field].append(When(match, then=F(field) + delta))
+        model.objects.filter(condition).update(**{
+            field: Case(*whens, default=F(field))
+            for field, whens in cases.items()
+        })
+
+
+def record_order(order, items):
+    """
+    নতুন order rollup এ যোগ করো (checkout transaction এর ভেতরে call করো)
+    items: [{product_id, category_id, product_name, price, quantity}]
+    """
+    snapshot = order_snapshot(order)
+    delta = RollupDelta()
+    delta.add(snapshot, items)
+    delta.save()
+    order._rollup_snapshot = snapshot
+
+
+def record_items(order, items):
+    """Counted order এ পরে যোগ হওয়া items (admin inline, shell) rollup এ যোগ করো"""
+    snapshot = order_snapshot(order)
+    if not snapshot:
+        return
+    delta = RollupDelta()
+    delta.add(snapshot, items, count_order=False)
+    with transaction.atomic():
+        delta.save()
+
+
+def apply_order_change(order, old_snapshot, new_snapshot):
+    """Order edit: পুরনো জায়গা থেকে বাদ দিয়ে নতুন জায়গায় যোগ করো"""
+    if old_snapshot == new_snapshot:
+        return
+    items = order_items(order)
+    delta = RollupDelta()
+    delta.add(old_snapshot, items, sign=-1)
+    delta.add(new_snapshot, items)
+    with transaction.atomic():
+        delta.save()
+
+
+def detach_product(product_id):
+    """
+    Product delete এর আগে: তার rows থেকে items নাম দিয়ে key করা rows এ সরাও
+    (এরপর items এর product NULL, পরের বিয়োগ/rebuild নাম দিয়েই হিসাব করে)
+    Category থেকে যায়; rebuild এ deleted product এর category আর জানা যায় না
+    """
+    delta = RollupDelta()
+    for row in (OrderItem.objects.filter(product_id=product_id)
+                .exclude(order__status__in=EXCLUDED_STATUSES)
+                .values('product_name', 'product__category_id',
+                        date=TruncDate('order__created_at'))
+                .annotate(units=Sum('quantity'),
+                          revenue=Sum(F('product_price') * F('quantity'), output_field=MONEY))
+                .order_by()):
+        for sign, key in ((-1, (row['date'], product_id, None)),
+                          (1, (row['date'], None, row['product_name']))):
+            delta.products[key]['units'] += sign * row['units']
+            delta.products[key]['revenue'] += sign * row['revenue']
+            delta.product_info[key] = {
+                'category_id': row['product__category_id'],
+                'product_name': row['product_name'],
+            }
+    delta.save()
+    DailyProductSales.objects.filter(product_id=product_id, units=0, revenue=0).delete()
+
+
+def rebuild(since=None, chunk_size=1000):
+    """
+    Order history থেকে rollup আবার বানাও (since দিলে শুধু সেই দিন থেকে)
+    Orders id অনুযায়ী chunk এ পড়া হয়, প্রতিটা chunk এর aggregate database
+    এ হয় — memory order সংখ্যার উপর নির্ভর করে না। কতগুলো order ধরা হলো return করে
+
+    Rows মোছার transaction এ সবচেয়ে বড় order id পড়া হয়, rebuild শুধু তার
+    নিচের orders নেয়: এর পরের নতুন orders record_order এ একবারই ধরা হয়।
+    Rebuild চলার সময় পুরনো order edit হলে সেটা ভুল হতে পারে, তখন আবার চালাও
+    """
+    sales = DailySales.objects.all()
+    products = DailyProductSales.objects.all()
+    orders = Order.objects.exclude(status__in=EXCLUDED_STATUSES).order_by('id')
+    if since:
+        sales = sales.filter(date__gte=since)
+        products = products.filter(date__gte=since)
+        orders = orders.filter(created_at__gte=start_of_day(since))
+
+    with transaction.atomic():
+        sales.delete()
+        products.delete()
+        high_water = Order.objects.aggregate(last=Max('id'))['last'] or 0
+    orders = orders.filter(id__lte=high_water)
+
+    counted = 0
+    last_id = 0
+    while True:
+        ids = list(orders.filter(id__gt=last_id).values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return counted
+        with transaction.atomic():
+            rebuild_chunk(ids)
+        counted += len(ids)
+        last_id = ids[-1]
+
+
+def rebuild_chunk(order_ids):
+    day = TruncDate('created_at')
+    item_day = TruncDate('order__created_at')
+
+    sales = defaultdict(Counter)
+    for row in (Order.objects.filter(id__in=order_ids)
+                .values('city', 'payment_method', date=day)
+                .annotate(orders=Count('id'),
+                          revenue=Sum('total_amount'),
+                          shipping=Sum('shipping_cost'))
+                .order_by()):
+        sales[(row['date'], row['city'], row['payment_method'])].update({
+            'orders': row['orders'], 'revenue': row['revenue'], 'shipping': row['shipping'],
+        })
+    for row in (OrderItem.objects.filter(order_id__in=order_ids)
+                .values(date=item_day, city=F('order__city'),
+                        payment_method=F('order__payment_method'))
+                .annotate(units=Sum('quantity'))
+                .order_by()):
+        sales[(row['date'], row['city'], row['payment_method'])]['units'] += row['units']
+
+    items = OrderItem.objects.filter(order_id__in=order_ids)
+    totals = {
+        'units': Sum('quantity'),
+        'revenue': Sum(F('product_price') * F('quantity'), output_field=MONEY),
+        'category_id': Max('product__category_id'),
+    }
+    # Product আছে: id অনুযায়ী; delete হয়ে গেছে: নাম অনুযায়ী (আলাদা query)
+    rows = [
+        *(items.filter(product__isnull=False).values('product_id', date=item_day)
+          .annotate(**totals, product_name=Max('product_name')).order_by()),
+        *(items.filter(product__isnull=True).values('product_name', date=item_day)
+          .annotate(**totals, product_id=Max('product_id')).order_by()),
+    ]
+    products = [
+        (product_key(row['date'], row['product_id'], row['product_name']),
+         {'category_id': row['category_id'], 'product_name': row['product_name']},
+         {'units': row['units'], 'revenue': row['revenue']})
+        for row in rows
+    ]
+
+    increment(DailySales, [
+        ({'date': date, 'city': city, 'payment_method': payment_method}, {}, deltas)
+        for (date, city, payment_method), deltas in sales.items()
+    ])
+    increment(DailyProductSales, products)
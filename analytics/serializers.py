@@ -0,0 +1,31 @@
+# analytics/serializers.py
+
+from rest_framework import serializers
+
+
+class SalesReportQuerySerializer(serializers.Serializer):
+    """
+    Sales report এর query params
+    ?group_by=day|city|payment_method&date_from=&date_to=
+    """
+    GROUP_BY_CHOICES = ['day', 'city', 'payment_method']
+
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, required=False, default='day')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if data.get('date_from') and data.get('date_to') and data['date_from'] > data['date_to']:
+            raise serializers.ValidationError('date_from must be before date_to')
+        return data
+
+
+class ProductReportQuerySerializer(SalesReportQuerySerializer):
+    """
+    Top products / categories
+    ?group_by=product|category&date_from=&date_to=&limit=
+    """
+    GROUP_BY_CHOICES = ['product', 'category']
+
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, required=False, default='product')
+    limit = serializers.IntegerField(min_value=1, max_value=100, required=False, default=20)
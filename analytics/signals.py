@@ -0,0 +1,61 @@
+from django.db.models.signals import post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from orders.models import Order, OrderItem
+from products.models import Product
+from .rollups import (
+    RollupDelta, apply_order_change, detach_product, item_values, order_items,
+    order_snapshot, record_items, record_order,
+)
+
+
+@receiver(post_init, sender=Order)
+def remember_rollup_snapshot(sender, instance, **kwargs):
+    """Load এর সময়ের status/city/... মনে রাখো, save এ কী বদলালো বোঝার জন্য"""
+    instance._rollup_snapshot = order_snapshot(instance)
+
+
+@receiver(post_save, sender=Order)
+def update_rollups_on_change(sender, instance, created, **kwargs):
+    """
+    Status বদল (admin list_editable সহ) বা city/payment/amount edit হলে rollup ঠিক করো
+    নতুন order: place_order() নিজেই items সহ record করে; admin/shell/fixture এ
+    তৈরি হলে এখানে record হয় (পরে যোগ হওয়া items record_item_on_create এ)
+    (QuerySet.update() বা item edit এ signal চলে না — তখন rebuild_sales_rollups চালাও)
+    """
+    if created:
+        if not getattr(instance, '_rollup_recorded', False):
+            record_order(instance, order_items(instance))
+        return
+    old_snapshot = instance._rollup_snapshot
+    new_snapshot = order_snapshot(instance)
+    if old_snapshot is None or new_snapshot is None:
+        return
+    apply_order_change(instance, old_snapshot, new_snapshot)
+    instance._rollup_snapshot = new_snapshot
+
+
+@receiver(post_save, sender=OrderItem)
+def record_item_on_create(sender, instance, created, **kwargs):
+    """
+    আগে থেকে থাকা order এ item যোগ (admin inline, shell, fixture) হলে units যোগ করো
+    place_order() items bulk_create করে (signal চলে না), record_order এ ধরা হয়
+    """
+    if created:
+        record_items(instance.order, item_values(OrderItem.objects.filter(pk=instance.pk)))
+
+
+@receiver(pre_delete, sender=Order)
+def remove_from_rollups(sender, instance, **kwargs):
+    """Items cascade এ মুছে যাওয়ার আগে order টা rollup থেকে বাদ দাও"""
+    snapshot = order_snapshot(instance)
+    if snapshot:
+        delta = RollupDelta()
+        delta.add(snapshot, order_items(instance), sign=-1)
+        delta.save()
+
+
+@receiver(pre_delete, sender=Product)
+def detach_deleted_product(sender, instance, **kwargs):
+    """Items এর product NULL হওয়ার আগে তার rollup rows নাম দিয়ে key করো"""
+    detach_product(instance.pk)
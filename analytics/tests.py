@@ -0,0 +1,192 @@
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from orders.models import Order
+from orders.tests import ORDER_DATA, add_to_cart, checkout
+from products.models import Category, Product
+from . import rollups
+from .models import DailyProductSales, DailySales
+
+
+class SalesRollupTest(TestCase):
+
+    def setUp(self):
+        self.makeup = Category.objects.create(name='Makeup')
+        self.skincare = Category.objects.create(name='Skincare')
+        self.lipstick = Product.objects.create(
+            name='Lipstick', description='Red', price=100, category=self.makeup, stock=50)
+        self.cream = Product.objects.create(
+            name='Cream', description='Soft', price=250, category=self.skincare, stock=50)
+        User.objects.create_user('finance', password='secret', is_staff=True)
+
+    def place(self, *lines):
+        for product, quantity in lines:
+            add_to_cart(self.client, product, quantity)
+        response = checkout(self.client)
+        self.assertEqual(response.status_code, 201)
+        return Order.objects.get(id=response.json()['order']['id'])
+
+    def snapshot(self):
+        return (
+            sorted(DailySales.objects.values_list(
+                'date', 'city', 'payment_method', 'orders', 'units', 'revenue', 'shipping')),
+            # Deleted product এর row এ product_id None
+            sorted(DailyProductSales.objects.values_list(
+                'date', 'product_id', 'category_id', 'units', 'revenue'),
+                key=lambda row: (row[0], row[1] or 0)),
+        )
+
+    def test_checkout_updates_rollups(self):
+        self.place((self.lipstick, 2), (self.cream, 1))
+        self.place((self.lipstick, 1))
+
+        sales = DailySales.objects.get()
+        self.assertEqual((sales.orders, sales.units, sales.revenue), (2, 4, Decimal('550')))
+        self.assertEqual(sales.city, ORDER_DATA['city'])
+        lipstick = DailyProductSales.objects.get(product=self.lipstick)
+        self.assertEqual((lipstick.units, lipstick.revenue), (3, Decimal('300')))
+        self.assertEqual(lipstick.category_id, self.makeup.id)
+
+    def test_status_and_city_changes_move_totals(self):
+        order = self.place((self.cream, 2))
+        self.place((self.lipstick, 1))
+
+        order.city = 'Khulna'
+        order.save()
+        self.assertEqual(DailySales.objects.get(city='Khulna').revenue, Decimal('500'))
+        self.assertEqual(DailySales.objects.get(city='Dhaka').revenue, Decimal('100'))
+
+        order.status = 'cancelled'
+        order.save()
+        self.assertEqual(DailySales.objects.get(city='Khulna').orders, 0)
+        self.assertEqual(DailyProductSales.objects.get(product=self.cream).units, 0)
+
+        # আবার চালু করলে ফিরে আসে
+        order = Order.objects.get(id=order.id)
+        order.status = 'confirmed'
+        order.save()
+        self.assertEqual(DailyProductSales.objects.get(product=self.cream).units, 2)
+
+    def test_rebuild_matches_incremental(self):
+        first = self.place((self.lipstick, 2), (self.cream, 1))
+        self.place((self.cream, 3))
+        self.place((self.lipstick, 1))
+        first.status = 'cancelled'
+        first.save()
+        incremental = self.snapshot()
+
+        call_command('rebuild_sales_rollups', chunk_size=2, stdout=io.StringIO())
+        rebuilt = self.snapshot()
+        # Cancelled order এর zero row গুলো rebuild এ তৈরি হয় না
+        self.assertEqual(
+            [row for row in incremental[0] if row[3]], rebuilt[0])
+        self.assertEqual(
+            [row for row in incremental[1] if row[3]], rebuilt[1])
+
+    def test_rebuild_ignores_orders_placed_while_running(self):
+        self.place((self.lipstick, 1))
+        self.place((self.lipstick, 2))
+        rebuild_chunk = rollups.rebuild_chunk
+        placed = []
+
+        def chunk_then_checkout(order_ids):
+            rebuild_chunk(order_ids)
+            if not placed:
+                # record_order এ ধরা হয়, পরের chunk এ আবার না
+                placed.append(self.place((self.cream, 1)))
+
+        with mock.patch.object(rollups, 'rebuild_chunk', side_effect=chunk_then_checkout):
+            self.assertEqual(rollups.rebuild(chunk_size=1), 2)
+
+        sales = DailySales.objects.get()
+        self.assertEqual((sales.orders, sales.units), (3, 4))
+        self.assertEqual(DailyProductSales.objects.get(product=self.cream).units, 1)
+
+    def test_deleted_product_items_are_kept_by_name(self):
+        order = self.place((self.cream, 2), (self.lipstick, 1))
+        self.place((self.cream, 1))
+        cream_id = self.cream.id
+        self.cream.delete()
+
+        deleted = DailyProductSales.objects.get(product=None)
+        self.assertEqual((deleted.product_name, deleted.units), ('Cream', 3))
+        self.assertEqual(deleted.category_id, self.skincare.id)
+        self.assertFalse(DailyProductSales.objects.filter(product_id=cream_id).exists())
+
+        self.client.login(username='finance', password='secret')
+        data = self.client.get('/api/analytics/products/').json()
+        self.assertEqual(
+            [(row['key'], row['name'], row['units']) for row in data['results']],
+            [(None, 'Cream', 3), (self.lipstick.id, 'Lipstick', 1)])
+
+        # Cancel করলে deleted product এর items ও বাদ যায়
+        order.status = 'cancelled'
+        order.save()
+        sales = DailySales.objects.get()
+        self.assertEqual((sales.orders, sales.units, sales.revenue), (1, 1, Decimal('250')))
+        self.assertEqual(DailyProductSales.objects.get(product=None).units, 1)
+
+        incremental = self.snapshot()
+        call_command('rebuild_sales_rollups', stdout=io.StringIO())
+        rebuilt = self.snapshot()
+        self.assertEqual([row for row in incremental[0] if row[3]], rebuilt[0])
+        # Rebuild এ deleted product এর category জানা যায় না
+        self.assertEqual(
+            [row[:2] + row[3:] for row in incremental[1] if row[3]],
+            [row[:2] + row[3:] for row in rebuilt[1]])
+
+    def test_orders_created_outside_checkout(self):
+        # Admin/shell: order আগে, items পরে আলাদা করে save হয়
+        order = Order.objects.create(
+            customer_name='Walk-in', customer_email='shop@example.com',
+            customer_phone='01700000000', shipping_address='Shop', city='Sylhet',
+            payment_method='cod', total_amount=350, shipping_cost=60)
+        for product, quantity in ((self.lipstick, 1), (self.cream, 1)):
+            order.items.create(product=product, product_name=product.name,
+                               product_price=product.price, quantity=quantity)
+        sales = DailySales.objects.get(city='Sylhet')
+        self.assertEqual((sales.orders, sales.units, sales.revenue), (1, 2, Decimal('350')))
+        self.assertEqual(DailyProductSales.objects.get(product=self.cream).units, 1)
+
+        incremental = self.snapshot()
+        call_command('rebuild_sales_rollups', stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), incremental)
+
+        order = Order.objects.get(id=order.id)
+        order.status = 'cancelled'
+        order.save()
+        sales = DailySales.objects.get(city='Sylhet')
+        self.assertEqual((sales.orders, sales.units, sales.revenue, sales.shipping),
+                         (0, 0, 0, 0))
+        self.assertEqual(
+            list(DailyProductSales.objects.values_list('units', 'revenue')), [(0, 0), (0, 0)])
+
+    def test_delete_removes_order(self):
+        order = self.place((self.cream, 1))
+        order.delete()
+        self.assertEqual(DailySales.objects.get().orders, 0)
+        self.assertEqual(DailyProductSales.objects.get().units, 0)
+
+    def test_reports_read_rollups(self):
+        self.place((self.lipstick, 2), (self.cream, 1))
+        self.place((self.cream, 1))
+        self.assertEqual(self.client.get('/api/analytics/sales/').status_code, 403)
+
+        self.client.login(username='finance', password='secret')
+        with self.assertNumQueries(3):  # user + totals + grouped results
+            data = self.client.get('/api/analytics/sales/?group_by=city').json()
+        self.assertEqual(data['results'][0]['key'], 'Dhaka')
+        self.assertEqual(Decimal(data['totals']['revenue']), Decimal('700'))
+
+        data = self.client.get('/api/analytics/products/?group_by=category').json()
+        self.assertEqual(
+            [(row['name'], row['units']) for row in data['results']],
+            [('Skincare', 2), ('Makeup', 2)])
+
+        response = self.client.get('/api/analytics/sales/?group_by=product')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,9 @@
+# analytics/urls.py
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('sales/', views.sales_report, name='sales-report'),
+    path('products/', views.product_report, name='product-report'),
+]
@@ -0,0 +1,86 @@
+# analytics/views.py
+from django.db.models import Case, F, Max, Sum, Value, When
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .models import DailyProductSales, DailySales
+from .serializers import ProductReportQuerySerializer, SalesReportQuerySerializer
+
+# group_by -> rollup table এর column
+SALES_GROUPS = {'day': 'date', 'city': 'city', 'payment_method': 'payment_method'}
+
+
+def date_range(queryset, params):
+    if params.get('date_from'):
+        queryset = queryset.filter(date__gte=params['date_from'])
+    if params.get('date_to'):
+        queryset = queryset.filter(date__lte=params['date_to'])
+    return queryset
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def sales_report(request):
+    """
+    📊 Revenue, orders ও units (rollup table থেকে, order history scan হয় না)
+    GET /api/analytics/sales/?group_by=day|city|payment_method&date_from=&date_to=
+    """
+    params = SalesReportQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    params = params.validated_data
+
+    rows = date_range(DailySales.objects.all(), params)
+    metrics = {
+        'orders': Sum('orders'),
+        'units': Sum('units'),
+        'revenue': Sum('revenue'),
+        'shipping': Sum('shipping'),
+    }
+    column = SALES_GROUPS[params['group_by']]
+    results = (
+        rows.values(key=F(column))
+        .annotate(**metrics)
+        .order_by('-key' if column == 'date' else '-revenue')
+    )
+    totals = rows.aggregate(**metrics)
+
+    return Response({
+        'group_by': params['group_by'],
+        'date_from': params.get('date_from'),
+        'date_to': params.get('date_to'),
+        'totals': {name: value or 0 for name, value in totals.items()},
+        'results': list(results),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def product_report(request):
+    """
+    🏆 সবচেয়ে বেশি revenue এর products বা categories
+    GET /api/analytics/products/?group_by=product|category&date_from=&date_to=&limit=
+    """
+    params = ProductReportQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    params = params.validated_data
+
+    rows = date_range(DailyProductSales.objects.all(), params)
+    if params['group_by'] == 'category':
+        rows = rows.values(key=F('category_id'), name=F('category__name'))
+    else:
+        # Deleted products (product NULL) নাম অনুযায়ী আলাদা থাকে
+        rows = rows.values(
+            key=F('product_id'),
+            deleted=Case(When(product__isnull=True, then=F('product_name')), default=Value('')),
+        ).annotate(name=Max('product_name'))
+    results = rows.annotate(
+        units=Sum('units'), revenue=Sum('revenue'),
+    ).order_by('-revenue', 'key').values('key', 'name', 'units', 'revenue')[:params['limit']]
+
+    return Response({
+        'group_by': params['group_by'],
+        'date_from': params.get('date_from'),
+        'date_to': params.get('date_to'),
+        'results': list(results),
+    })
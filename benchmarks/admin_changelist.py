@@ -0,0 +1,139 @@
+"""
+Admin changelist benchmark
+
+বড় database এ admin এর order/product pages load হতে কত সময় ও কয়টা SQL
+query লাগে দেখায়। Pages in-process (Django test Client, superuser) চলে,
+তাই শুধু server side সময় মাপা হয়। Report format loadtest.py এর মতো:
+
+    python benchmarks/seed.py --products 5000 --orders 1000000 --days 730
+    python benchmarks/admin_changelist.py --output benchmarks/results/admin-after.json \\
+        --baseline benchmarks/results/admin-before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'glamgirl.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.utils.timezone import localtime  # noqa: E402
+
+from loadtest import Results, git_revision, print_report  # noqa: E402
+from orders.models import Order  # noqa: E402
+from products.models import Category  # noqa: E402
+
+PAGES = [
+    ('orders', '/admin/orders/order/'),
+    ('orders-page-50', '/admin/orders/order/?p=50'),
+    ('orders-status', '/admin/orders/order/?status__exact=pending'),
+    ('orders-city', '/admin/orders/order/?city__exact=Dhaka'),
+    ('orders-year', '/admin/orders/order/?created_at__year={year}'),
+    ('orders-month', '/admin/orders/order/?created_at__month={month}&created_at__year={year}'),
+    ('order-change', '/admin/orders/order/{order_id}/change/'),
+    ('products', '/admin/products/product/'),
+    ('products-cat', '/admin/products/product/?category__id__exact={category_id}'),
+]
+
+
+def page_urls():
+    latest = Order.objects.order_by('-created_at', '-id').first()
+    if latest is None:
+        raise SystemExit('Database এ কোনো order নেই — আগে benchmarks/seed.py চালাও')
+    created_at = localtime(latest.created_at)
+    values = {
+        'year': created_at.year,
+        'month': created_at.month,
+        'order_id': latest.id,
+        'category_id': Category.objects.order_by('id').values_list('id', flat=True).first(),
+    }
+    return [(name, url.format(**values)) for name, url in PAGES]
+
+
+def run(repeat):
+    # Production এর মতো (cached template loader), DEBUG এ template বারবার parse হয়
+    settings.DEBUG = False
+    if 'testserver' not in settings.ALLOWED_HOSTS:
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    user, _ = User.objects.get_or_create(
+        username='benchmark-admin', defaults={'is_staff': True, 'is_superuser': True})
+    # 500 error হলে exception না, error হিসেবে report এ আসুক
+    client = Client(raise_request_exception=False)
+    client.force_login(user)
+
+    results = Results()
+    queries = {}
+    start = time.monotonic()
+    for name, url in page_urls():
+        # প্রথম load (cold cache) সময়ে ধরা হয় না
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f'{name}: {url} -> HTTP {response.status_code}')
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                page_start = time.perf_counter()
+                response = client.get(url)
+                results.record(name, time.perf_counter() - page_start, response.status_code)
+        # শেষ load এর SQL: query সংখ্যা ও database এ মোট সময়
+        queries[name] = {
+            'count': len(captured),
+            'sql_ms': round(sum(float(query['time']) for query in captured) * 1000, 2),
+        }
+    return results.summary(time.monotonic() - start), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GlamGirl admin changelist benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='প্রতিটা page কতবার')
+    parser.add_argument('--output', help='Results JSON file')
+    parser.add_argument('--baseline', help='আগের results JSON, তুলনা দেখানোর জন্য')
+    args = parser.parse_args()
+
+    summary, queries = run(args.repeat)
+    result = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'orders': Order.objects.order_by().count(),
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        **summary,
+        'queries': queries,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(result, baseline)
+    print(f"{'page':<16}{'queries':>9}{'sql ms':>9}")
+    for name, stats in queries.items():
+        line = f"{name:<16}{stats['count']:>9}{stats['sql_ms']:>9}"
+        before = (baseline or {}).get('queries', {}).get(name)
+        if isinstance(before, dict):
+            line += f"{before['count']:>9}{before['sql_ms']:>9}  (before)"
+        print(line)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
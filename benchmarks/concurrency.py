@@ -0,0 +1,254 @@
+"""
+Connection concurrency benchmark (ASGI)
+
+অনেকগুলো keep-alive connection একসাথে খোলা রেখে read endpoints এ GET
+পাঠায় (product list/detail, categories, cart, order track)। Thread based
+loadtest.py এর চেয়ে অনেক বেশি connection (হাজার খানেক) চালানো যায়, তাই
+server কতগুলো connection একসাথে সামলাতে পারে ও তখন latency কেমন থাকে
+সেটা দেখা যায়। Report format loadtest.py এর মতো।
+
+    python benchmarks/seed.py
+    python benchmarks/concurrency.py --start-server uvicorn --workers 4 \\
+        --connections 500 --output benchmarks/results/async.json
+    python benchmarks/concurrency.py --start-server uvicorn --workers 4 --sync-views \\
+        --connections 500 --baseline benchmarks/results/async.json
+
+--start-server uvicorn এর জন্য `pip install uvicorn` লাগে; অন্য যেকোনো
+ASGI server (daphne, hypercorn, gunicorn -k uvicorn.workers.UvicornWorker)
+নিজে চালিয়ে --url দিতে পারো। --sync-views দিলে server GLAMGIRL_ASYNC_VIEWS=0
+নিয়ে চলে (একই ASGI server এ sync views), তুলনার জন্য।
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from loadtest import BASE_DIR, Results, git_revision, print_report
+
+
+class Connection:
+    """একটা keep-alive HTTP/1.1 connection (session cookie সহ)"""
+
+    def __init__(self, host, port, results, timeout):
+        self.host = host
+        self.port = port
+        self.results = results
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    async def request(self, endpoint, method, path, data=None):
+        body = json.dumps(data).encode() if data is not None else b''
+        start = time.perf_counter()
+        status = 0
+        payload = None
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            headers = [
+                f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                'Accept: application/json', f'Content-Length: {len(body)}',
+            ]
+            if body:
+                headers.append('Content-Type: application/json')
+            if self.cookies:
+                headers.append('Cookie: ' + '; '.join(
+                    f'{name}={value}' for name, value in self.cookies.items()))
+            self.writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + body)
+            status, payload = await asyncio.wait_for(self.read_response(), self.timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            self.close()
+        self.results.record(endpoint, time.perf_counter() - start, status)
+        if 0 < status < 400 and payload:
+            return json.loads(payload)
+        return None
+
+    async def read_response(self):
+        status_line = await self.reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        length = None
+        chunked = False
+        keep_alive = True
+        while True:
+            line = (await self.reader.readuntil(b'\r\n')).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            name = name.lower()
+            value = value.strip()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding' and 'chunked' in value.lower():
+                chunked = True
+            elif name == 'connection' and value.lower() == 'close':
+                keep_alive = False
+            elif name == 'set-cookie':
+                cookie, _, _ = value.partition(';')
+                cookie_name, _, cookie_value = cookie.partition('=')
+                self.cookies[cookie_name.strip()] = cookie_value.strip()
+
+        if chunked:
+            body = b''
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+                body += chunk[:-2]
+        elif length is not None:
+            body = await self.reader.readexactly(length)
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+        if not keep_alive:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def client(connection, rng, deadline, max_order_id):
+    listing = await connection.request('product-list', 'GET', '/api/products/?compact=1')
+    products = (listing or {}).get('results') or []
+    # Cart এ একটা product: cart GET এ session সহ আসল cart পড়া হয়
+    if products:
+        await connection.request('cart-add', 'POST', '/api/cart/add/', {
+            'product_id': rng.choice(products)['id'], 'quantity': 1})
+
+    while time.monotonic() < deadline:
+        choice = rng.random()
+        if choice < 0.35 or not products:
+            await connection.request('product-list', 'GET', '/api/products/?compact=1&sort='
+                                     + rng.choice(['newest', 'price_low', 'name']))
+        elif choice < 0.65:
+            await connection.request(
+                'product-detail', 'GET', f"/api/products/{rng.choice(products)['id']}/")
+        elif choice < 0.75:
+            await connection.request('categories', 'GET', '/api/products/categories/')
+        elif choice < 0.9:
+            await connection.request('cart', 'GET', '/api/cart/?compact=1')
+        else:
+            await connection.request(
+                'track-order', 'GET', f'/api/orders/track/{rng.randint(1, max_order_id)}/')
+    connection.close()
+
+
+async def run(url, connections, duration, ramp_up, timeout, seed, max_order_id):
+    parts = urlsplit(url)
+    results = Results()
+    start = time.monotonic()
+    deadline = start + ramp_up + duration
+
+    async def start_client(index):
+        # সব connection একসাথে না খুলে ramp_up সময় জুড়ে
+        await asyncio.sleep(ramp_up * index / connections)
+        await client(
+            Connection(parts.hostname, parts.port or 80, results, timeout),
+            random.Random(seed + index), deadline, max_order_id)
+
+    await asyncio.gather(*(start_client(index) for index in range(connections)))
+    return results.summary(time.monotonic() - start)
+
+
+def start_server(server, port, workers, sync_views):
+    """ASGI server চালু করো এবং ready হওয়া পর্যন্ত অপেক্ষা"""
+    env = {**os.environ, 'GLAMGIRL_ASYNC_VIEWS': '0' if sync_views else '1'}
+    if server == 'uvicorn':
+        command = [sys.executable, '-m', 'uvicorn', 'glamgirl.asgi:application',
+                   '--port', str(port), '--workers', str(workers),
+                   '--no-access-log', '--log-level', 'warning']
+    else:
+        # Development server (WSGI, request প্রতি thread) — তুলনার জন্য
+        command = [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload']
+    process = subprocess.Popen(
+        command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(150):
+        try:
+            urllib.request.urlopen(f'{url}/api/products/categories/', timeout=1).read()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f'{server} did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GlamGirl connection concurrency benchmark')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--start-server', choices=['uvicorn', 'runserver'],
+                        help='Server নিজে চালাও (--port এ)')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--sync-views', action='store_true',
+                        help='Server এ async views বন্ধ (GLAMGIRL_ASYNC_VIEWS=0)')
+    parser.add_argument('--connections', type=int, default=200,
+                        help='একসাথে খোলা keep-alive connections')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds (ramp up এর পরে)')
+    parser.add_argument('--ramp-up', type=float, default=2, help='Seconds')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--max-order-id', type=int, default=1000,
+                        help='Track করা order ids 1..N (seed.py এর orders)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Results JSON file')
+    parser.add_argument('--baseline', help='আগের results JSON, তুলনা দেখানোর জন্য')
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if args.start_server:
+        process, url = start_server(
+            args.start_server, args.port, args.workers, args.sync_views)
+    try:
+        summary = asyncio.run(run(
+            url, args.connections, args.duration, args.ramp_up, args.timeout,
+            args.seed, args.max_order_id))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    result = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'url': url,
+            'server': args.start_server,
+            'workers': args.workers,
+            'async_views': not args.sync_views,
+            'connections': args.connections,
+            'duration': args.duration,
+            'cpu_count': os.cpu_count(),
+        },
+        **summary,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(result, baseline)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
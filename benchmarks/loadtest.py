@@ -0,0 +1,291 @@
+"""
+Shop flow load test
+
+অনেকগুলো simulated customer session একসাথে আসল flow চালায়:
+
+    product list -> (কখনো search) -> product detail -> add to cart -> cart
+    -> checkout (--checkout-ratio) অথবা cart clear
+
+প্রতিটা session এর নিজের cookie (Django session) থাকে। শেষে endpoint
+অনুযায়ী requests/sec ও latency percentiles দেখায় এবং JSON এ লেখে, যাতে
+দুটো build তুলনা করা যায়:
+
+    python benchmarks/seed.py
+    python benchmarks/loadtest.py --start-server --sessions 50 --duration 30 \\
+        --output benchmarks/results/after.json --baseline benchmarks/results/before.json
+
+শুধু Python standard library লাগে।
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SEARCH_TERMS = ['matte', 'serum', 'rose lip', 'sun', 'hydrating', 'shampoo']
+ORDER_DATA = {
+    'customer_name': 'Load Test',
+    'customer_email': 'load@example.com',
+    'customer_phone': '01700000000',
+    'shipping_address': 'House 1, Road 2',
+    'city': 'Dhaka',
+    'payment_method': 'cod',
+}
+
+
+class Results:
+    """Endpoint অনুযায়ী latency (seconds) ও error সংখ্যা, threads থেকে জমা হয়"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, duration, status):
+        """status: HTTP status, connection error হলে 0"""
+        with self.lock:
+            self.latencies[endpoint].append(duration)
+            if not 0 < status < 400:
+                self.errors[endpoint][status] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            endpoints[endpoint] = summarize(values, self.errors[endpoint], elapsed)
+        everything = [value for values in self.latencies.values() for value in values]
+        errors = defaultdict(int)
+        for by_status in self.errors.values():
+            for status, count in by_status.items():
+                errors[status] += count
+        return {
+            'endpoints': endpoints,
+            'total': summarize(everything, errors, elapsed),
+        }
+
+
+def percentile(values, quantile):
+    return values[min(int(quantile * len(values)), len(values) - 1)]
+
+
+def summarize(values, errors, elapsed):
+    """errors: {status: count}"""
+    values = sorted(values)
+    result = {
+        'requests': len(values),
+        'errors': sum(errors.values()),
+        'errors_by_status': {str(status): count for status, count in sorted(errors.items())},
+    }
+    if not values:
+        return result
+    return {
+        **result,
+        'rps': round(len(values) / elapsed, 2),
+        'mean_ms': round(statistics.fmean(values) * 1000, 2),
+        'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+        'max_ms': round(values[-1] * 1000, 2),
+    }
+
+
+class Session:
+    """একজন customer: নিজের cookie jar সহ HTTP client"""
+
+    def __init__(self, base_url, results, rng, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.results = results
+        self.rng = rng
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, endpoint, method, path, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=body, method=method,
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json'})
+        start = time.perf_counter()
+        status = 0
+        payload = None
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                payload = response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            status = error.code
+        except (urllib.error.URLError, OSError):
+            pass
+        self.results.record(endpoint, time.perf_counter() - start, status)
+        if 0 < status < 400 and payload:
+            return json.loads(payload)
+        return None
+
+    def run_flow(self, checkout_ratio):
+        params = '?compact=1'
+        if self.rng.random() < 0.3:
+            params += '&sort=' + self.rng.choice(['price_low', 'price_high', 'name'])
+        listing = self.request('product-list', 'GET', f'/api/products/{params}')
+        products = (listing or {}).get('results') or []
+
+        if self.rng.random() < 0.3:
+            found = self.request(
+                'product-search', 'GET',
+                '/api/products/search/?q=' + urllib.request.quote(self.rng.choice(SEARCH_TERMS)))
+            products = (found or {}).get('results') or products
+        if not products:
+            return
+
+        product = self.rng.choice(products)
+        self.request('product-detail', 'GET', f"/api/products/{product['id']}/")
+        added = self.request('cart-add', 'POST', '/api/cart/add/', {
+            'product_id': product['id'], 'quantity': self.rng.randint(1, 2)})
+        if added is None:
+            return
+        self.request('cart', 'GET', '/api/cart/?compact=1')
+
+        if self.rng.random() < checkout_ratio:
+            self.request('checkout', 'POST', '/api/orders/create/', ORDER_DATA)
+        else:
+            self.request('cart-clear', 'DELETE', '/api/cart/clear/')
+
+
+def run(base_url, sessions, duration, checkout_ratio, timeout, seed):
+    results = Results()
+    deadline = time.monotonic() + duration
+
+    def worker(index):
+        session = Session(base_url, results, random.Random(seed + index), timeout)
+        while time.monotonic() < deadline:
+            session.run_flow(checkout_ratio)
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True)
+               for index in range(sessions)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results.summary(time.monotonic() - start)
+
+
+def start_server(port):
+    """Local server চালু করো (runserver, autoreload ছাড়া) এবং ready হওয়া পর্যন্ত অপেক্ষা"""
+    server = subprocess.Popen(
+        [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload'],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f'{url}/api/products/categories/', timeout=1).read()
+            return server, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('Server did not start')
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(summary, baseline=None):
+    header = f"{'endpoint':<16}{'requests':>9}{'errors':>8}{'rps':>9}" \
+             f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    if baseline:
+        header += f"{'Δ rps':>9}{'Δ p95':>9}"
+    print(header)
+    rows = list(summary['endpoints'].items()) + [('TOTAL', summary['total'])]
+    for endpoint, stats in rows:
+        if not stats['requests']:
+            continue
+        line = (f"{endpoint:<16}{stats['requests']:>9}{stats['errors']:>8}{stats['rps']:>9}"
+                f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+        if baseline:
+            before = (baseline['total'] if endpoint == 'TOTAL'
+                      else baseline['endpoints'].get(endpoint))
+            if before and before.get('requests'):
+                line += f"{change(before['rps'], stats['rps']):>9}"
+                line += f"{change(before['p95_ms'], stats['p95_ms']):>9}"
+        print(line)
+    if summary['total']['errors']:
+        print('errors by status:', summary['total']['errors_by_status'])
+
+
+def change(before, after):
+    if not before:
+        return '-'
+    return f'{(after - before) / before * 100:+.0f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GlamGirl shop flow load test')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--start-server', action='store_true',
+                        help='manage.py runserver নিজে চালাও (--port এ)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=20, help='একসাথে কয়জন customer')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds')
+    parser.add_argument('--checkout-ratio', type=float, default=0.2)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Results JSON file')
+    parser.add_argument('--baseline', help='আগের results JSON, তুলনা দেখানোর জন্য')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.start_server:
+        server, url = start_server(args.port)
+    try:
+        summary = run(url, args.sessions, args.duration, args.checkout_ratio,
+                      args.timeout, args.seed)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    result = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'url': url,
+            'sessions': args.sessions,
+            'duration': args.duration,
+            'checkout_ratio': args.checkout_ratio,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        **summary,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(result, baseline)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
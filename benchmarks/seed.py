@@ -0,0 +1,129 @@
+"""
+Benchmark এর জন্য realistic dataset
+
+    python benchmarks/seed.py --products 5000 --orders 20000
+    python benchmarks/seed.py --products 5000 --orders 1000000 --days 730
+
+Categories, products (বড় stock যাতে checkout এ শেষ না হয়) আর পুরনো orders
+bulk_create দিয়ে তৈরি হয়, তারপর sales rollups আবার বানানো হয়। --days দিলে
+orders গত N দিনে ছড়ানো থাকে (admin date hierarchy, rollups)। Data
+existing database এ যোগ হয় — আলাদা/খালি database এ চালাও।
+"""
+
+import argparse
+import os
+import random
+import sys
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'glamgirl.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from analytics.rollups import rebuild  # noqa: E402
+from orders.models import Order, OrderItem  # noqa: E402
+from products.models import Category, Product  # noqa: E402
+
+CATEGORIES = [
+    'Makeup', 'Skincare', 'Haircare', 'Fragrance', 'Bath & Body',
+    'Nail Care', 'Tools & Brushes', 'Men', 'Gift Sets', 'Organic',
+]
+ADJECTIVES = ['Matte', 'Glossy', 'Hydrating', 'Velvet', 'Radiant', 'Nourishing',
+              'Silky', 'Long Lasting', 'Natural', 'Herbal', 'Rose', 'Vitamin C']
+NOUNS = ['Lipstick', 'Foundation', 'Serum', 'Face Wash', 'Shampoo', 'Conditioner',
+         'Perfume', 'Body Lotion', 'Nail Polish', 'Kajal', 'Sunscreen', 'Toner']
+CITIES = ['Dhaka', 'Chattogram', 'Khulna', 'Sylhet', 'Rajshahi', 'Barishal']
+STATUSES = ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled']
+PAYMENTS = ['cod', 'bkash', 'nagad', 'card']
+BATCH_SIZE = 1000
+
+
+@contextmanager
+def backdated(model):
+    """auto_now_add বন্ধ রাখো যাতে bulk_create এ দেওয়া created_at থাকে"""
+    field = model._meta.get_field('created_at')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def seed(products, orders, seed_value, days=0):
+    rng = random.Random(seed_value)
+    now = timezone.now()
+
+    with transaction.atomic():
+        categories = Category.objects.bulk_create(
+            Category(name=name, description=f'{name} products') for name in CATEGORIES)
+
+        catalog = Product.objects.bulk_create((
+            Product(
+                name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}',
+                description=' '.join(rng.choices(ADJECTIVES + NOUNS, k=40)),
+                price=Decimal(rng.randrange(150, 5000, 10)),
+                category=rng.choice(categories),
+                stock=1_000_000,
+            )
+            for index in range(products)
+        ), batch_size=BATCH_SIZE)
+
+    for start in range(0, orders, BATCH_SIZE):
+        with transaction.atomic():
+            batch = []
+            lines = []
+            for _ in range(min(BATCH_SIZE, orders - start)):
+                items = [(rng.choice(catalog), rng.randint(1, 3))
+                         for _ in range(rng.randint(1, 4))]
+                city = rng.choice(CITIES)
+                batch.append(Order(
+                    customer_name='Benchmark Customer',
+                    customer_email='bench@example.com',
+                    customer_phone='01700000000',
+                    shipping_address='House 1, Road 2',
+                    city=city,
+                    total_amount=sum(product.price * quantity for product, quantity in items),
+                    shipping_cost=0 if city == 'Dhaka' else 60,
+                    status=rng.choice(STATUSES),
+                    payment_method=rng.choice(PAYMENTS),
+                    created_at=now - timedelta(seconds=rng.uniform(0, days * 86400)),
+                ))
+                lines.append(items)
+            with backdated(Order):
+                batch = Order.objects.bulk_create(batch)
+            OrderItem.objects.bulk_create(
+                OrderItem(order=order, product=product, product_name=product.name,
+                          product_price=product.price, quantity=quantity)
+                for order, items in zip(batch, lines)
+                for product, quantity in items)
+
+    rebuild()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return len(categories), len(catalog)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--orders', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=0,
+                        help='Orders এর created_at গত কত দিনে ছড়াবে (0 হলে সব এখন)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (একই data বারবার)')
+    args = parser.parse_args()
+
+    categories, products = seed(args.products, args.orders, args.seed, args.days)
+    print(f'Seeded {categories} categories, {products} products, {args.orders} orders')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+"""
+Cart read API এর async version (settings.ASYNC_VIEWS, glamgirl.async_urls)
+"""
+
+from rest_framework.response import Response
+
+from glamgirl.async_api import async_api_view
+from .storage import get_cart_store
+
+
+@async_api_view(['GET'])
+async def get_cart(request):
+    """Cart দেখাও (session/cart না থাকলে খালি cart, নতুন কিছু তৈরি হয় না)"""
+    store = get_cart_store(request)
+    return Response(await store.aserialize())
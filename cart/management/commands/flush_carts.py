@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cart.storage import flush_dirty_carts
+
+
+class Command(BaseCommand):
+    help = 'Cache এ থাকা dirty carts database এ লেখো (CacheCartStore এর জন্য, cron থেকে চালাও)'
+
+    def handle(self, *args, **options):
+        flushed = flush_dirty_carts()
+        self.stdout.write(self.style.SUCCESS(f'{flushed} cart(s) flushed'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from cart.reservations import release_expired
+
+
+class Command(BaseCommand):
+    help = 'মেয়াদ শেষ হওয়া stock reservation batch করে ছেড়ে দাও (cron থেকে চালাও)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='প্রতি transaction এ কয়টা reservation release হবে')
+
+    def handle(self, *args, **options):
+        released = release_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{released} reservation(s) released'))
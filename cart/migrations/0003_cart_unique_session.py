@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:45
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    Unique constraint এর আগে duplicate গুলো এক করো:
+    একই session এর একাধিক cart -> প্রথম cart এ items সরাও,
+    একই cart এ একই product এর একাধিক row -> quantity যোগ করে একটা row
+    """
+    Cart = apps.get_model('cart', 'Cart')
+    CartItem = apps.get_model('cart', 'CartItem')
+
+    duplicate_sessions = (
+        Cart.objects.values('session_key')
+        .annotate(count=Count('id'), keep=Min('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicate_sessions:
+        others = Cart.objects.filter(session_key=row['session_key']).exclude(id=row['keep'])
+        CartItem.objects.filter(cart__in=others).update(cart_id=row['keep'])
+        others.delete()
+
+    duplicate_items = (
+        CartItem.objects.values('cart_id', 'product_id')
+        .annotate(count=Count('id'), keep=Min('id'), total=Sum('quantity'))
+        .filter(count__gt=1)
+    )
+    for row in duplicate_items:
+        CartItem.objects.filter(id=row['keep']).update(quantity=row['total'])
+        CartItem.objects.filter(
+            cart_id=row['cart_id'], product_id=row['product_id'],
+        ).exclude(id=row['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_stock_reservation'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='cart',
+            name='session_key',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'product'), name='unique_cart_product'),
+        ),
+    ]
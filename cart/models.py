@@ -2,7 +2,8 @@ from django.db import models
 from products.models import Product
 
 class Cart(models.Model):
-    session_key = models.CharField(max_length=100)
+    # Session প্রতি একটাই cart (get_or_create race এও duplicate হবে না)
+    session_key = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -15,6 +16,15 @@ class Cart(models.Model):
     
     def get_total_items(self):
         return sum(item.quantity for item in self.items.all())
+    
+    def get_totals(self):
+        """(total, total_items) একই loop এ হিসাব করো"""
+        total = 0
+        total_items = 0
+        for item in self.items.all():
+            total += item.get_subtotal()
+            total_items += item.quantity
+        return total, total_items
 
 
 class CartItem(models.Model):
@@ -22,9 +32,40 @@ class CartItem(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
     added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # একই product দুইবার add হলে quantity বাড়ে, নতুন row না
+            models.UniqueConstraint(fields=['cart', 'product'], name='unique_cart_product'),
+        ]
     
     def __str__(self):
         return f"{self.quantity} x {self.product.name}"
     
     def get_subtotal(self):
-        return self.product.price * self.quantity
\ No newline at end of file
+        return self.product.price * self.quantity
+
+
+class StockReservation(models.Model):
+    """
+    Cart এ add করা product এর জন্য কিছু সময়ের জন্য stock ধরে রাখো
+    Product.reserved এ সব reservation এর total রাখা হয়
+    """
+    session_key = models.CharField(max_length=100)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['session_key', 'product'], name='unique_session_reservation'),
+        ]
+        indexes = [
+            # Sweeper expired reservation খোঁজে
+            models.Index(fields=['expires_at'], name='reservation_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} ({self.session_key})"
@@ -0,0 +1,251 @@
+"""
+Stock reservations
+
+Cart এ product add করলে সেই quantity কিছু সময়ের জন্য (CART_RESERVATION_TTL)
+ধরে রাখা হয়, যাতে checkout এর সময় stock শেষ হয়ে না যায়। Product.reserved
+এ সব reservation এর running total থাকে, তাই available stock জানতে
+reservation গুলো sum করতে হয় না:
+
+    available = Product.stock - Product.reserved
+
+Expired reservation `release_reservations` management command batch এ
+ছেড়ে দেয়।
+
+Cart store ঠিক করে কখন reservation লেখা হবে (cart.storage দেখো):
+DatabaseCartStore প্রতিটা cart edit এ hold/release করে, CacheCartStore edit
+এ শুধু check_available() (read-only) করে আর flush এর সময় sync() করে।
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+
+from products import stock
+from products.models import Product
+from .models import StockReservation
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, product):
+        self.product = product
+        super().__init__(f'Not enough stock available for {product.name}')
+
+
+def expiry_time():
+    return timezone.now() + timedelta(seconds=settings.CART_RESERVATION_TTL)
+
+
+def hold(session_key, product, quantity):
+    """
+    এই session এর জন্য product এর reservation `quantity` তে set করো
+    Available stock না থাকলে InsufficientStockError
+    """
+    hold_many(session_key, {product: quantity})
+
+
+def hold_many(session_key, quantities):
+    """
+    একাধিক product এর reservation একসাথে set করো: {product: quantity}
+    Query সংখ্যা product সংখ্যার উপর নির্ভর করে না; কোনো একটার stock না
+    থাকলে কিছুই reserve হয় না (InsufficientStockError)
+    """
+    products = {product.id: product for product in quantities}
+    targets = {product.id: max(quantity, 0) for product, quantity in quantities.items()}
+
+    with transaction.atomic():
+        existing = {
+            reservation.product_id: reservation
+            for reservation in StockReservation.objects.select_for_update().filter(
+                session_key=session_key, product_id__in=list(targets))
+        }
+        deltas = {
+            product_id: quantity - (
+                existing[product_id].quantity if product_id in existing else 0)
+            for product_id, quantity in targets.items()
+        }
+        _adjust_reserved(deltas, products)
+
+        expires_at = expiry_time()
+        to_delete = []
+        to_update = []
+        to_create = []
+        for product_id, quantity in targets.items():
+            reservation = existing.get(product_id)
+            if quantity == 0:
+                if reservation:
+                    to_delete.append(reservation.id)
+            elif reservation:
+                reservation.quantity = quantity
+                reservation.expires_at = expires_at
+                to_update.append(reservation)
+            else:
+                to_create.append(StockReservation(
+                    session_key=session_key, product_id=product_id,
+                    quantity=quantity, expires_at=expires_at))
+
+        if to_delete:
+            StockReservation.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            StockReservation.objects.bulk_update(to_update, ['quantity', 'expires_at'])
+        if to_create:
+            StockReservation.objects.bulk_create(to_create)
+
+
+def _adjust_reserved(deltas, products):
+    """
+    এক UPDATE এ Product.reserved বদলাও; বাড়ানোর সময় stock - reserved >= delta
+    শর্ত থাকে। কোনো row update না হলে InsufficientStockError
+    """
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    condition = Q()
+    for product_id, delta in deltas.items():
+        if delta > 0:
+            condition |= Q(id=product_id, stock__gte=F('reserved') + delta)
+        else:
+            condition |= Q(id=product_id)
+
+    updated = Product.objects.filter(condition).update(reserved=Case(*[
+        When(id=product_id, then=F('reserved') + delta)
+        for product_id, delta in deltas.items()
+    ]))
+    if updated != len(deltas):
+        available = dict(Product.objects.filter(
+            id__in=list(deltas)).values_list('id', F('stock') - F('reserved')))
+        for product_id, delta in deltas.items():
+            if delta > 0 and available.get(product_id, 0) < delta:
+                raise InsufficientStockError(products[product_id])
+        raise InsufficientStockError(next(iter(products.values())))
+    _stock_changed(deltas)
+
+
+def check_available(session_key, quantities):
+    """
+    Reserve না করে দেখো {product: quantity} এর stock আছে কিনা (শুধু SELECT)
+    এই session এর নিজের reservation available এর মধ্যে ধরা হয়; product
+    instance এর stock/reserved ব্যবহার হয়, তাই fresh load করা product দাও
+    """
+    held = dict(StockReservation.objects.filter(
+        session_key=session_key, product_id__in=[product.id for product in quantities],
+    ).values_list('product_id', 'quantity'))
+    for product, quantity in quantities.items():
+        available = product.stock - product.reserved + held.get(product.id, 0)
+        if quantity > 0 and available < quantity:
+            raise InsufficientStockError(product)
+
+
+def sync(session_key, quantities):
+    """
+    Session এর reservation ঠিক {product: quantity} এর মতো করো, বাকি সব ছাড়ো
+    সবগুলো একসাথে reserve না হলে product ধরে আলাদা চেষ্টা হয়; যেগুলোর stock
+    নেই সেগুলো reservation ছাড়া থাকে (checkout এ আবার check হয়)।
+    Reserve না হওয়া product ids return করে
+    """
+    with transaction.atomic():
+        _release(StockReservation.objects.select_for_update().filter(
+            session_key=session_key,
+        ).exclude(product_id__in=[product.id for product in quantities]))
+    if not quantities:
+        return []
+    try:
+        hold_many(session_key, quantities)
+        return []
+    except InsufficientStockError:
+        pass
+
+    failed = []
+    for product, quantity in quantities.items():
+        try:
+            hold(session_key, product, quantity)
+        except InsufficientStockError:
+            failed.append(product.id)
+    return failed
+
+
+def touch(session_key):
+    """Cart activity: এই session এর সব reservation এর মেয়াদ বাড়াও"""
+    StockReservation.objects.filter(session_key=session_key).update(
+        expires_at=expiry_time())
+
+
+def release(session_key, product_ids=None):
+    """Session এর reservation ছেড়ে দাও (product_ids না দিলে সব)"""
+    reservations = StockReservation.objects.filter(session_key=session_key)
+    if product_ids is not None:
+        reservations = reservations.filter(product_id__in=product_ids)
+    with transaction.atomic():
+        _release(reservations.select_for_update())
+
+
+def consume(session_key, product_ids):
+    """
+    Checkout: এই session এর ordered products এর reservation মুছে ফেলো
+    Product.reserved থেকে কতটা কমাতে হবে সেটা return করে {product_id: quantity}
+    (stock আর reserved একই UPDATE এ কমানো হয়, orders.checkout দেখো)
+    Transaction এর ভেতরে call করতে হবে।
+    """
+    reservations = StockReservation.objects.select_for_update().filter(
+        session_key=session_key, product_id__in=product_ids)
+    held = Counter()
+    for product_id, quantity in reservations.values_list('product_id', 'quantity'):
+        held[product_id] += quantity
+    reservations.delete()
+    return held
+
+
+def release_expired(batch_size=500):
+    """
+    Expired reservation batch করে ছেড়ে দাও
+    প্রতিটা batch আলাদা transaction, যাতে lock বেশিক্ষণ না থাকে
+    মোট কয়টা release হলো return করে
+    """
+    released = 0
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            ids = list(
+                StockReservation.objects.select_for_update()
+                .filter(expires_at__lte=now)
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # এর মধ্যে touch() হয়ে থাকলে সেটা আর expired না
+            _release(StockReservation.objects.filter(
+                id__in=ids, expires_at__lte=now))
+        released += len(ids)
+    return released
+
+
+def _release(reservations):
+    """Reservation delete করো ও Product.reserved এক UPDATE এ কমাও"""
+    held = Counter()
+    for product_id, quantity in reservations.values_list('product_id', 'quantity'):
+        held[product_id] += quantity
+    if not held:
+        return
+
+    Product.objects.filter(id__in=list(held)).update(reserved=Case(*[
+        When(id=product_id, then=F('reserved') - quantity)
+        for product_id, quantity in held.items()
+    ]))
+    reservations.delete()
+    _stock_changed({product_id: -quantity for product_id, quantity in held.items()})
+
+
+def _stock_changed(deltas):
+    """
+    Reserved বদলালে available stock ও বদলায়: catalog এর live stock মোছো
+    (products.stock), কোনোটা in/out of stock হলে catalog version ও বাড়ে
+    """
+    after = dict(Product.objects.filter(id__in=list(deltas)).values_list(
+        'id', F('stock') - F('reserved')))
+    before = {product_id: available + deltas[product_id] for product_id, available in after.items()}
+    stock.changed(deltas, crossed_zero=stock.crosses_zero(before, after))
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from glamgirl.serializers import SparseFieldsMixin, sparse_options
 from .models import Cart, CartItem
 from products.serializers import ProductSerializer
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer(read_only=True)
     product_id = serializers.IntegerField(write_only=True)
     subtotal = serializers.SerializerMethodField()
@@ -10,22 +11,53 @@ class CartItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = CartItem
         fields = ['id', 'product', 'product_id', 'quantity', 'subtotal']
+        field_dependencies = {'subtotal': ['quantity']}
     
     def get_subtotal(self, obj):
         return obj.get_subtotal()
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Cart items আগে থেকে prefetch করা থাকা উচিত (cart.storage.DatabaseCartStore.items_prefetch দেখো),
+    না হলে প্রতিটা item এর জন্য আলাদা query হবে
+    """
     items = CartItemSerializer(many=True, read_only=True)
-    total = serializers.SerializerMethodField()
-    total_items = serializers.SerializerMethodField()
     
     class Meta:
         model = Cart
-        fields = ['id', 'items', 'total', 'total_items']
+        fields = ['id', 'items']
     
-    def get_total(self, obj):
-        return obj.get_total()
-    
-    def get_total_items(self, obj):
-        return obj.get_total_items()
\ No newline at end of file
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        requested, _, _ = sparse_options(self.context)
+        # Totals একবারই হিসাব করো
+        total, total_items = obj.get_totals()
+        if requested is None or 'total' in requested:
+            data['total'] = total
+        if requested is None or 'total_items' in requested:
+            data['total_items'] = total_items
+        return data
+
+class CartOperationSerializer(serializers.Serializer):
+    """Batch endpoint এর একটা operation: add / update / remove"""
+    OP_CHOICES = ['add', 'update', 'remove']
+
+    op = serializers.ChoiceField(choices=OP_CHOICES)
+    product_id = serializers.IntegerField(required=False)
+    item_id = serializers.IntegerField(required=False)
+    quantity = serializers.IntegerField(required=False, default=1)
+
+    def validate(self, attrs):
+        if attrs['op'] == 'add':
+            if 'product_id' not in attrs:
+                raise serializers.ValidationError({'product_id': 'Required for add.'})
+            if attrs['quantity'] < 1:
+                raise serializers.ValidationError({'quantity': 'Must be at least 1.'})
+        elif 'item_id' not in attrs:
+            raise serializers.ValidationError({'item_id': f"Required for {attrs['op']}."})
+        return attrs
+
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=100)
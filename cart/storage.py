@@ -0,0 +1,526 @@
+"""
+Cart storage engines
+
+settings.CART_STORE দিয়ে কোন store ব্যবহার হবে ঠিক হয়:
+
+- DatabaseCartStore (default): প্রতিটা change সরাসরি Cart/CartItem table এ
+- CacheCartStore: live cart Django cache এ থাকে, DB তে লেখা হয় শুধু
+  checkout এর সময় বা `flush_carts` management command চালালে (write-behind)
+
+দুটো store এর response format একই (CartSerializer এর মতো), তাই frontend
+কোনো পরিবর্তন ছাড়াই যেকোনোটা ব্যবহার করতে পারে।
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, aprefetch_related_objects, prefetch_related_objects
+from django.utils.module_loading import import_string
+
+from products.models import Product
+from . import reservations
+from .models import Cart, CartItem
+from glamgirl.serializers import sparse_options
+from .serializers import CartSerializer
+
+# Dirty index: shared set এর read-modify-write এ দুটো request একে অপরের
+# session মুছে ফেলতে পারত। তাই প্রতিটা dirty cart একটা নতুন slot পায়
+# (atomic incr), আর per-session marker (atomic add) একই cart কে বারবার slot
+# নিতে দেয় না। Flush শেষ flush করা slot থেকে সামনে পড়ে।
+DIRTY_SEQ_KEY = 'cart:dirty:seq'
+DIRTY_FLUSHED_KEY = 'cart:dirty:flushed'
+
+
+def get_cart_store(request):
+    """Settings অনুযায়ী এই request এর cart store দাও"""
+    store_class = import_string(settings.CART_STORE)
+    return store_class(request)
+
+
+class BaseCartStore:
+    """
+    সব cart store এর common interface
+    Item id দিয়ে update/remove হয়; DB store এ সেটা CartItem.id,
+    cache store এ product id।
+    """
+
+    # Totals হিসাব করতে এগুলো সবসময় লাগে, ?fields= এ না চাইলেও defer করা যাবে না
+    TOTALS_FIELDS = {'quantity', 'product__price'}
+
+    def __init__(self, request):
+        self.request = request
+
+    def get_serializer_context(self):
+        return {'request': self.request}
+
+    def item_deferred_fields(self, cart_serializer):
+        """Cart item queryset এ যেসব column লাগবে না (?fields= / ?compact=1)"""
+        items_field = cart_serializer.fields.get('items')
+        if items_field is None:
+            return []
+        return [
+            name for name in items_field.child.deferred_fields()
+            if name not in self.TOTALS_FIELDS
+        ]
+
+    def get_session_key(self, create=True):
+        """Session based cart: session না থাকলে তৈরি করো"""
+        if not self.request.session.session_key and create:
+            self.request.session.create()
+        return self.request.session.session_key
+
+    async def aget_session_key(self):
+        """Async read এর জন্য: session না থাকলে None (নতুন session তৈরি হয় না)"""
+        session = self.request.session
+        if session.session_key is not None:
+            # Load করলে expired বা অচেনা session এর key None হয়ে যায়
+            await session.akeys()
+        return session.session_key
+
+    def serialize(self):
+        raise NotImplementedError
+
+    async def aserialize(self):
+        """serialize() এর async, read-only version: cart না থাকলে তৈরি না করে খালি cart"""
+        raise NotImplementedError
+
+    def serialize_lines(self, serializer, cart_id, lines):
+        """
+        Unsaved/prefetched CartItem lines থেকে CartSerializer এর মতো একই format
+        (?fields= অনুযায়ী top-level fields ও order)
+        """
+        total = 0
+        total_items = 0
+        for line in lines:
+            total += line.get_subtotal()
+            total_items += line.quantity
+        data = {'id': cart_id, 'total': total, 'total_items': total_items}
+        if 'items' in serializer.fields:
+            data['items'] = serializer.fields['items'].to_representation(lines)
+
+        requested, _, _ = sparse_options(serializer.context)
+        keys = ['id', 'items', 'total', 'total_items']
+        if requested is not None:
+            wanted = {name.split('.')[0] for name in requested}
+            keys = [key for key in keys if key in wanted]
+        return {key: data[key] for key in keys if key in data}
+
+    def add(self, product, quantity):
+        raise NotImplementedError
+
+    def get_quantity(self, product_id):
+        """Cart এ এই product এর বর্তমান quantity (না থাকলে 0)"""
+        raise NotImplementedError
+
+    def get_quantities(self, product_ids):
+        """{product_id: quantity} শুধু cart এ থাকা products এর জন্য"""
+        raise NotImplementedError
+
+    def set_quantities(self, quantities):
+        """
+        একসাথে অনেক product এর quantity set করো: {product_id: quantity}
+        quantity 0 হলে item remove হবে
+        """
+        raise NotImplementedError
+
+    def get_item(self, item_id):
+        """Item (id, product, quantity সহ) দাও, না থাকলে None"""
+        raise NotImplementedError
+
+    def get_items(self, item_ids):
+        """{item_id: item} শুধু cart এ থাকা items এর জন্য"""
+        raise NotImplementedError
+
+    def update(self, item_id, quantity):
+        raise NotImplementedError
+
+    def remove(self, item_id):
+        """Item remove করো; item না থাকলে False"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_checkout_cart(self):
+        """Checkout এর জন্য DB তে save করা Cart দাও (না থাকলে None)"""
+        raise NotImplementedError
+
+    # Stock reservation (cart.reservations): default এ প্রতিটা edit এ লেখা হয়
+
+    def reserve(self, quantities):
+        """
+        Cart এর {product: quantity} এর জন্য stock reserve করো
+        Stock না থাকলে reservations.InsufficientStockError
+        """
+        reservations.hold_many(self.get_session_key(), quantities)
+
+    def release_reservations(self, product_ids=None):
+        reservations.release(self.get_session_key(), product_ids)
+
+    def touch_reservations(self):
+        reservations.touch(self.get_session_key())
+
+    def checkout_complete(self):
+        """Order তৈরি ও DB cart খালি হওয়ার পরে call হয়"""
+
+
+class DatabaseCartStore(BaseCartStore):
+    """প্রতিটা cart change সরাসরি database এ"""
+
+    def get_cart(self):
+        if not hasattr(self, '_cart'):
+            self._cart, created = Cart.objects.get_or_create(
+                session_key=self.get_session_key())
+        return self._cart
+
+    def items_prefetch(self, serializer):
+        # Items, product ও category এক query তে load হয় (cart এর size যাই হোক)
+        return Prefetch(
+            'items',
+            queryset=CartItem.objects.select_related('product__category').defer(
+                *self.item_deferred_fields(serializer)),
+        )
+
+    def serialize(self):
+        cart = self.get_cart()
+        serializer = CartSerializer(cart, context=self.get_serializer_context())
+        prefetch_related_objects([cart], self.items_prefetch(serializer))
+        return serializer.data
+
+    async def aserialize(self):
+        serializer = CartSerializer(context=self.get_serializer_context())
+        session_key = await self.aget_session_key()
+        cart = None
+        if session_key:
+            cart = await Cart.objects.filter(session_key=session_key).afirst()
+        if cart is None:
+            return self.serialize_lines(serializer, None, [])
+        await aprefetch_related_objects([cart], self.items_prefetch(serializer))
+        serializer.instance = cart
+        return serializer.data
+
+    def add(self, product, quantity):
+        cart_item, created = CartItem.objects.get_or_create(
+            cart=self.get_cart(),
+            product=product,
+            defaults={'quantity': quantity}
+        )
+        if not created:
+            cart_item.quantity += quantity
+            cart_item.save()
+
+    def get_quantity(self, product_id):
+        quantity = CartItem.objects.filter(
+            cart=self.get_cart(), product_id=product_id,
+        ).values_list('quantity', flat=True).first()
+        return quantity or 0
+
+    def get_quantities(self, product_ids):
+        return dict(CartItem.objects.filter(
+            cart=self.get_cart(), product_id__in=product_ids,
+        ).values_list('product_id', 'quantity'))
+
+    def set_quantities(self, quantities):
+        # Delete, update ও insert প্রতিটা একটা করে query
+        cart = self.get_cart()
+        removed = [pid for pid, quantity in quantities.items() if quantity <= 0]
+        if removed:
+            CartItem.objects.filter(cart=cart, product_id__in=removed).delete()
+
+        kept = {pid: quantity for pid, quantity in quantities.items() if quantity > 0}
+        existing = list(CartItem.objects.filter(cart=cart, product_id__in=list(kept)))
+        for item in existing:
+            item.quantity = kept.pop(item.product_id)
+        if existing:
+            CartItem.objects.bulk_update(existing, ['quantity'])
+        if kept:
+            CartItem.objects.bulk_create([
+                CartItem(cart=cart, product_id=pid, quantity=quantity)
+                for pid, quantity in kept.items()
+            ])
+
+    def get_item(self, item_id):
+        try:
+            return CartItem.objects.select_related('product').get(
+                id=item_id, cart=self.get_cart())
+        except CartItem.DoesNotExist:
+            return None
+
+    def get_items(self, item_ids):
+        return CartItem.objects.select_related('product').filter(
+            cart=self.get_cart()).in_bulk(item_ids)
+
+    def update(self, item_id, quantity):
+        CartItem.objects.filter(id=item_id, cart=self.get_cart()).update(
+            quantity=quantity)
+
+    def remove(self, item_id):
+        deleted, _ = CartItem.objects.filter(
+            id=item_id, cart=self.get_cart()).delete()
+        return deleted > 0
+
+    def clear(self):
+        self.get_cart().items.all().delete()
+
+    def get_checkout_cart(self):
+        session_key = self.get_session_key(create=False)
+        if not session_key:
+            return None
+        return Cart.objects.filter(session_key=session_key).first()
+
+
+class CacheCartStore(BaseCartStore):
+    """
+    Live cart cache এ: {'items': {product_id: quantity}, 'cart_id', 'dirty'}
+    Browsing ও cart edit এ database এ কোনো write হয় না।
+    Cache miss হলে (যেমন restart) DB তে save করা cart থেকে load হয়।
+
+    Stock reservation ও flush এর সাথে লেখা হয় (flush_carts / checkout), edit
+    এ শুধু available stock check হয়। Trade-off: দুটো flush এর মাঝে অন্য cart
+    একই stock নিতে পারে (reservation পিছিয়ে থাকে), checkout এ stock আবার
+    check হয় — তাই flush_carts CART_RESERVATION_TTL এর চেয়ে ঘন ঘন চালাও।
+    """
+
+    def cache_key(self, session_key=None):
+        return f'cart:{session_key or self.get_session_key()}'
+
+    def get_state(self):
+        if not hasattr(self, '_state'):
+            self._state = cache.get(self.cache_key())
+            if self._state is None:
+                self._state = self.load_from_db()
+        return self._state
+
+    def load_from_db(self):
+        cart = Cart.objects.filter(session_key=self.get_session_key()).first()
+        items = {}
+        if cart:
+            items = dict(cart.items.values_list('product_id', 'quantity'))
+        return {'items': items, 'cart_id': cart.id if cart else None, 'dirty': False}
+
+    async def aload_from_db(self, session_key):
+        cart = await Cart.objects.filter(session_key=session_key).afirst()
+        items = {}
+        if cart:
+            items = {
+                product_id: quantity
+                async for product_id, quantity in cart.items.values_list(
+                    'product_id', 'quantity')
+            }
+        return {'items': items, 'cart_id': cart.id if cart else None, 'dirty': False}
+
+    def save_state(self):
+        state = self.get_state()
+        state['dirty'] = True
+        cache.set(self.cache_key(), state, settings.CART_CACHE_TIMEOUT)
+        mark_dirty(self.get_session_key())
+
+    def product_queryset(self, serializer):
+        product_deferred = [
+            name[len('product__'):]
+            for name in self.item_deferred_fields(serializer)
+            if name.startswith('product__')
+        ]
+        return Product.objects.select_related('category').defer(*product_deferred)
+
+    def serialize_state(self, serializer, state, products):
+        # Unsaved CartItem দিয়ে DB store এর মতো একই format বানাও
+        lines = [
+            CartItem(id=product_id, product=products[product_id], quantity=quantity)
+            for product_id, quantity in state['items'].items()
+            if product_id in products
+        ]
+        return self.serialize_lines(serializer, state['cart_id'], lines)
+
+    def serialize(self):
+        state = self.get_state()
+        # Field selection এর জন্য CartSerializer এর structure ব্যবহার করো
+        serializer = CartSerializer(context=self.get_serializer_context())
+        products = self.product_queryset(serializer).in_bulk(list(state['items']))
+        return self.serialize_state(serializer, state, products)
+
+    async def aserialize(self):
+        serializer = CartSerializer(context=self.get_serializer_context())
+        session_key = await self.aget_session_key()
+        if not session_key:
+            return self.serialize_lines(serializer, None, [])
+        state = await cache.aget(self.cache_key(session_key))
+        if state is None:
+            state = await self.aload_from_db(session_key)
+        products = await self.product_queryset(serializer).ain_bulk(list(state['items']))
+        return self.serialize_state(serializer, state, products)
+
+    def add(self, product, quantity):
+        items = self.get_state()['items']
+        items[product.id] = items.get(product.id, 0) + quantity
+        self.save_state()
+
+    def get_quantity(self, product_id):
+        return self.get_state()['items'].get(product_id, 0)
+
+    def get_quantities(self, product_ids):
+        items = self.get_state()['items']
+        return {pid: items[pid] for pid in product_ids if pid in items}
+
+    def set_quantities(self, quantities):
+        items = self.get_state()['items']
+        for pid, quantity in quantities.items():
+            if quantity > 0:
+                items[pid] = quantity
+            else:
+                items.pop(pid, None)
+        self.save_state()
+
+    def get_items(self, item_ids):
+        items = self.get_state()['items']
+        products = Product.objects.in_bulk([pid for pid in item_ids if pid in items])
+        return {
+            pid: CartItem(id=pid, product=product, quantity=items[pid])
+            for pid, product in products.items()
+        }
+
+    def get_item(self, item_id):
+        quantity = self.get_state()['items'].get(item_id)
+        if quantity is None:
+            return None
+        try:
+            product = Product.objects.get(id=item_id)
+        except Product.DoesNotExist:
+            return None
+        return CartItem(id=item_id, product=product, quantity=quantity)
+
+    def update(self, item_id, quantity):
+        items = self.get_state()['items']
+        if item_id in items:
+            items[item_id] = quantity
+            self.save_state()
+
+    def remove(self, item_id):
+        items = self.get_state()['items']
+        if item_id not in items:
+            return False
+        del items[item_id]
+        self.save_state()
+        return True
+
+    def clear(self):
+        self.get_state()['items'].clear()
+        self.save_state()
+
+    def flush(self):
+        """Cache এর cart DB তে persist করো (শুধু dirty হলে)"""
+        flush_state(self.get_session_key(), self.get_state())
+
+    def get_checkout_cart(self):
+        session_key = self.get_session_key(create=False)
+        if not session_key:
+            return None
+        self.flush()
+        return Cart.objects.filter(session_key=session_key).first()
+
+    def checkout_complete(self):
+        # DB cart খালি হয়ে গেছে; পরের request এ DB থেকে আবার load হবে
+        cache.delete(self.cache_key())
+        self.__dict__.pop('_state', None)
+
+    def reserve(self, quantities):
+        reservations.check_available(self.get_session_key(), quantities)
+
+    def release_reservations(self, product_ids=None):
+        # Flush এর সময় sync হয়
+        pass
+
+    def touch_reservations(self):
+        pass
+
+
+def flush_state(session_key, state):
+    """
+    Cache cart state DB তে লেখো (dirty হলে), তারপর clean হিসেবে cache এ রাখো
+    Cart items পুরোটা replace হয়: এক delete + এক bulk insert; stock
+    reservation ও cart এর মতো করা হয় (reservations.sync)
+    """
+    if not state['dirty']:
+        return False
+
+    with transaction.atomic():
+        cart, created = Cart.objects.get_or_create(session_key=session_key)
+        if not created:
+            cart.items.all().delete()
+        # এর মধ্যে delete হয়ে যাওয়া product বাদ দাও
+        products = Product.objects.in_bulk(list(state['items']))
+        CartItem.objects.bulk_create([
+            CartItem(cart=cart, product_id=product_id, quantity=quantity)
+            for product_id, quantity in state['items'].items()
+            if product_id in products
+        ])
+        reservations.sync(session_key, {
+            products[product_id]: quantity
+            for product_id, quantity in state['items'].items()
+            if product_id in products
+        })
+
+    state['cart_id'] = cart.id
+    key = f'cart:{session_key}'
+    current = cache.get(key)
+    if current is not None and current['items'] != state['items']:
+        # এর মধ্যে cart বদলেছে (অন্য request): নতুন state টা dirty রেখে দাও
+        current['cart_id'] = cart.id
+        cache.set(key, current, settings.CART_CACHE_TIMEOUT)
+        mark_dirty(session_key)
+        return True
+    state['dirty'] = False
+    cache.set(key, state, settings.CART_CACHE_TIMEOUT)
+    return True
+
+
+def _dirty_marker(session_key):
+    return f'cart:dirty:session:{session_key}'
+
+
+def _dirty_slot(number):
+    return f'cart:dirty:{number}'
+
+
+def mark_dirty(session_key):
+    """Session টা dirty index এ দাও (আগে থেকে থাকলে কিছু করে না)"""
+    if not cache.add(_dirty_marker(session_key), True, None):
+        return
+    cache.add(DIRTY_SEQ_KEY, 0, None)
+    cache.set(_dirty_slot(cache.incr(DIRTY_SEQ_KEY)), session_key, None)
+
+
+def flush_dirty_carts():
+    """
+    Dirty সব cache cart DB তে লেখো; কয়টা flush হলো return করে
+    Marker আগে মোছা হয়, state পরে পড়া হয়: এর মধ্যে cart বদলালে সেটা নতুন
+    slot পায় আর পরের flush এ যায়। একসাথে একটাই flush_carts চালাও (cron)।
+    """
+    last = cache.get(DIRTY_SEQ_KEY, 0)
+    start, gap = cache.get(DIRTY_FLUSHED_KEY, (0, None))
+    if start > last:
+        # Cache clear হয়ে sequence আবার শুরু হয়েছে
+        start, gap = 0, None
+    numbers = range(start + 1, last + 1)
+    found = cache.get_many([_dirty_slot(number) for number in numbers])
+
+    flushed = 0
+    done = start
+    for number in numbers:
+        session_key = found.get(_dirty_slot(number))
+        if session_key is None:
+            # incr হয়েছে কিন্তু slot এখনো লেখা হয়নি: পরের বার আবার দেখো।
+            # পরের বারও না থাকলে (সেই request মারা গেছে) বাদ দাও
+            if number != gap:
+                gap = number
+                break
+            done = number
+            continue
+        cache.delete(_dirty_marker(session_key))
+        state = cache.get(f'cart:{session_key}')
+        if state and flush_state(session_key, state):
+            flushed += 1
+        cache.delete(_dirty_slot(number))
+        done = number
+    cache.set(DIRTY_FLUSHED_KEY, (done, gap), None)
+    return flushed
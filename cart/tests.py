@@ -1,3 +1,309 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from products.models import Category, Product
+from . import reservations, storage
+from .models import Cart, CartItem, StockReservation
+
+
+class CartQueryCountTest(TestCase):
+    """Cart API এর query সংখ্যা cart এর item সংখ্যার উপর নির্ভর করবে না"""
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Makeup')
+        self.products = [
+            Product.objects.create(
+                name=f'Product {i}', description='Test product',
+                price=100 + i, category=self.category, stock=50)
+            for i in range(10)
+        ]
+        # Session তৈরি করো
+        self.client.get('/api/cart/')
+        self.cart = Cart.objects.get(
+            session_key=self.client.session.session_key)
+
+    def fill_cart(self, count):
+        CartItem.objects.filter(cart=self.cart).delete()
+        StockReservation.objects.all().delete()
+        Product.objects.update(reserved=0)
+        for product in self.products[:count]:
+            CartItem.objects.create(cart=self.cart, product=product, quantity=2)
+
+    def count_queries(self, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(
+                url, content_type='application/json', **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_get_cart_query_count_is_constant(self):
+        self.fill_cart(1)
+        small, data = self.count_queries('get', '/api/cart/')
+        self.assertEqual(data['total_items'], 2)
+
+        self.fill_cart(10)
+        large, data = self.count_queries('get', '/api/cart/')
+        self.assertEqual(len(data['items']), 10)
+        self.assertEqual(data['total_items'], 20)
+        self.assertEqual(small, large)
+
+    def test_add_to_cart_query_count_is_constant(self):
+        self.fill_cart(1)
+        small, _ = self.count_queries(
+            'post', '/api/cart/add/',
+            data={'product_id': self.products[0].id, 'quantity': 1})
+
+        self.fill_cart(9)
+        large, data = self.count_queries(
+            'post', '/api/cart/add/',
+            data={'product_id': self.products[0].id, 'quantity': 1})
+        self.assertEqual(len(data['items']), 9)
+        self.assertEqual(small, large)
+
+    def test_totals(self):
+        self.fill_cart(3)
+        _, data = self.count_queries('get', '/api/cart/')
+        self.assertEqual(data['total_items'], 6)
+        self.assertEqual(float(data['total']), (100 + 101 + 102) * 2)
+
+
+@override_settings(CART_STORE='cart.storage.CacheCartStore')
+class CacheCartStoreTest(TestCase):
+    """Cache store: cart edit এ Cart/CartItem এ write হবে না, checkout এ persist হবে"""
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Lipstick', description='Test product',
+            price=250, category=category, stock=10)
+
+    def test_cart_edits_do_not_write_to_database(self):
+        self.client.get('/api/cart/')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                '/api/cart/add/', {'product_id': self.product.id, 'quantity': 2},
+                content_type='application/json')
+            response = self.client.put(
+                f'/api/cart/update/{self.product.id}/', {'quantity': 3},
+                content_type='application/json')
+
+        writes = [q['sql'] for q in queries
+                  if not q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(writes, [])
+        self.assertEqual(response.json()['total_items'], 3)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_reservations_are_written_on_flush(self):
+        other = Client()
+        other.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 4},
+            content_type='application/json')
+        storage.flush_dirty_carts()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved, 4)
+
+        # Edit এ available stock check হয় (অন্য cart এর reservation বাদে)
+        response = self.client.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 7},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.client.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 6},
+            content_type='application/json')
+        other.delete(f'/api/cart/remove/{self.product.id}/')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved, 4)
+
+        storage.flush_dirty_carts()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved, 6)
+        self.assertEqual(
+            list(StockReservation.objects.values_list('session_key', 'quantity')),
+            [(self.client.session.session_key, 6)])
+
+    def test_flush_picks_up_every_dirty_cart(self):
+        other = Client()
+        for client in (self.client, other):
+            client.post(
+                '/api/cart/add/', {'product_id': self.product.id, 'quantity': 1},
+                content_type='application/json')
+        self.assertEqual(storage.flush_dirty_carts(), 2)
+        self.assertEqual(CartItem.objects.count(), 2)
+        self.assertEqual(storage.flush_dirty_carts(), 0)
+
+        # Flush এর পরে edit হলে cart আবার index এ আসে
+        self.client.put(
+            f'/api/cart/update/{self.product.id}/', {'quantity': 3},
+            content_type='application/json')
+        self.assertEqual(storage.flush_dirty_carts(), 1)
+        self.assertEqual(
+            CartItem.objects.get(cart__session_key=self.client.session.session_key).quantity, 3)
+
+        # Slot নেওয়া হয়েছে কিন্তু লেখা হয়নি: পরের cart টা হারায় না
+        cache.incr(storage.DIRTY_SEQ_KEY)
+        other.put(
+            f'/api/cart/update/{self.product.id}/', {'quantity': 2},
+            content_type='application/json')
+        self.assertEqual(storage.flush_dirty_carts(), 0)
+        self.assertEqual(storage.flush_dirty_carts(), 1)
+        self.assertEqual(
+            CartItem.objects.get(cart__session_key=other.session.session_key).quantity, 2)
+
+    def test_checkout_persists_cart(self):
+        self.client.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 2},
+            content_type='application/json')
+
+        response = self.client.post('/api/orders/create/', {
+            'customer_name': 'Test',
+            'customer_email': 'test@example.com',
+            'customer_phone': '01700000000',
+            'shipping_address': 'Road 1',
+            'city': 'Dhaka',
+            'payment_method': 'cod',
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['order']['items'][0]['quantity'], 2)
+        self.assertEqual(self.client.get('/api/cart/').json()['total_items'], 0)
+
+
+class CartSparseFieldsTest(TestCase):
+    """?fields= / ?compact=1 দুই cart store এই একই response দেয়"""
+
+    STORES = ['cart.storage.DatabaseCartStore', 'cart.storage.CacheCartStore']
+
+    def setUp(self):
+        category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Lipstick', description='A very long description ' * 20,
+            price=250, category=category, stock=10)
+
+    def fill_cart(self):
+        cache.clear()
+        self.client = Client()
+        self.client.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 2},
+            content_type='application/json')
+
+    def test_fields(self):
+        for store in self.STORES:
+            with self.subTest(store=store), override_settings(CART_STORE=store):
+                self.fill_cart()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(
+                        '/api/cart/?fields=total_items,items.quantity,items.product.name')
+                self.assertEqual(response.json(), {
+                    'items': [{'quantity': 2, 'product': {'name': 'Lipstick'}}],
+                    'total_items': 2,
+                })
+                self.assertFalse(any('"description"' in query['sql'] for query in queries))
+
+    def test_compact(self):
+        for store in self.STORES:
+            with self.subTest(store=store), override_settings(CART_STORE=store):
+                self.fill_cart()
+                data = self.client.get('/api/cart/?compact=1').json()
+                product = data['items'][0]['product']
+                self.assertNotIn('description', product)
+                self.assertEqual((product['name'], data['total_items']), ('Lipstick', 2))
+                self.assertEqual(float(data['total']), 500)
+
+
+class StockReservationTest(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Sale Lipstick', description='Limited stock',
+            price=300, category=category, stock=3)
+
+    def add(self, client, quantity):
+        return client.post(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': quantity},
+            content_type='application/json')
+
+    def test_reserved_stock_is_not_available_to_other_carts(self):
+        self.assertEqual(self.add(self.client, 2).status_code, 200)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.available_stock, 1)
+
+        other = Client()
+        self.assertEqual(self.add(other, 2).status_code, 400)
+        self.assertEqual(self.add(other, 1).status_code, 200)
+
+    def test_remove_releases_reservation(self):
+        data = self.add(self.client, 2).json()
+        self.client.delete(f"/api/cart/remove/{data['items'][0]['id']}/")
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved, 0)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_sweeper_releases_expired_reservations(self):
+        self.add(self.client, 2)
+        StockReservation.objects.update(
+            expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(reservations.release_expired(batch_size=1), 1)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved, 0)
+
+
+class CartBatchTest(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name='Makeup')
+        self.products = [
+            Product.objects.create(
+                name=f'Product {i}', description='Test product',
+                price=100, category=category, stock=5)
+            for i in range(3)
+        ]
+
+    def batch(self, operations):
+        return self.client.post(
+            '/api/cart/batch/', {'operations': operations},
+            content_type='application/json')
+
+    def test_operations_apply_in_order(self):
+        data = self.batch([
+            {'op': 'add', 'product_id': self.products[0].id, 'quantity': 2},
+            {'op': 'add', 'product_id': self.products[1].id},
+        ]).json()
+        first, second = sorted(data['items'], key=lambda item: item['product']['id'])
+
+        response = self.batch([
+            {'op': 'update', 'item_id': first['id'], 'quantity': 4},
+            {'op': 'remove', 'item_id': second['id']},
+            {'op': 'add', 'product_id': self.products[2].id, 'quantity': 1},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        quantities = {item['product']['id']: item['quantity']
+                      for item in response.json()['items']}
+        self.assertEqual(quantities, {self.products[0].id: 4, self.products[2].id: 1})
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].reserved, 4)
+
+    def test_batch_is_atomic(self):
+        response = self.batch([
+            {'op': 'add', 'product_id': self.products[0].id, 'quantity': 2},
+            {'op': 'add', 'product_id': self.products[1].id, 'quantity': 6},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/cart/').json()['total_items'], 0)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_unknown_item(self):
+        response = self.batch([{'op': 'remove', 'item_id': 999}])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['operation'], 0)
@@ -7,4 +7,5 @@ urlpatterns = [
     path('update/<int:item_id>/', views.update_cart_item, name='update_cart_item'),
     path('remove/<int:item_id>/', views.remove_from_cart, name='remove_from_cart'),
     path('clear/', views.clear_cart, name='clear_cart'),
+    path('batch/', views.batch_update_cart, name='batch_update_cart'),
 ]
\ No newline at end of file
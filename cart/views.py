@@ -1,36 +1,27 @@
+from django.db import transaction
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Cart, CartItem
-from .serializers import CartSerializer
+from . import reservations
+from .serializers import CartBatchSerializer
+from .storage import get_cart_store
 from products.models import Product
 
 
-def get_or_create_cart(request):
-    """Session based cart তৈরি বা get করো"""
-    if not request.session.session_key:
-        request.session.create()
-
-    session_key = request.session.session_key
-    cart, created = Cart.objects.get_or_create(session_key=session_key)
-    return cart
-
-
 @api_view(['GET'])
 def get_cart(request):
     """Cart দেখাও"""
-    cart = get_or_create_cart(request)
-    serializer = CartSerializer(cart)
-    return Response(serializer.data)
+    store = get_cart_store(request)
+    return Response(store.serialize())
 
 
 @csrf_exempt
 @api_view(['POST'])
 def add_to_cart(request):
     """Cart এ product add করো"""
-    cart = get_or_create_cart(request)
+    store = get_cart_store(request)
     product_id = request.data.get('product_id')
     quantity = request.data.get('quantity', 1)
 
@@ -42,85 +33,147 @@ def add_to_cart(request):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    if product.stock < quantity:
+    # Cart এর মোট quantity এর জন্য stock reserve করো
+    try:
+        store.reserve({product: store.get_quantity(product.id) + quantity})
+    except reservations.InsufficientStockError:
         return Response(
             {'error': 'Not enough stock available'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    cart_item, created = CartItem.objects.get_or_create(
-        cart=cart,
-        product=product,
-        defaults={'quantity': quantity}
-    )
-
-    if not created:
-        cart_item.quantity += quantity
-        cart_item.save()
-
-    serializer = CartSerializer(cart)
-    return Response(serializer.data)
+    store.add(product, quantity)
+    store.touch_reservations()
+    return Response(store.serialize())
 
 
 @csrf_exempt
 @api_view(['PUT'])
 def update_cart_item(request, item_id):
     """Cart item এর quantity update করো"""
-    cart = get_or_create_cart(request)
+    store = get_cart_store(request)
     quantity = request.data.get('quantity', 1)
 
-    try:
-        cart_item = CartItem.objects.get(id=item_id, cart=cart)
-    except CartItem.DoesNotExist:
+    cart_item = store.get_item(item_id)
+    if cart_item is None:
         return Response(
             {'error': 'Item not found in cart'},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    if cart_item.product.stock < quantity:
+    try:
+        store.reserve({cart_item.product: max(quantity, 0)})
+    except reservations.InsufficientStockError:
         return Response(
             {'error': 'Not enough stock available'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
     if quantity <= 0:
-        cart_item.delete()
+        store.remove(item_id)
     else:
-        cart_item.quantity = quantity
-        cart_item.save()
+        store.update(item_id, quantity)
 
-    serializer = CartSerializer(cart)
-    return Response(serializer.data)
+    store.touch_reservations()
+    return Response(store.serialize())
 
 
 @csrf_exempt
 @api_view(['DELETE'])
 def remove_from_cart(request, item_id):
     """Cart থেকে item remove করো"""
-    cart = get_or_create_cart(request)
+    store = get_cart_store(request)
 
-    try:
-        cart_item = CartItem.objects.get(id=item_id, cart=cart)
-        cart_item.delete()
-    except CartItem.DoesNotExist:
+    cart_item = store.get_item(item_id)
+    if cart_item is None:
         return Response(
             {'error': 'Item not found in cart'},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = CartSerializer(cart)
-    return Response(serializer.data)
+    store.remove(item_id)
+    store.release_reservations([cart_item.product.id])
+    return Response(store.serialize())
 
 
 @csrf_exempt
 @api_view(['DELETE'])
 def clear_cart(request):
     """পুরো Cart খালি করো"""
-    cart = get_or_create_cart(request)
-    cart.items.all().delete()
+    store = get_cart_store(request)
+    store.clear()
+    store.release_reservations()
+    return Response(store.serialize())
+
+
+@csrf_exempt
+@api_view(['POST'])
+def batch_update_cart(request):
+    """
+    একাধিক cart change এক request এ (সব হবে অথবা কিছুই হবে না)
+    POST /api/cart/batch/
+    {"operations": [{"op": "add", "product_id": 1, "quantity": 2},
+                    {"op": "update", "item_id": 5, "quantity": 3},
+                    {"op": "remove", "item_id": 7}]}
+    """
+    serializer = CartBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    operations = serializer.validated_data['operations']
+
+    store = get_cart_store(request)
+    products = Product.objects.filter(is_active=True).in_bulk(
+        [op['product_id'] for op in operations if op['op'] == 'add'])
+    items = store.get_items(
+        [op['item_id'] for op in operations if op['op'] != 'add'])
+
+    # প্রতিটা operation কোন product এ হবে, বের করো
+    targets = {}
+    for index, op in enumerate(operations):
+        if op['op'] == 'add':
+            product = products.get(op['product_id'])
+            if product is None:
+                return Response(
+                    {'error': 'Product not found', 'operation': index},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        else:
+            item = items.get(op['item_id'])
+            if item is None:
+                return Response(
+                    {'error': 'Item not found in cart', 'operation': index},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            product = item.product
+        op['product'] = product
+        targets[product.id] = product
+
+    # Operations memory তে পরপর apply করে final quantity বের করো
+    quantities = store.get_quantities(list(targets))
+    for op in operations:
+        product_id = op['product'].id
+        if op['op'] == 'add':
+            quantities[product_id] = quantities.get(product_id, 0) + op['quantity']
+        elif op['op'] == 'update':
+            quantities[product_id] = max(op['quantity'], 0)
+        else:
+            quantities[product_id] = 0
+
+    try:
+        with transaction.atomic():
+            store.reserve({
+                targets[product_id]: quantity
+                for product_id, quantity in quantities.items()
+            })
+            store.set_quantities(quantities)
+    except reservations.InsufficientStockError as error:
+        return Response(
+            {'error': str(error)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    serializer = CartSerializer(cart)
-    return Response(serializer.data)
+    store.touch_reservations()
+    return Response(store.serialize())
 
 
 # ============================================
@@ -134,4 +187,4 @@ def cart_page(request):
 
 def checkout_page(request):
     """Checkout page"""
-    return render(request, 'checkout.html')
\ No newline at end of file
+    return render(request, 'checkout.html')
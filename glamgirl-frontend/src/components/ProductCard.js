@@ -5,6 +5,9 @@ import { useCart } from '../context/CartContext';
 import { useWishlist } from '../context/WishlistContext';
 import { toast } from 'react-toastify';
 
+// Grid column width অনুযায়ী browser ঠিক করবে কোন size এর image লাগবে
+const IMAGE_SIZES = '(min-width: 992px) 25vw, (min-width: 768px) 33vw, (min-width: 576px) 50vw, 100vw';
+
 const ProductCard = ({ product }) => {
     const { addToCart } = useCart();
     const { isInWishlist, toggleWishlist } = useWishlist();
@@ -28,6 +31,8 @@ const ProductCard = ({ product }) => {
     };
 
     const imageUrl = product.image || 'https://via.placeholder.com/300x300?text=No+Image';
+    // Resized WebP/JPEG (server এ তৈরি না হলে null)
+    const srcset = product.image_srcset;
     const inWishlist = isInWishlist(product.id);
 
     return (
@@ -35,11 +40,26 @@ const ProductCard = ({ product }) => {
             <div className="card product-card h-100 border-0 shadow-sm">
                 <div className="product-image-wrapper">
                     <Link to={`/product/${product.id}`}>
-                        <img 
-                            src={imageUrl} 
-                            alt={product.name} 
-                            className="card-img-top product-image"
-                        />
+                        {srcset ? (
+                            <picture>
+                                <source type="image/webp" srcSet={srcset.webp} sizes={IMAGE_SIZES} />
+                                <img 
+                                    src={srcset.src} 
+                                    srcSet={srcset.jpg}
+                                    sizes={IMAGE_SIZES}
+                                    alt={product.name} 
+                                    className="card-img-top product-image"
+                                    loading="lazy"
+                                />
+                            </picture>
+                        ) : (
+                            <img 
+                                src={imageUrl} 
+                                alt={product.name} 
+                                className="card-img-top product-image"
+                                loading="lazy"
+                            />
+                        )}
                     </Link>
                     
                     {/* Wishlist Button */}
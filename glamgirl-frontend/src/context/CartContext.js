@@ -1,5 +1,5 @@
 import React, { createContext, useState, useContext, useEffect } from 'react';
-import { getCart, addToCart as addToCartAPI, updateCartItem, removeFromCart as removeFromCartAPI } from '../services/api';
+import { getCart, addToCart as addToCartAPI, updateCartItem, removeFromCart as removeFromCartAPI, batchUpdateCart } from '../services/api';
 
 const CartContext = createContext();
 
@@ -58,6 +58,18 @@ export const CartProvider = ({ children }) => {
         }
     };
 
+    // Multiple changes in one request (e.g. wishlist → cart)
+    const applyCartOperations = async (operations) => {
+        try {
+            const response = await batchUpdateCart(operations);
+            setCart(response.data);
+            return { success: true };
+        } catch (error) {
+            console.error('Error updating cart:', error);
+            return { success: false, error: error.response?.data?.error || 'Failed to update cart' };
+        }
+    };
+
     return (
         <CartContext.Provider value={{
             cart,
@@ -65,6 +77,7 @@ export const CartProvider = ({ children }) => {
             addToCart,
             updateQuantity,
             removeFromCart,
+            applyCartOperations,
             fetchCart
         }}>
             {children}
@@ -33,13 +33,13 @@ const Home = () => {
         const fetchData = async () => {
             try {
                 const [productsRes, categoriesRes] = await Promise.all([
-                    getProducts(),
+                    getProducts({ page_size: 8 }),
                     getCategories()
                 ]);
 
                 if (!isMounted) return;
 
-                setProducts(productsRes.data);
+                setProducts(productsRes.data.results);
                 setCategories(categoriesRes.data);
             } catch (error) {
                 console.error('Error fetching data:', error);
@@ -31,10 +31,10 @@ const Products = () => {
     const fetchData = async () => {
         try {
             const [productsRes, categoriesRes] = await Promise.all([
-                getProducts(),
+                getProducts({ page_size: 100 }),
                 getCategories()
             ]);
-            setProducts(productsRes.data);
+            setProducts(productsRes.data.results);
             setCategories(categoriesRes.data);
         } catch (error) {
             console.error('Error:', error);
@@ -13,20 +13,23 @@ const api = axios.create({
 
 // Products API
 export const getCategories = () => api.get('/products/categories/');
-export const getProducts = () => api.get('/products/');
+export const getProducts = (params = {}) => api.get('/products/', { params });
 export const getProduct = (id) => api.get(`/products/${id}/`);
-export const getProductsByCategory = (categoryId) => api.get(`/products/category/${categoryId}/`);
+export const getProductsByCategory = (categoryId, params = {}) => api.get(`/products/category/${categoryId}/`, { params });
 
-// Cart API
-export const getCart = () => api.get('/cart/');
-export const addToCart = (productId, quantity = 1) => api.post('/cart/add/', { product_id: productId, quantity });
-export const updateCartItem = (itemId, quantity) => api.put(`/cart/update/${itemId}/`, { quantity });
-export const removeFromCart = (itemId) => api.delete(`/cart/remove/${itemId}/`);
-export const clearCart = () => api.delete('/cart/clear/');
+// Cart API (compact: cart items don't need product descriptions)
+const compact = { params: { compact: 1 } };
+export const getCart = () => api.get('/cart/', compact);
+export const addToCart = (productId, quantity = 1) => api.post('/cart/add/', { product_id: productId, quantity }, compact);
+export const updateCartItem = (itemId, quantity) => api.put(`/cart/update/${itemId}/`, { quantity }, compact);
+export const removeFromCart = (itemId) => api.delete(`/cart/remove/${itemId}/`, compact);
+export const clearCart = () => api.delete('/cart/clear/', compact);
+// operations: [{ op: 'add', product_id, quantity }, { op: 'update', item_id, quantity }, { op: 'remove', item_id }]
+export const batchUpdateCart = (operations) => api.post('/cart/batch/', { operations }, compact);
 
 // Orders API
 export const createOrder = (orderData) => api.post('/orders/create/', orderData);
-export const getOrders = () => api.get('/orders/');
+export const getOrders = (params = {}) => api.get('/orders/', { params });
 export const getOrder = (orderId) => api.get(`/orders/${orderId}/`);
 
 export default api;
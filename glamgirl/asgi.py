@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'glamgirl.settings')
+# Read endpoints এর async views চালু (settings.ASYNC_VIEWS)
+os.environ.setdefault('GLAMGIRL_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,70 @@
+"""
+Async API views (ASGI deployment)
+
+DRF এর APIView/@api_view sync, তাই ASGI তে প্রতিটা DRF request একটা thread এ
+চলে। @async_api_view দিয়ে একটা `async def` view DRF এর মতো লেখা যায়:
+
+    @async_api_view(['GET'])
+    async def track_order(request, order_id):
+        order = await Order.objects.aget(id=order_id)
+        return Response({...})
+
+- request একটা DRF Request (query_params, build_absolute_uri), authentication ছাড়া
+- Response(data, status) return করো; JSONRenderer দিয়ে এখানেই render হয়
+  (Django যেন template response render করতে thread এ না পাঠায়)
+- ValidationError / NotFound / Http404 DRF এর exception handler এর মতো
+  {'detail': ...} বা field errors হয়ে যায়
+
+View এর ভেতরে DB শুধু async ORM (aget, afirst, `async for`) দিয়ে পড়ো —
+sync query করলে Django SynchronousOnlyOperation raise করে।
+"""
+
+from functools import wraps
+
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+renderer = JSONRenderer()
+
+
+def render(response):
+    """DRF Response -> JSON HttpResponse (headers সহ)"""
+    content = b'' if response.data is None else renderer.render(response.data)
+    rendered = HttpResponse(
+        content, status=response.status_code, content_type=renderer.media_type)
+    for header, value in response.items():
+        if header.lower() != 'content-type':
+            rendered[header] = value
+    return rendered
+
+
+def async_api_view(http_method_names):
+    """@api_view এর async version (শুধু JSON, authentication/permission ছাড়া)"""
+    allowed = {method.upper() for method in http_method_names}
+    if 'GET' in allowed:
+        allowed.add('HEAD')
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            drf_request = Request(request, authenticators=())
+            try:
+                if request.method not in allowed:
+                    raise MethodNotAllowed(request.method)
+                response = await view(drf_request, *args, **kwargs)
+            except Exception as error:
+                response = api_settings.EXCEPTION_HANDLER(
+                    error, {'request': drf_request, 'args': args, 'kwargs': kwargs})
+                if response is None:
+                    raise
+            if request.method == 'HEAD':
+                response.data = None
+            elif response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED:
+                response['Allow'] = ', '.join(sorted(allowed))
+            return render(response)
+        return wrapped
+    return decorator
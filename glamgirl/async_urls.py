@@ -0,0 +1,27 @@
+"""
+ASGI deployment এর URL configuration (settings.ASYNC_VIEWS)
+
+Read endpoints (catalog ও facets, cart GET, order detail/track) এর async views আগে
+match হয়; একই path ও name, তাই frontend বা reverse() এ কোনো পার্থক্য নেই।
+বাকি সব (writes, search, admin, pages) glamgirl.urls এর sync views।
+"""
+
+from django.urls import path
+
+from cart import async_views as cart_views
+from orders import async_views as order_views
+from products import async_views as product_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/products/categories/', product_views.category_list, name='category-list'),
+    path('api/products/', product_views.product_list, name='product-list'),
+    path('api/products/facets/', product_views.product_facets, name='product-facets'),
+    path('api/products/<int:pk>/', product_views.product_detail, name='product-detail'),
+    path('api/products/category/<int:category_id>/', product_views.products_by_category,
+         name='products-by-category'),
+    path('api/cart/', cart_views.get_cart, name='get_cart'),
+    path('api/orders/<int:order_id>/', order_views.order_detail, name='order-detail'),
+    path('api/orders/track/<int:order_id>/', order_views.track_order, name='track-order'),
+] + sync_urlpatterns
@@ -0,0 +1,241 @@
+"""
+বড় table (লাখ লাখ orders/products) এর admin changelist
+
+Django admin এর default changelist ছোট table এর জন্য: প্রতি page এ exact
+COUNT(*) (filter থাকলে দুটো), date hierarchy তে সব row এর উপর
+SELECT DISTINCT django_datetime_trunc(...), আর field এর সব distinct value
+দিয়ে list filter। ScalableAdminMixin এগুলো index দিয়ে করে:
+
+- EstimatedCountPaginator: অল্প result হলে exact count, বেশি হলে estimate
+  (estimate কম হলেও শেষ page থেকে পরের pages এ যাওয়া যায়)
+- IndexedDateQuerySet: date hierarchy র years/months/days Min/Max ও প্রতিটা
+  period এ একটা EXISTS (index seek) দিয়ে, পুরো table scan ছাড়া
+- CachedDistinctFilter: distinct values cache থেকে (ADMIN_FILTER_CACHE_TIMEOUT)
+
+SQLite এ MIN() ও MAX() একই query তে থাকলে index ব্যবহার হয় না (পুরো scan),
+তাই দুটো আলাদা ORDER BY ... LIMIT 1 (seek)।
+"""
+
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import F, Max, Min, QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+def seek(queryset, field_name, last=False):
+    """Field এর MIN (last=True হলে MAX) — একটা index seek"""
+    return (queryset.filter(**{f'{field_name}__isnull': False})
+            .order_by(f'-{field_name}' if last else field_name)
+            .values_list(field_name, flat=True).first())
+
+
+def seek_bounds(queryset, field_name):
+    """(MIN, MAX) — দুটো index seek"""
+    return seek(queryset, field_name), seek(queryset, field_name, last=True)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    EXACT_COUNT_LIMIT পর্যন্ত exact count (LIMIT দেওয়া COUNT, তার বেশি row
+    পড়ে না); বেশি হলে শেষের SAMPLE_SIZE টা id এর মধ্যে কতগুলো match করে
+    সেই হারে পুরো table এর estimate। শেষের দিকের pages খালি হতে পারে।
+
+    Filter যদি মূলত পুরনো rows এ match করে, sample এ প্রায় কিছুই পড়ে না:
+    MIN_SAMPLE_RATE এর কম হলে exact count। তারপরও estimate কম হলে শেষ
+    page এ (বা তার পরের page number এ) দেখা হয় আরো rows আছে কিনা, থাকলে
+    count বাড়ে — কোনো page বাদ পড়ে না।
+    """
+    EXACT_COUNT_LIMIT = 10000
+    SAMPLE_SIZE = 10000
+    MIN_SAMPLE_RATE = 0.01
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        exact = queryset[:self.EXACT_COUNT_LIMIT + 1].count()
+        if exact <= self.EXACT_COUNT_LIMIT:
+            return exact
+        estimate = self.estimate(queryset)
+        if estimate is None:
+            return queryset.count()
+        self.estimated = True
+        return max(estimate, exact)
+
+    def estimate(self, queryset):
+        """Sample থেকে estimate; sample এ match খুব কম হলে None"""
+        first, last = seek_bounds(queryset.model._default_manager.all(), 'pk')
+        rows = last - first + 1
+        window = min(rows, self.SAMPLE_SIZE)
+        sample = queryset.filter(pk__gt=last - window).count()
+        if sample < window * self.MIN_SAMPLE_RATE:
+            return None
+        return round(rows * sample / window)
+
+    def validate_number(self, number):
+        if self.count and self.estimated:
+            try:
+                self.extend_count(int(number))
+            except (TypeError, ValueError):
+                pass  # Django এর validate_number PageNotAnInteger দেবে
+        return super().validate_number(number)
+
+    def extend_count(self, number):
+        """
+        Estimate অনুযায়ী শেষ page বা তার পরের page চাইলে: সেই page থেকে কতগুলো
+        rows আছে গুনে (per_page + 1 পর্যন্ত) দরকার হলে count বাড়াও
+        """
+        if number < self.num_pages:
+            return
+        offset = (number - 1) * self.per_page
+        rows = self.object_list.order_by()[offset:offset + self.per_page + 1].count()
+        if rows and offset + rows > self.count:
+            self.count = offset + rows
+            self.__dict__.pop('num_pages', None)
+
+
+def _add_period(value, kind):
+    if kind == 'year':
+        return value.replace(year=value.year + 1)
+    if kind == 'month':
+        return (value.replace(year=value.year + 1, month=1) if value.month == 12
+                else value.replace(month=value.month + 1))
+    return value + timedelta(days=1)
+
+
+class IndexedDateQuerySet(QuerySet):
+    """
+    datetimes() এর index version (admin date hierarchy এটাই ডাকে): filter করা
+    rows এর Min/Max এর মধ্যের প্রতিটা year/month/day এ row আছে কিনা EXISTS
+    দিয়ে দেখো। Result Django এর datetimes() এর মতোই (current timezone এ)।
+
+    date_probe_base: একই filters কিন্তু date hierarchy র range ছাড়া — SQLite
+    একই column এ দুটো range থাকলে প্রথমটা দিয়েই index খোঁজে, তাই period
+    এর range টাই একমাত্র range হওয়া দরকার।
+    """
+    date_probe_base = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.date_probe_base = self.date_probe_base
+        return clone
+
+    def aggregate(self, *args, **kwargs):
+        # Date hierarchy tag এর aggregate(first=Min(f), last=Max(f)) -> index seeks
+        simple = kwargs and not args and all(
+            type(expression) in (Min, Max) and expression.filter is None
+            and len(expression.source_expressions) == 1
+            and isinstance(expression.source_expressions[0], F)
+            for expression in kwargs.values())
+        if not simple:
+            return super().aggregate(*args, **kwargs)
+        return {
+            alias: seek(self, expression.source_expressions[0].name,
+                        last=isinstance(expression, Max))
+            for alias, expression in kwargs.items()
+        }
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None, **kwargs):
+        if kind not in ('year', 'month', 'day') or kwargs:
+            return super().datetimes(field_name, kind, order, tzinfo, **kwargs)
+
+        first, last = seek_bounds(self, field_name)
+        if first is None:
+            return []
+        bounds = {'first': first, 'last': last}
+        tzinfo = tzinfo or (timezone.get_current_timezone() if settings.USE_TZ else None)
+        if tzinfo is not None:
+            bounds = {key: timezone.localtime(value, tzinfo) for key, value in bounds.items()}
+
+        reset = {'month': 1, 'day': 1, 'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0}
+        if kind == 'month':
+            del reset['month']
+        elif kind == 'day':
+            del reset['month'], reset['day']
+        start = bounds['first'].replace(tzinfo=None, **reset)
+        last = bounds['last'].replace(tzinfo=None)
+
+        probe = self.date_probe_base if self.date_probe_base is not None else self
+        periods = []
+        while start <= last:
+            end = _add_period(start, kind)
+            period = [start, end]
+            if tzinfo is not None:
+                period = [timezone.make_aware(value, tzinfo) for value in period]
+            if probe.filter(**{f'{field_name}__gte': period[0],
+                               f'{field_name}__lt': period[1]}).exists():
+                periods.append(period[0])
+            start = end
+        return periods[::-1] if order == 'DESC' else periods
+
+
+@lru_cache(maxsize=None)
+def indexed_queryset_class(queryset_class):
+    """Model এর নিজের QuerySet class (custom methods সহ) + IndexedDateQuerySet"""
+    return type(f'Indexed{queryset_class.__name__}', (IndexedDateQuerySet, queryset_class), {})
+
+
+class ScalableChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        if not self.date_hierarchy:
+            return super().get_queryset(request, exclude_parameters)
+
+        # আগে date hierarchy params ছাড়া (period probes এর জন্য), তারপর আসল
+        # queryset — শেষ call এর filter state ই changelist এ থাকে
+        params = self.filter_params
+        hierarchy = {f'{self.date_hierarchy}__{part}' for part in ('year', 'month', 'day')}
+        self.filter_params = {key: value for key, value in params.items() if key not in hierarchy}
+        try:
+            probe = super().get_queryset(request, exclude_parameters)
+        finally:
+            self.filter_params = params
+        queryset = super().get_queryset(request, exclude_parameters)
+
+        queryset_class = indexed_queryset_class(type(queryset))
+        probe.__class__ = queryset.__class__ = queryset_class
+        queryset.date_probe_base = probe
+        return queryset
+
+
+class ScalableAdminMixin:
+    """ModelAdmin এর আগে দাও: estimated count, indexed date hierarchy"""
+    paginator = EstimatedCountPaginator
+    # Filter থাকলে "(N total)" এর জন্য আরেকটা COUNT(*) হয়, সেটা বন্ধ
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return ScalableChangeList
+
+
+class CachedDistinctFilter(admin.SimpleListFilter):
+    """
+    Field এর distinct values দিয়ে filter (AllValuesFieldListFilter এর মতো),
+    কিন্তু values প্রতি page load এ না গুনে cache থেকে
+    Subclass এ title, parameter_name ও field_name দাও
+    """
+    field_name = None
+
+    def cache_key(self, model_admin):
+        return f'admin:distinct:{model_admin.opts.label_lower}:{self.field_name}'
+
+    def lookups(self, request, model_admin):
+        key = self.cache_key(model_admin)
+        values = cache.get(key)
+        if values is None:
+            values = list(
+                model_admin.model._default_manager.order_by(self.field_name)
+                .values_list(self.field_name, flat=True).distinct())
+            cache.set(key, values, settings.ADMIN_FILTER_CACHE_TIMEOUT)
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.field_name: self.value()})
+        return queryset
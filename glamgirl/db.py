@@ -0,0 +1,155 @@
+"""
+Read replica routing
+
+Read-only views (catalog, order tracking) DATABASE_REPLICAS এর কোনো একটা
+থেকে পড়ে, যাতে checkout এর writes এর সাথে default database এ ভিড় না হয়:
+
+    @replica_reads                     function view (@api_view এর উপরে)
+    @api_view(['GET'])
+    def track_order(request, order_id): ...
+
+    class ProductListView(...):
+        replica_reads = True           class based view
+
+Read-your-writes: কোনো request এ cart/order এ কিছু লেখা হলে response এ
+REPLICA_PIN_SECONDS মেয়াদের একটা cookie যায়; ততক্ষণ ওই session এর সব read
+default থেকে হয়, তাই replica পিছিয়ে থাকলেও customer নিজের cart/order দেখে।
+
+সবসময় default এ থাকে: writes, একই request এ write এর পরের reads, আর
+auth/session tables (login বা session এর পুরনো copy পড়া যাবে না)।
+`with primary_reads():` block এর reads ও default থেকে (যেমন catalog version
+বাড়ার ঠিক পরে cache এ রাখার response, products.cache)।
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_pin'
+# এই apps এর reads/writes replica routing এ ধরা হয় না
+PRIMARY_ONLY_APPS = {'sessions', 'auth', 'contenttypes', 'admin'}
+
+
+@dataclass
+class RoutingState:
+    pinned: bool = False
+    replica: bool = False
+    wrote: bool = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_reads(view):
+    """View কে replica থেকে পড়ার জন্য চিহ্নিত করো (function বা class)"""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def primary_reads():
+    """Replica view এর ভেতরেও এই block এর reads default থেকে"""
+    state = _state.get()
+    if state is None or not state.replica:
+        yield
+        return
+    state.replica = False
+    try:
+        yield
+    finally:
+        state.replica = True
+
+
+def wants_replica(view_func):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    return bool(
+        getattr(view_func, 'replica_reads', False)
+        or getattr(view_class, 'replica_reads', False))
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (state is None or not state.replica or state.pinned or state.wrote
+                or not settings.DATABASE_REPLICAS
+                or model._meta.app_label in PRIMARY_ONLY_APPS):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica গুলো default এর copy, তাই সব alias এর objects একই data
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    প্রতিটা request এর routing state: view replica চায় কিনা, session pinned কিনা
+    State একটা ContextVar এ থাকে, তাই async view এর sync_to_async queries ও একই state দেখে।
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # ASGI তে sync process_view এর জন্য Django প্রতিটা request এ thread এ যায়
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=self.is_pinned(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=self.is_pinned(request))
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(state, response)
+
+    def finish(self, state, response):
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE, str(int(time.time() + settings.REPLICA_PIN_SECONDS)),
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is not None:
+            state.replica = wants_replica(view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        ReplicaMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    def is_pinned(self, request):
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,135 @@
+"""
+In-process request metrics
+
+MetricsMiddleware প্রতিটা request এর latency, SQL query সংখ্যা, SQL time ও
+response size URL name (যেমন 'product-list') অনুযায়ী এখানে জমা করে।
+প্রতিটা metric এর শেষ METRICS_WINDOW টা sample থেকে p50/p95/p99 হিসাব হয়
+(sliding window), আর count/sum শুরু থেকে বাড়তে থাকে — /metrics এ
+Prometheus text format এ পাওয়া যায়।
+
+Data প্রতিটা worker process এর নিজের memory তে থাকে; Prometheus প্রতিটা
+worker কে আলাদা target হিসেবে scrape করবে।
+"""
+
+import hmac
+import threading
+from collections import Counter, deque
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# name -> help text
+SUMMARIES = {
+    'request_duration_seconds': 'Total request latency',
+    'db_query_duration_seconds': 'Time spent in SQL per request',
+    'db_queries': 'SQL queries per request',
+    'response_size_bytes': 'Response body size (non-streaming responses)',
+}
+PREFIX = 'glamgirl_'
+
+
+class Summary:
+    """Sliding window quantiles + সব সময়ের count/sum"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self):
+        samples = sorted(self.samples)
+        if not samples:
+            return {}
+        return {
+            quantile: samples[min(int(quantile * len(samples)), len(samples) - 1)]
+            for quantile in QUANTILES
+        }
+
+
+class Registry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.summaries = {name: {} for name in SUMMARIES}
+        self.requests = Counter()
+
+    def observe(self, view, method, status_code, values):
+        """values: {summary name: value}; None হলে বাদ"""
+        labels = (view, method)
+        with self.lock:
+            self.requests[(view, method, status_code)] += 1
+            for name, value in values.items():
+                if value is None:
+                    continue
+                summaries = self.summaries[name]
+                if labels not in summaries:
+                    summaries[labels] = Summary(settings.METRICS_WINDOW)
+                summaries[labels].observe(value)
+
+    def reset(self):
+        with self.lock:
+            self.summaries = {name: {} for name in SUMMARIES}
+            self.requests.clear()
+
+    def render(self):
+        """Prometheus text exposition format"""
+        with self.lock:
+            snapshot = {
+                name: {
+                    labels: (summary.quantiles(), summary.count, summary.sum)
+                    for labels, summary in summaries.items()
+                }
+                for name, summaries in self.summaries.items()
+            }
+            requests = dict(self.requests)
+
+        lines = [
+            f'# HELP {PREFIX}requests_total Requests by URL name, method and status',
+            f'# TYPE {PREFIX}requests_total counter',
+        ]
+        for (view, method, status_code), count in sorted(requests.items()):
+            lines.append(
+                f'{PREFIX}requests_total{{view="{view}",method="{method}",'
+                f'status="{status_code}"}} {count}')
+
+        for name, help_text in SUMMARIES.items():
+            metric = f'{PREFIX}{name}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} summary')
+            for (view, method), (quantiles, count, total) in sorted(snapshot[name].items()):
+                labels = f'view="{view}",method="{method}"'
+                for quantile, value in quantiles.items():
+                    lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {value:.6g}')
+                lines.append(f'{metric}_sum{{{labels}}} {total:.6g}')
+                lines.append(f'{metric}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def has_metrics_token(request):
+    """Prometheus এর bearer_token; METRICS_TOKEN খালি হলে token দিয়ে ঢোকা যায় না"""
+    token = settings.METRICS_TOKEN
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+def metrics_view(request):
+    """
+    📈 Prometheus scrape endpoint
+    GET /metrics (Authorization: Bearer <METRICS_TOKEN> বা staff user)
+    REMOTE_ADDR দেখা হয় না: local reverse proxy এর পিছনে সব request 127.0.0.1 থেকে আসে
+    """
+    user = getattr(request, 'user', None)
+    if not (has_metrics_token(request) or (user and user.is_staff)):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
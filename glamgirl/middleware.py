@@ -0,0 +1,220 @@
+"""
+Project level middleware
+
+সবগুলো sync ও async দুই mode এই চলে: ASGI তে Django এগুলোর জন্য আলাদা
+thread এ যায় না, তাই async view এর request পুরোটা event loop এ থাকে।
+"""
+
+import mimetypes
+import os
+import time
+from contextvars import ContextVar
+from email.utils import formatdate
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+from .metrics import registry
+from .storage import COMPRESSIBLE_EXTENSIONS
+
+
+class StaticFilesMiddleware:
+    """
+    Production এ (DEBUG = False) collectstatic করা files সরাসরি serve করো:
+
+    - hashed name (style.4f3a1c.css) -> Cache-Control: max-age=1 year, immutable
+    - অন্য files -> STATIC_DEFAULT_MAX_AGE
+    - Browser gzip নিলে collectstatic এ তৈরি .gz পাঠাও (request এ compress হয় না)
+
+    STATIC_ROOT এর files startup এ একবার index হয়, তাই request এ disk scan হয় না —
+    collectstatic এর পরে process restart করো। Development এ runserver নিজেই
+    static serve করে, তখন এই middleware বন্ধ থাকে।
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') \
+            else f'/{settings.STATIC_URL}'
+        self.files = self.scan(str(settings.STATIC_ROOT))
+        self.immutable = self.hashed_names()
+
+    def scan(self, root):
+        """{url path: (file path, gzip path বা None, mtime)}"""
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if name.endswith('.gz'):
+                    continue
+                path = os.path.join(directory, name)
+                url_path = os.path.relpath(path, root).replace(os.sep, '/')
+                gzip_path = f'{path}.gz'
+                files[url_path] = (
+                    path,
+                    gzip_path if os.path.exists(gzip_path) else None,
+                    os.path.getmtime(path),
+                )
+        return files
+
+    def hashed_names(self):
+        """Manifest storage এর hashed file names (অন্য storage এ খালি)"""
+        return set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        entry = self.lookup(request)
+        if entry is not None:
+            return self.serve(request, *entry)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        entry = self.lookup(request)
+        if entry is not None:
+            return self.serve(request, *entry)
+        return await self.get_response(request)
+
+    def lookup(self, request):
+        """(name, path, gzip path, mtime) অথবা static file না হলে None"""
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            name = request.path_info[len(self.prefix):]
+            entry = self.files.get(name)
+            if entry is not None:
+                return (name, *entry)
+        return None
+
+    def serve(self, request, name, path, gzip_path, mtime):
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        if if_modified_since is not None and int(mtime) <= if_modified_since:
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(name)
+            use_gzip = gzip_path is not None and 'gzip' in request.headers.get(
+                'Accept-Encoding', '')
+            response = FileResponse(
+                open(gzip_path if use_gzip else path, 'rb'),
+                content_type=content_type or 'application/octet-stream')
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+
+        if name in self.immutable:
+            response['Cache-Control'] = \
+                f'public, max-age={settings.STATIC_HASHED_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = f'public, max-age={settings.STATIC_DEFAULT_MAX_AGE}'
+        response['Last-Modified'] = formatdate(mtime, usegmt=True)
+        if name.endswith(COMPRESSIBLE_EXTENSIONS):
+            patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+class QueryTimer:
+    """এক request এর query সংখ্যা ও মোট SQL time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Async view এর queries অন্য thread এর connection এ চলে, তাই timer টা
+# connection এ না রেখে context এ রাখা হয় (sync_to_async context copy করে)
+_query_timer = ContextVar('query_timer', default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    """সব connection এর execute_wrapper: চলতি request এর QueryTimer এ যোগ করে"""
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.duration += time.perf_counter() - start
+        timer.count += 1
+
+
+def install_query_timer(connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class MetricsMiddleware:
+    """
+    প্রতিটা request এর latency, SQL query সংখ্যা/time ও response size মাপো:
+
+    - Response এ Server-Timing header (browser devtools এ দেখা যায়)
+    - URL name অনুযায়ী glamgirl.metrics.registry তে জমা, /metrics এ p50/p95/p99
+
+    Overhead: প্রতিটা query তে দুটো perf_counter() আর request শেষে একটা
+    lock নেওয়া append — production এ চালু রাখা যায় (METRICS_ENABLED)।
+    Streaming response এর body পাঠানোর সময়ের queries ধরা হয় না।
+
+    time_query প্রতিটা নতুন DB connection এ (connection_created) একবার বসানো হয়।
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_timer, dispatch_uid='glamgirl.metrics')
+        # আগেই খোলা connections (এই thread এর)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        return self.observe(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        return self.observe(request, response, timer, time.perf_counter() - start)
+
+    def observe(self, request, response, timer, duration):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        registry.observe(view, request.method, response.status_code, {
+            'request_duration_seconds': duration,
+            'db_query_duration_seconds': timer.duration,
+            'db_queries': timer.count,
+            'response_size_bytes': size,
+        })
+
+        response['Server-Timing'] = (
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+            f'total;dur={duration * 1000:.1f}'
+        )
+        return response
@@ -0,0 +1,126 @@
+"""
+Shared serializer helpers
+
+SparseFieldsMixin দিয়ে API client ঠিক করতে পারে কোন fields লাগবে:
+
+    ?fields=id,name,price               শুধু এই fields
+    ?fields=id,items.quantity,items.product.name
+                                        nested serializer এর fields dotted path দিয়ে
+    ?compact=1                          Meta.compact_exclude এর fields বাদ
+    ?compact=1&expand=items             compact এ বাদ পড়া field আবার আনো
+
+Options request query params থেকে বা serializer context এর
+'fields' / 'compact' / 'expand' key থেকে আসে।
+"""
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+def _split(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    return {item.strip() for item in value if item.strip()}
+
+
+def sparse_options(context):
+    """Context থেকে (fields, compact, expand) বের করো"""
+    options = {key: context[key] for key in ('fields', 'compact', 'expand') if key in context}
+    request = context.get('request')
+    if request is not None:
+        params = getattr(request, 'query_params', request.GET)
+        for key in ('fields', 'compact', 'expand'):
+            if key not in options and key in params:
+                options[key] = params[key]
+
+    compact = options.get('compact', False)
+    if isinstance(compact, str):
+        compact = compact.lower() in TRUE_VALUES
+    return _split(options.get('fields')), bool(compact), _split(options.get('expand')) or set()
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer এর জন্য: unrequested fields serialize হয় না, আর
+    deferred_fields() দিয়ে view সেগুলো database থেকে load করাও বন্ধ করতে পারে।
+
+    Meta তে:
+        compact_exclude = [...]        compact mode এ যেগুলো বাদ
+        field_dependencies = {name: [model fields]}
+                                       method field গুলো কোন model field পড়ে
+    """
+
+    def field_path(self):
+        """Root serializer থেকে এই serializer এর dotted path ('' root এর জন্য)"""
+        parts = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                parts.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(parts))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, compact, expand = sparse_options(self.context)
+        path = self.field_path()
+        prefix = f'{path}.' if path else ''
+
+        if requested is not None:
+            wanted = {
+                name[len(prefix):].split('.')[0]
+                for name in requested if name.startswith(prefix)
+            }
+            # Parent পুরো field চাইলে (যেমন ?fields=items) সব fields থাকবে
+            if wanted:
+                return {name: field for name, field in fields.items() if name in wanted}
+        elif compact:
+            for name in getattr(self.Meta, 'compact_exclude', []):
+                if f'{prefix}{name}' not in expand:
+                    fields.pop(name, None)
+        return fields
+
+    def deferred_fields(self, prefix=''):
+        """
+        এই serializer (ও nested FK serializer) যেসব model field ব্যবহার করবে না
+        queryset.defer() এ দেওয়ার মতো নাম (prefix সহ, যেমন 'product__description')
+        """
+        model = self.Meta.model
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+        needed = set()
+        related_needed = {}
+        nested = set()
+        deferred = []
+
+        for name, field in self.fields.items():
+            needed.add(field.source_attrs[0] if field.source_attrs else name)
+            needed.update(dependencies.get(name, []))
+            if isinstance(field, SparseFieldsMixin):
+                # Nested FK serializer (select_related হয়ে load হয়)
+                nested.add(field.source)
+                deferred.extend(field.deferred_fields(f'{prefix}{field.source}__'))
+            elif len(field.source_attrs) > 1:
+                # 'category.name' এর মতো source: related model এর শুধু ওই field লাগবে
+                related_needed.setdefault(field.source_attrs[0], set()).add(
+                    field.source_attrs[1])
+
+        # select_related হয়ে আসা relation এর unused columns
+        # (select_related না থাকলে Django এই defer গুলো ignore করে)
+        for relation_field in model._meta.concrete_fields:
+            if not relation_field.is_relation or relation_field.name in nested:
+                continue
+            attrs = related_needed.get(relation_field.name, set())
+            for related_field in relation_field.related_model._meta.concrete_fields:
+                if (related_field.primary_key or related_field.is_relation
+                        or related_field.name in attrs):
+                    continue
+                deferred.append(f'{prefix}{relation_field.name}__{related_field.name}')
+
+        for model_field in model._meta.concrete_fields:
+            # Relation গুলো select_related এ লাগতে পারে, ছোট column তাই রেখে দাও
+            if (model_field.primary_key or model_field.is_relation
+                    or model_field.name in needed):
+                continue
+            deferred.append(f'{prefix}{model_field.name}')
+        return deferred
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,11 +47,16 @@ INSTALLED_APPS = [
     'products',
     'cart',
     'orders',
+    'analytics',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
+    'glamgirl.middleware.StaticFilesMiddleware',
+    'glamgirl.middleware.MetricsMiddleware',
+    'glamgirl.db.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -59,7 +65,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'glamgirl.urls'
+# ASGI deployment: glamgirl/asgi.py GLAMGIRL_ASGI=1 দেয়। তখন catalog, cart GET ও
+# order detail/track এর native async views চলে (glamgirl.async_urls);
+# GLAMGIRL_ASYNC_VIEWS=0/1 দিয়ে deployment অনুযায়ী বদলানো যায়
+ASGI = os.environ.get('GLAMGIRL_ASGI') == '1'
+ASYNC_VIEWS = os.environ.get('GLAMGIRL_ASYNC_VIEWS', '1' if ASGI else '0') == '1'
+
+ROOT_URLCONF = 'glamgirl.async_urls' if ASYNC_VIEWS else 'glamgirl.urls'
 
 TEMPLATES = [
     {
@@ -82,13 +94,64 @@ WSGI_APPLICATION = 'glamgirl.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite production profile: প্রতিটা নতুন connection এ init_command এর PRAGMA
+# গুলো চলে —
+#   journal_mode=WAL      readers আর writer একে অপরকে block করে না
+#   synchronous=NORMAL    WAL এ প্রতি commit এ fsync লাগে না (crash এ data নষ্ট হয় না,
+#                         শুধু power loss এ শেষ কয়েকটা commit হারাতে পারে)
+#   mmap_size/cache_size  পড়া pages memory তে থাকে (connection প্রতি cache)
+# timeout: write lock না পাওয়া পর্যন্ত এত seconds অপেক্ষা (busy timeout), সাথে
+# সাথে "database is locked" না। transaction_mode=IMMEDIATE: transaction.atomic()
+# (checkout, cart batch) BEGIN IMMEDIATE দিয়ে শুরু হয় — write lock শুরুতেই নেয়,
+# তাই read থেকে write এ upgrade করার সময় deadlock/SQLITE_BUSY হয় না।
+SQLITE_OPTIONS = {
+    'timeout': int(os.environ.get('GLAMGIRL_DB_TIMEOUT', 20)),
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'   # 128 MB
+        'PRAGMA cache_size=-20000;'     # ~20 MB
+        'PRAGMA temp_store=MEMORY;'
+    ),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        # প্রতি request এ নতুন connection (ও PRAGMA) না খুলে worker thread এর
+        # connection আবার ব্যবহার হয়; health check ভাঙা connection বদলে দেয়।
+        # ASGI তে প্রতিটা request এর sync ORM কাজ নতুন thread এ চলে, সেখানে
+        # persistent connection আবার ব্যবহার হয় না (Django docs), তাই 0
+        'CONN_MAX_AGE': int(os.environ.get('GLAMGIRL_DB_CONN_MAX_AGE', 0 if ASGI else 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # Test database file এ (in-memory না): shared-cache memory database এ lock
+        # হলে busy timeout এ অপেক্ষা না করে সাথে সাথে "database table is locked"
+        # হয়, তাই concurrency tests (checkout, job worker) production এর মতো চলে না
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Read replicas (glamgirl.db): catalog ও order tracking এর reads DATABASE_REPLICAS
+# এর alias গুলো থেকে হয় (খালি থাকলে সব default থেকে)। Local এ দুটো SQLite file
+# দিয়ে চেষ্টা করতে GLAMGIRL_REPLICA_DB=replica.sqlite3 দাও — file টা
+# db.sqlite3 এর copy হতে হবে (যেমন litestream / `sqlite3 .backup` দিয়ে)
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': BASE_DIR / os.environ.get('GLAMGIRL_REPLICA_DB', 'replica.sqlite3'),
+    'OPTIONS': SQLITE_OPTIONS,
+    'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+    'CONN_HEALTH_CHECKS': True,
+}
+DATABASE_ROUTERS = ['glamgirl.db.ReplicaRouter']
+DATABASE_REPLICAS = ['replica'] if os.environ.get('GLAMGIRL_REPLICA_DB') else []
+# Replica এর lag এর উপরের সীমা: cart/order লেখার পরে এতক্ষণ ওই session এর reads
+# default থেকে (read-your-writes), আর catalog version বাড়ার পরে এতক্ষণ catalog
+# cache miss default থেকে build হয়
+REPLICA_PIN_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -128,6 +191,23 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Production (DEBUG = False): `python manage.py collectstatic` hashed names ও
+# .gz copy লেখে, StaticFilesMiddleware সেগুলো long-lived cache header সহ serve করে
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'glamgirl.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+STATIC_HASHED_MAX_AGE = 60 * 60 * 24 * 365  # 1 year (URL বদলায় তাই immutable)
+STATIC_DEFAULT_MAX_AGE = 60 * 5  # hash ছাড়া name (যেমন সরাসরি /static/js/main.js)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -139,16 +219,84 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Product image renditions (products/renditions.py)
+# Upload এর পরে এই widths এর WebP ও JPEG version background process pool এ তৈরি হয়
+# পুরনো products এর জন্য: `python manage.py generate_renditions`
+PRODUCT_IMAGE_WIDTHS = [160, 320, 640, 960]
+PRODUCT_IMAGE_THUMBNAIL_WIDTH = 320
+PRODUCT_IMAGE_WORKERS = 2
+PRODUCT_IMAGE_ASYNC = True
+
+# Cache (catalog responses, catalog version, sessions)
+# সব process (web workers, run_worker, import_catalog, renditions pool) একই cache
+# দেখতে হবে, না হলে এক process এর catalog version bump অন্যরা জানে না আর
+# CATALOG_CACHE_TIMEOUT পর্যন্ত পুরনো catalog দেখায়। তাই LocMemCache না
+# (products.checks warning দেয়): default file cache, production এ Redis দাও
+# (GLAMGIRL_REDIS_URL) — add/incr সেখানে atomic, CacheCartStore এর জন্য দরকার।
+if os.environ.get('GLAMGIRL_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['GLAMGIRL_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('GLAMGIRL_CACHE_DIR', BASE_DIR / '.cache'),
+        }
+    }
+CATALOG_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+# Cached catalog response এ বসানো live stock (products.stock); stock বদলালে key
+# মোছা হয়, এটা শুধু কোনো invalidation মিস হলে কতক্ষণ পুরনো থাকতে পারে
+CATALOG_STOCK_TIMEOUT = 60
+
+# Admin list filter এর distinct values (যেমন order cities) কতক্ষণ cache থাকবে
+ADMIN_FILTER_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+# Request metrics (glamgirl.metrics): Server-Timing header ও /metrics endpoint
+METRICS_ENABLED = True
+METRICS_WINDOW = 1024  # p50/p95/p99 প্রতিটা URL এর শেষ এতগুলো request থেকে
+# /metrics: Prometheus `Authorization: Bearer <token>` পাঠায়; খালি হলে শুধু staff user
+METRICS_TOKEN = os.environ.get('GLAMGIRL_METRICS_TOKEN', '')
+
+# Background jobs (jobs app): checkout এর পরের কাজ (যেমন confirmation email)
+# jobs table এ queue হয়, `python manage.py run_worker --concurrency 4` চালায়
+JOB_MAX_ATTEMPTS = 5
+JOB_TIMEOUT = 60 * 5  # visibility timeout: এর মধ্যে শেষ না হলে job আবার চলে
+JOB_RETRY_BACKOFF = 10  # প্রথম retry এর আগে seconds, প্রতি retry তে দ্বিগুণ
+JOB_RETRY_BACKOFF_MAX = 60 * 60  # 1 hour
+
+# Email (worker থেকে যায়): local এ console এ print হয়, production এ SMTP backend দাও
+EMAIL_BACKEND = os.environ.get(
+    'GLAMGIRL_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('GLAMGIRL_FROM_EMAIL', 'GlamGirl <orders@example.com>')
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
 # Session settings
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# cached_db: session read cache থেকে, DB তে লেখা হয় শুধু session change হলে
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_COOKIE_SAMESITE = 'Lax'
 SESSION_COOKIE_AGE = 86400 * 7  # 7 days
 SESSION_COOKIE_HTTPONLY = True
 
+# Cart storage
+# 'cart.storage.DatabaseCartStore' (default): প্রতিটা cart change DB তে
+# 'cart.storage.CacheCartStore': live cart cache এ, DB তে লেখা হয় শুধু checkout
+#   এ বা `python manage.py flush_carts` (cron) চালালে। Redis cache দরকার
+#   (GLAMGIRL_REDIS_URL): সব worker একই cart দেখে, আর dirty index এর add/incr atomic। Stock reservation ও
+#   flush এর সাথে লেখা হয়, তাই flush_carts CART_RESERVATION_TTL এর চেয়ে ঘন ঘন চালাও।
+CART_STORE = 'cart.storage.DatabaseCartStore'
+CART_CACHE_TIMEOUT = SESSION_COOKIE_AGE
+
+# Cart এ add করা stock কতক্ষণ reserve থাকবে (cart activity তে মেয়াদ বাড়ে)
+# Expired reservation ছাড়তে cron থেকে `python manage.py release_reservations` চালাও
+CART_RESERVATION_TTL = 60 * 15  # 15 minutes
+
 # CSRF Settings
 CSRF_COOKIE_SAMESITE = 'Lax'
 CSRF_COOKIE_HTTPONLY = False
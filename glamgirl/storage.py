@@ -0,0 +1,49 @@
+"""
+Production static files storage
+
+ManifestStaticFilesStorage file name এ content hash বসায় (style.css ->
+style.4f3a1c.css), তাই file বদলালে URL বদলায় আর browser পুরনো copy চিরকাল
+cache করতে পারে। এর উপর collectstatic এর সময়েই text files এর gzip copy
+(.gz) লেখা হয়, যাতে প্রতিটা request এ আবার compress করতে না হয়
+(glamgirl.middleware.StaticFilesMiddleware সেগুলো serve করে)।
+"""
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico',
+)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = set()
+        for name, hashed_name, was_processed in super().post_process(
+                paths, dry_run=dry_run, **options):
+            if not isinstance(was_processed, Exception):
+                processed.add(name)
+            yield name, hashed_name, was_processed
+
+        if dry_run:
+            return
+        for name in processed:
+            self.compress(name)
+            self.compress(self.stored_name(name))
+
+    def compress(self, name):
+        """name.gz লেখো (compress করে ছোট না হলে বাদ)"""
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        # mtime=0: একই content এ সবসময় একই .gz
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        gzip_name = f'{name}.gz'
+        if self.exists(gzip_name):
+            self.delete(gzip_name)
+        if len(compressed) < len(data):
+            self._save(gzip_name, ContentFile(compressed))
@@ -0,0 +1,477 @@
+import gzip
+import io
+import re
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+from unittest import skipUnless
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, override_settings
+
+from analytics.rollups import rebuild
+from glamgirl.db import PIN_COOKIE
+from glamgirl.metrics import registry
+from cart.models import Cart, CartItem, StockReservation
+from cart.reservations import expiry_time, release_expired
+from orders.models import Order, OrderItem
+from products.cache import bump_catalog_version
+from products.models import Category, Product
+
+COMPRESSED_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'glamgirl.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class StaticFilesPipelineTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        static_root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(static_root.cleanup)
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=static_root.name, STORAGES=COMPRESSED_STORAGES))
+        call_command('collectstatic', interactive=False, verbosity=0, stdout=io.StringIO())
+        cls.enterClassContext(override_settings(DEBUG=False))
+        cls.main_js = staticfiles_storage.url('js/main.js')
+
+    def test_collectstatic_writes_hashed_and_gzip_files(self):
+        name = staticfiles_storage.stored_name('js/main.js')
+        self.assertRegex(name, r'^js/main\.[0-9a-f]{12}\.js$')
+        with staticfiles_storage.open(name) as original, \
+                staticfiles_storage.open(f'{name}.gz') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), original.read())
+
+    def test_hashed_file_is_served_gzipped_and_immutable(self):
+        response = self.client.get(self.main_js, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['Content-Type'].endswith('javascript'))
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn(b'function', body)
+
+    def test_plain_name_and_no_gzip(self):
+        response = self.client.get('/static/js/main.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_not_modified(self):
+        response = self.client.get(self.main_js)
+        response = self.client.get(
+            self.main_js, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_templates_use_hashed_names(self):
+        html = self.client.get('/cart/').content.decode()
+        self.assertIn(self.main_js, html)
+        self.assertIn(staticfiles_storage.url('css/style.css'), html)
+
+
+class SQLiteProfileTest(TestCase):
+
+    def pragma(self, cursor, name):
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def test_connection_pragmas(self):
+        with connection.cursor() as cursor:
+            self.assertEqual(self.pragma(cursor, 'synchronous'), 1)   # NORMAL
+            self.assertEqual(self.pragma(cursor, 'busy_timeout'), 20000)
+            self.assertEqual(self.pragma(cursor, 'cache_size'), -20000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_file_database_uses_wal(self):
+        # নতুন database file এ settings এর init_command নিজেই WAL চালু করে কিনা দেখো:
+        # test database test runner বানায় আর TestCase এর transaction সেটা খোলা রাখে,
+        # তাই তার উপর আলাদা connection না খুলে একটা নতুন temporary file নাও
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper(
+                {**connection.settings_dict, 'NAME': f'{directory}/profile.sqlite3'}, 'profile')
+            try:
+                with wrapper.cursor() as cursor:
+                    self.assertEqual(self.pragma(cursor, 'journal_mode'), 'wal')
+                    self.assertEqual(self.pragma(cursor, 'mmap_size'), 134217728)
+            finally:
+                wrapper.close()
+
+
+class MetricsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        category = Category.objects.create(name='Makeup')
+        Product.objects.create(
+            name='Lipstick', description='Red', price=250, category=category, stock=10)
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/products/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="1 queries", total;dur=[\d.]+$')
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint(self):
+        for _ in range(3):
+            self.client.get('/api/products/')
+        self.client.get('/api/products/999999/')
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn(
+            'glamgirl_requests_total{view="product-list",method="GET",status="200"} 3', body)
+        self.assertIn(
+            'glamgirl_requests_total{view="product-detail",method="GET",status="404"} 1', body)
+        self.assertIn(
+            'glamgirl_db_queries{view="product-list",method="GET",quantile="0.99"} 1', body)
+        self.assertIn(
+            'glamgirl_request_duration_seconds_count{view="product-list",method="GET"} 3', body)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint_is_restricted(self):
+        # Local proxy এর পিছনে সবাই 127.0.0.1 থেকে আসে
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+        User.objects.create_user('ops', password='secret', is_staff=True)
+        self.client.login(username='ops', password='secret')
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_metrics_token_is_required_to_be_set(self):
+        with self.settings(METRICS_TOKEN=''):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTest(TestCase):
+    """
+    default ও replica দুটো আলাদা SQLite test database। Replica তে data না
+    থাকায় কোন read কোথা থেকে হলো বোঝা যায়।
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Lipstick', description='Red', price=250, category=category, stock=10)
+
+    def test_catalog_reads_from_replica(self):
+        self.assertEqual(self.client.get('/api/products/').json()['results'], [])
+        self.assertEqual(self.client.get(f'/api/products/{self.product.id}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/products/search/?q=lip').json()['results'], [])
+
+    def test_cache_miss_after_version_bump_reads_primary(self):
+        # Replica হয়তো এখনো পিছিয়ে: পুরনো data নতুন version এ cache হবে না
+        bump_catalog_version()
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 1)
+        self.assertEqual(self.client.get(f'/api/products/{self.product.id}/').status_code, 200)
+
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            self.assertEqual(
+                self.client.get('/api/products/?compact=1').json()['results'], [])
+
+    def test_writes_pin_session_to_primary(self):
+        # Cart view replica চিহ্নিত না, তাই default থেকে product পায়
+        response = self.client.post(
+            '/api/cart/add/', {'product_id': self.product.id},
+            content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        # Pinned: নিজের write এর পরে catalog ও default থেকে
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 1)
+        response = self.client.post(
+            '/api/orders/create/', {
+                'customer_name': 'Test', 'customer_email': 'test@example.com',
+                'customer_phone': '01700000000', 'shipping_address': 'Road 1',
+                'city': 'Dhaka', 'payment_method': 'cod',
+            }, content_type='application/json')
+        order_id = response.json()['order']['id']
+        self.assertEqual(self.client.get(f'/api/orders/track/{order_id}/').status_code, 200)
+
+        # Pin না থাকলে (অন্য customer) tracking replica থেকে
+        self.client.cookies.pop(PIN_COOKIE)
+        self.assertEqual(self.client.get(f'/api/orders/track/{order_id}/').status_code, 404)
+
+    def test_read_only_requests_do_not_pin(self):
+        response = self.client.get('/api/products/')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+ORDER_DATA = {
+    'customer_name': 'Test', 'customer_email': 'test@example.com',
+    'customer_phone': '01700000000', 'shipping_address': 'Road 1',
+    'city': 'Dhaka', 'payment_method': 'cod',
+}
+
+
+class AsyncViewsTest(TestCase):
+    """
+    glamgirl.async_urls এর async views sync views এর মতো একই response দেয়
+    (sync: self.client + glamgirl.urls, async: self.async_client + async_urls)
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Makeup', description='Lips')
+        self.product = Product.objects.create(
+            name='Lipstick', description='Red', price=250, category=self.category, stock=10)
+        Product.objects.create(
+            name='Serum', description='Face', price=900, category=self.category, stock=0)
+
+    async def get_both(self, url):
+        """(sync response, async response) — মাঝে catalog cache invalid করে"""
+        sync_response = await sync_to_async(self.client.get)(url)
+        await sync_to_async(bump_catalog_version)()
+        self.async_client.cookies = self.client.cookies
+        with override_settings(ROOT_URLCONF='glamgirl.async_urls'):
+            async_response = await self.async_client.get(url)
+        return sync_response, async_response
+
+    async def assertSameResponse(self, url, status_code=200):
+        sync_response, async_response = await self.get_both(url)
+        self.assertEqual(sync_response.status_code, status_code)
+        self.assertEqual(async_response.status_code, status_code)
+        self.assertEqual(async_response['Content-Type'], sync_response['Content-Type'])
+        self.assertEqual(async_response.json(), sync_response.json())
+        return async_response
+
+    async def test_catalog(self):
+        await self.assertSameResponse('/api/products/categories/')
+        await self.assertSameResponse('/api/products/')
+        await self.assertSameResponse('/api/products/?compact=1&sort=price_high&in_stock=1')
+        await self.assertSameResponse('/api/products/?page_size=1')
+        await self.assertSameResponse(f'/api/products/{self.product.id}/')
+        await self.assertSameResponse(f'/api/products/category/{self.category.id}/?fields=id,name')
+        await self.assertSameResponse('/api/products/facets/')
+
+    async def test_errors(self):
+        await self.assertSameResponse('/api/products/999999/', 404)
+        await self.assertSameResponse('/api/products/?min_price=cheap', 400)
+        await self.assertSameResponse('/api/orders/999999/', 404)
+        with override_settings(ROOT_URLCONF='glamgirl.async_urls'):
+            response = await self.async_client.post('/api/cart/')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, HEAD')
+
+    async def test_catalog_cache(self):
+        with override_settings(ROOT_URLCONF='glamgirl.async_urls'):
+            first = await self.async_client.get('/api/products/')
+            await Product.objects.filter(id=self.product.id).aupdate(name='Renamed')
+            # Cache থেকে (version বাড়েনি)
+            second = await self.async_client.get('/api/products/')
+        self.assertEqual(first.json(), second.json())
+
+    async def test_cart(self):
+        with override_settings(ROOT_URLCONF='glamgirl.async_urls'):
+            response = await self.async_client.get('/api/cart/')
+        self.assertEqual(
+            response.json(), {'id': None, 'items': [], 'total': 0, 'total_items': 0})
+        self.assertFalse(await Cart.objects.aexists())
+
+        await sync_to_async(self.client.post)(
+            '/api/cart/add/', {'product_id': self.product.id, 'quantity': 2},
+            content_type='application/json')
+        response = await self.assertSameResponse('/api/cart/')
+        self.assertEqual(response.json()['total_items'], 2)
+        await self.assertSameResponse('/api/cart/?fields=total,items.quantity')
+
+    @override_settings(CART_STORE='cart.storage.CacheCartStore')
+    async def test_cache_cart(self):
+        await sync_to_async(self.client.post)(
+            '/api/cart/add/', {'product_id': self.product.id},
+            content_type='application/json')
+        response = await self.assertSameResponse('/api/cart/')
+        self.assertEqual(response.json()['total_items'], 1)
+
+    async def test_orders(self):
+        await sync_to_async(self.client.post)(
+            '/api/cart/add/', {'product_id': self.product.id},
+            content_type='application/json')
+        response = await sync_to_async(self.client.post)(
+            '/api/orders/create/', ORDER_DATA, content_type='application/json')
+        order_id = response.json()['order']['id']
+
+        await self.assertSameResponse(f'/api/orders/{order_id}/')
+        await self.assertSameResponse(f'/api/orders/{order_id}/?compact=1')
+        await self.assertSameResponse(f'/api/orders/track/{order_id}/')
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    async def test_replica_routing(self):
+        # Routing state ContextVar এ থাকে, async ORM এর thread ও সেটা দেখে
+        with override_settings(ROOT_URLCONF='glamgirl.async_urls'):
+            response = await self.async_client.get('/api/products/')
+            self.assertEqual(response.json()['results'], [])
+            self.assertIn('Server-Timing', response)
+
+
+# বড় হলে full scan এ সময় লাগে এমন tables
+HOT_TABLES = {
+    'products_product', 'cart_cart', 'cart_cartitem', 'cart_stockreservation',
+    'orders_order', 'orders_orderitem',
+}
+# "SCAN t" বা "SCAN t USING [COVERING] INDEX i": index দিয়ে হলেও পুরো table হাঁটা
+PLAN_STEP = re.compile(r'^(SCAN|SEARCH) (?:TABLE )?(\w+)')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+class QueryPlanTest(TestCase):
+    """
+    প্রতিটা API endpoint এর SQL এর EXPLAIN QUERY PLAN দেখো: বড় dataset এ কোনো
+    hot table এ index ছাড়া full scan হলে test fail করবে (index বাদ পড়লে বা
+    query বদলে index ব্যবহার না হলে ধরা পড়বে)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = Category.objects.bulk_create(
+            Category(name=f'Category {i}') for i in range(20))
+        products = Product.objects.bulk_create(
+            Product(name=f'Product {i}', description=f'Soft matte lipstick shade {i}',
+                    price=100 + i % 500, category=categories[i % 20], stock=i % 7)
+            for i in range(3000))
+        carts = Cart.objects.bulk_create(Cart(session_key=f'session-{i}') for i in range(1000))
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, product=products[(cart.id * 7 + j) % 3000], quantity=1)
+            for cart in carts for j in range(3))
+        StockReservation.objects.bulk_create(
+            StockReservation(session_key=f'session-{i}', product=products[i],
+                             quantity=1, expires_at=expiry_time())
+            for i in range(1000))
+        statuses = [value for value, _ in Order.STATUS_CHOICES]
+        orders = Order.objects.bulk_create(
+            Order(customer_name=f'Customer {i}', customer_email='c@example.com',
+                  customer_phone='01700000000', shipping_address='Road 1',
+                  city=['Dhaka', 'Khulna', 'Sylhet'][i % 3], total_amount=300,
+                  status=statuses[i % len(statuses)], is_paid=i % 2 == 0)
+            for i in range(3000))
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=products[(order.id * 3 + j) % 3000],
+                      product_name='Product', product_price=150, quantity=1)
+            for order in orders for j in range(2))
+        rebuild()
+        User.objects.create_user('staff', password='secret', is_staff=True)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.product = products[48]
+        cls.other_product = products[47]
+        cls.category = categories[3]
+        cls.order = orders[1500]
+
+    def setUp(self):
+        cache.clear()
+
+    @contextmanager
+    def assertNoFullScans(self, bounded=()):
+        """
+        bounded: যেসব table এ filter ছাড়া list এর প্রথম page index ধরে শুধু LIMIT
+        পর্যন্ত হাঁটে (SCAN t USING INDEX ... LIMIT n) — সেটা scan ধরা হয় না
+        """
+        queries = []
+
+        def capture(execute, sql, params, many, context):
+            queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            yield
+
+        scans = []
+        for sql, params in queries:
+            if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            steps = {'SCAN': {}, 'SEARCH': {}}
+            for detail in plan:
+                match = PLAN_STEP.match(detail)
+                if match and match.group(2) in HOT_TABLES:
+                    steps[match.group(1)].setdefault(match.group(2), detail)
+            # একই table এ SEARCH ও থাকলে (যেমন subquery তে) scan টা সেই seek এর ভেতরে
+            scans.extend(
+                f'{detail}\n    {sql}' for table, detail in steps['SCAN'].items()
+                if table not in steps['SEARCH']
+                and not (table in bounded and ' USING ' in detail and ' LIMIT ' in sql))
+        self.assertFalse(scans, 'Full table scan:\n' + '\n'.join(scans))
+
+    def get(self, url, bounded=()):
+        with self.assertNoFullScans(bounded):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response
+
+    def send(self, method, url, data):
+        with self.assertNoFullScans():
+            response = getattr(self.client, method)(url, data, content_type='application/json')
+        self.assertLess(response.status_code, 300, response.content)
+        return response
+
+    def test_catalog(self):
+        self.get('/api/products/categories/')
+        next_url = self.get('/api/products/?compact=1').json()['next']
+        self.get(next_url)
+        for sort in ('newest', 'price_low', 'price_high', 'name'):
+            self.get(f'/api/products/?sort={sort}&category={self.category.id}')
+        self.get('/api/products/?in_stock=true&min_price=120&max_price=300')
+        self.get(f'/api/products/{self.product.id}/')
+        # দ্বিতীয় page: cursor ধরে (page param cursor pagination এ ignore হয়)
+        next_url = self.get(f'/api/products/category/{self.category.id}/').json()['next']
+        self.get(next_url)
+        self.get('/api/products/search/?q=matte lip')
+
+    def test_cart_and_checkout(self):
+        self.send('post', '/api/cart/add/', {'product_id': self.product.id, 'quantity': 1})
+        item_id = self.get('/api/cart/').json()['items'][0]['id']
+        self.send('put', f'/api/cart/update/{item_id}/', {'quantity': 2})
+        self.send('post', '/api/cart/batch/', {'operations': [
+            {'op': 'add', 'product_id': self.other_product.id},
+        ]})
+        self.send('post', '/api/orders/create/', {
+            'customer_name': 'Test', 'customer_email': 'test@example.com',
+            'customer_phone': '01700000000', 'shipping_address': 'Road 1',
+            'city': 'Dhaka', 'payment_method': 'cod',
+        })
+        self.send('post', '/api/cart/add/', {'product_id': self.other_product.id})
+        item_id = self.get('/api/cart/').json()['items'][0]['id']
+        self.send('delete', f'/api/cart/remove/{item_id}/', {})
+        self.send('delete', '/api/cart/clear/', {})
+        with self.assertNoFullScans():
+            release_expired()
+
+    def test_orders(self):
+        self.get(f'/api/orders/{self.order.id}/')
+        self.get(f'/api/orders/track/{self.order.id}/')
+        next_url = self.get('/api/orders/?page_size=20', bounded={'orders_order'}).json()['next']
+        self.get(next_url)
+        self.get('/api/orders/?status=shipped')
+        self.get('/api/orders/?city=Khulna&compact=1')
+        # Filter করা list: city (case-insensitive) ও একাধিক filter একসাথে, পরের page সহ
+        next_url = self.get('/api/orders/?city=khulna&page_size=20').json()['next']
+        self.get(next_url)
+        self.get('/api/orders/?city=sylhet&status=pending&is_paid=false')
+        self.get('/api/orders/?is_paid=true')
+        self.get(f'/api/orders/?created_after={date.today()}')
+
+        self.client.login(username='staff', password='secret')
+        response = self.get(f'/api/orders/export.csv?status=pending&after_id={self.order.id}')
+        with self.assertNoFullScans():
+            b''.join(response.streaming_content)
+        self.get('/api/analytics/sales/?group_by=city')
+        self.get('/api/analytics/products/?group_by=category')
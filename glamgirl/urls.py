@@ -10,6 +10,7 @@ from django.conf.urls.static import static
 # Import views
 from products.views import home, products_page, product_detail_page
 from cart.views import cart_page, checkout_page
+from glamgirl.metrics import metrics_view
 
 urlpatterns = [
     # Admin
@@ -30,6 +31,10 @@ urlpatterns = [
     path('api/products/', include('products.urls')),
     path('api/cart/', include('cart.urls')),
     path('api/orders/', include('orders.urls')),
+    path('api/analytics/', include('analytics.urls')),
+
+    # Prometheus metrics
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Media files serve করার জন্য (development এ)
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Job
+from .queue import retry_failed
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Queue দেখার জন্য; failed jobs এর error দেখে retry করা যায়"""
+    list_display = ['id', 'task', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'updated_at']
+    list_filter = ['status', 'task']
+    readonly_fields = [field.name for field in Job._meta.fields]
+    actions = ['retry']
+
+    @admin.action(description='Retry selected failed jobs')
+    def retry(self, request, queryset):
+        count = retry_failed(queryset)
+        self.message_user(request, f'{count} job(s) queued again')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
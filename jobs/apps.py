@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
+        # প্রতিটা app এর tasks.py load করো, যাতে worker task নাম দিয়ে খুঁজে পায়
+        autodiscover_modules('tasks')
@@ -0,0 +1,52 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        'Background jobs চালাও (jobs table থেকে, retry ও backoff সহ)। Production এ '
+        'systemd/supervisor দিয়ে চালু রাখো; SIGTERM এ চলতি jobs শেষ করে থামে'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=2,
+            help='একসাথে কয়টা job চলবে (threads)')
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Queue খালি থাকলে কত seconds পর পর দেখবে')
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Queue খালি হলে থেমে যাও (cron থেকে চালানোর জন্য)')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency অন্তত 1')
+        if options['poll_interval'] <= 0:
+            raise CommandError('--poll-interval 0 এর বেশি হতে হবে')
+
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+
+        def shutdown(signum, frame):
+            self.stdout.write('Stopping: চলতি jobs শেষ হওয়ার অপেক্ষা...')
+            worker.stop()
+
+        previous = {sig: signal.signal(sig, shutdown) for sig in (signal.SIGINT, signal.SIGTERM)}
+        if not options['burst']:
+            self.stdout.write(
+                f"Worker {worker.name} running {options['concurrency']} thread(s)")
+        try:
+            stats = worker.run()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['done']} job(s) done, {stats['retry']} retried, {stats['failed']} failed"))
@@ -0,0 +1,45 @@
+# jobs/models.py
+
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    ⚙️ Background job (jobs.queue.enqueue লেখে, run_worker চালায়)
+    সফল হলে row মুছে যায়; সব attempt fail হলে 'failed' হয়ে থাকে (admin থেকে retry)
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200)  # যেমন 'orders.tasks.send_order_confirmation'
+    payload = models.JSONField(default=dict)  # task এর keyword arguments
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    # এর আগে worker job ধরে না (delay ও retry backoff)
+    run_at = models.DateTimeField()
+    # Visibility timeout: running job এর মধ্যে শেষ না হলে (worker মারা গেলে) আবার চলবে
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        # Worker এর poll: status = queued AND run_at <= now ORDER BY run_at
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.task} ({self.status})"
@@ -0,0 +1,190 @@
+"""
+Database backed job queue (আলাদা broker লাগে না)
+
+Request এর পরের কাজ (email, notification ...) request এর ভেতরে না করে jobs
+table এ লেখা হয়, `python manage.py run_worker` সেগুলো আলাদা process এ চালায়:
+
+    # orders/tasks.py — প্রতিটা app এর tasks.py আপনা থেকে load হয়
+    @task(max_attempts=5)
+    def send_order_confirmation(order_id): ...
+
+    send_order_confirmation.enqueue(order_id=order.id)
+    enqueue('orders.tasks.send_order_confirmation', order_id=order.id, delay=60)
+
+Transactional enqueue: transaction.atomic() এর ভেতরে enqueue করলে job row ওই
+transaction এই লেখা হয় — worker commit এর আগে job দেখে না, rollback হলে
+job ও থাকে না, আর commit ও enqueue এর মাঝে process মারা গেলেও job হারায়
+না (on_commit callback এ হারাতে পারত)। Request এর খরচ শুধু একটা INSERT।
+
+Claim: SQLite এ SKIP LOCKED নেই, তাই worker একটা conditional UPDATE দিয়ে
+job নিজের নামে নেয় (status/locked_until তখনো আগের মতো থাকলেই update হয়);
+দুটো worker একই job পেলে একজনের update 0 row হয়, সে পরেরটা নেয়।
+
+At-least-once: locked_until (task এর timeout) পেরিয়ে গেলে job আবার চলে,
+তাই task idempotent হওয়া দরকার, আর payload এ JSON (ids, model objects না)।
+Fail হলে exponential backoff এ retry, max_attempts পরে 'failed'।
+"""
+
+import logging
+import time
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# একবারে এতগুলো visible job এর মধ্যে থেকে claim করার চেষ্টা (অন্য worker আগে নিলে পরেরটা)
+CLAIM_BATCH = 10
+# Task চলার পরে job row বদলাতে "database is locked" হলে এতবার আবার চেষ্টা
+FINISH_ATTEMPTS = 5
+
+registry = {}
+
+
+def task(func=None, *, max_attempts=None, timeout=None):
+    """
+    Function কে job হিসেবে register করো (@task বা @task(max_attempts=3, timeout=60))
+    func.enqueue(**kwargs) দিয়ে queue তে দাও; সরাসরি call করলে এখনই চলে
+    """
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__qualname__}'
+        func.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        func.timeout = timeout or settings.JOB_TIMEOUT
+        func.enqueue = partial(enqueue, func)
+        registry[func.task_name] = func
+        return func
+
+    return register(func) if func is not None else register
+
+
+def enqueue(func, /, delay=None, **kwargs):
+    """
+    Job লেখো (task function বা তার নাম, kwargs JSON হতে হবে)
+    delay (seconds) দিলে তার পরে চলবে
+    """
+    if isinstance(func, str):
+        if func not in registry:
+            raise ValueError(f'Unknown task: {func}')
+        func = registry[func]
+    return Job.objects.create(
+        task=func.task_name,
+        payload=kwargs,
+        max_attempts=func.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay or 0),
+    )
+
+
+def visible(now):
+    """Worker নিতে পারে: সময় হওয়া queued job, বা timeout পেরোনো running job"""
+    return (Q(status=Job.QUEUED, run_at__lte=now)
+            | Q(status=Job.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts')))
+
+
+def expired(now):
+    """শেষ attempt এ timeout পেরোনো running job (আর চলবে না)"""
+    return Q(status=Job.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts'))
+
+
+def claim(worker_id):
+    """
+    একটা visible job নিজের নামে lock করো (attempts বাড়ে); না পেলে None
+    Expired jobs একই SELECT এ আসে, শুধু তখনই fail_expired এর UPDATE চলে —
+    খালি queue poll করা worker write lock নেয় না
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(visible(now) | expired(now)).order_by('run_at', 'id')
+        .values_list('id', 'task', 'status', 'attempts', 'max_attempts')[:CLAIM_BATCH])
+    if any(status == Job.RUNNING and attempts >= max_attempts
+           for _, _, status, attempts, max_attempts in candidates):
+        fail_expired(now)
+    for job_id, name, status, attempts, max_attempts in candidates:
+        if status == Job.RUNNING and attempts >= max_attempts:
+            continue
+        func = registry.get(name)
+        timeout = func.timeout if func is not None else settings.JOB_TIMEOUT
+        claimed = Job.objects.filter(visible(now), id=job_id).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=timeout),
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def fail_expired(now):
+    """শেষ attempt এ timeout পেরোনো running jobs 'failed' করো (আর চলবে না)"""
+    return Job.objects.filter(expired(now)).update(
+        status=Job.FAILED, locked_until=None,
+        last_error='Timed out: worker did not finish within the visibility timeout',
+        updated_at=now,
+    )
+
+
+def backoff(attempts):
+    """attempts বার fail এর পরে কত seconds অপেক্ষা (প্রতিবার দ্বিগুণ, সর্বোচ্চ JOB_RETRY_BACKOFF_MAX)"""
+    return min(settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOB_RETRY_BACKOFF_MAX)
+
+
+def run(job):
+    """
+    Claim করা job চালাও: সফল হলে মুছে ফেলো, fail হলে retry বা 'failed'
+    Return: 'done', 'retry' বা 'failed'
+    Task transaction এর বাইরে চলে (SQLite এ write lock ধরে রাখবে না); এই
+    claim টা (id + attempts) ততক্ষণে অন্য worker নিয়ে নিলে কিছু বদলানো হয় না
+    """
+    mine = Job.objects.filter(id=job.id, attempts=job.attempts, status=Job.RUNNING)
+    func = registry.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task: {job.task}')
+        func(**job.payload)
+    except Exception:
+        logger.exception('Job %s (%s) failed, attempt %s/%s',
+                         job.id, job.task, job.attempts, job.max_attempts)
+        now = timezone.now()
+        retry = job.attempts < job.max_attempts
+        finish(partial(
+            mine.update,
+            status=Job.QUEUED if retry else Job.FAILED,
+            run_at=now + timedelta(seconds=backoff(job.attempts)) if retry else job.run_at,
+            locked_until=None,
+            locked_by='',
+            last_error=traceback.format_exc(),
+            updated_at=now,
+        ))
+        return 'retry' if retry else 'failed'
+
+    finish(mine.delete)
+    return 'done'
+
+
+def finish(write):
+    """
+    Task চলার পরের write (delete/update): lock এর জন্য fail হলে একটু পরে আবার
+    চেষ্টা — না হলে job running থেকে যেত আর timeout এর পরে আবার চলত
+    """
+    for attempt in range(1, FINISH_ATTEMPTS + 1):
+        try:
+            return write()
+        except OperationalError:
+            if attempt == FINISH_ATTEMPTS:
+                raise
+            logger.warning('Job finish failed (attempt %s/%s), retrying', attempt, FINISH_ATTEMPTS)
+            time.sleep(0.1 * 2 ** attempt)
+
+
+def retry_failed(queryset):
+    """Failed jobs আবার queue তে দাও (attempts নতুন করে শুরু)"""
+    return queryset.filter(status=Job.FAILED).update(
+        status=Job.QUEUED, attempts=0, run_at=timezone.now(), updated_at=timezone.now())
@@ -0,0 +1,178 @@
+import io
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import queue
+from .models import Job
+from .queue import enqueue, task
+
+calls = []
+calls_lock = threading.Lock()
+
+
+@task
+def record(value):
+    with calls_lock:
+        calls.append(value)
+
+
+@task(max_attempts=2, timeout=30)
+def explode(message):
+    raise RuntimeError(message)
+
+
+def later(seconds):
+    """timezone.now() কে seconds এগিয়ে দাও"""
+    return mock.patch.object(
+        timezone, 'now', return_value=timezone.now() + timedelta(seconds=seconds))
+
+
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_is_part_of_the_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record.enqueue(value='rolled back')
+                raise RuntimeError('checkout failed')
+        self.assertFalse(Job.objects.exists())
+
+        job = enqueue('jobs.tests.record', value='kept')
+        self.assertEqual(job.task, 'jobs.tests.record')
+        self.assertEqual(job.payload, {'value': 'kept'})
+        with self.assertRaises(ValueError):
+            enqueue('jobs.tests.missing')
+
+    def test_claim_and_run(self):
+        job = record.enqueue(value=1)
+
+        claimed = queue.claim('worker-a')
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, Job.RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertEqual(claimed.locked_by, 'worker-a')
+        # অন্য worker running job পায় না
+        self.assertIsNone(queue.claim('worker-b'))
+
+        self.assertEqual(queue.run(claimed), 'done')
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_delay(self):
+        record.enqueue(value=1, delay=60)
+        self.assertIsNone(queue.claim('worker'))
+        with later(61):
+            self.assertIsNotNone(queue.claim('worker'))
+
+    def test_retry_with_backoff_then_failed(self):
+        explode.enqueue(message='smtp down')
+
+        self.assertEqual(queue.run(queue.claim('worker')), 'retry')
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn('smtp down', job.last_error)
+        # JOB_RETRY_BACKOFF পরে আবার চলবে, তার আগে না
+        self.assertIsNone(queue.claim('worker'))
+        with later(queue.backoff(1) + 1):
+            self.assertEqual(queue.run(queue.claim('worker')), 'failed')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        with later(3600):
+            self.assertIsNone(queue.claim('worker'))
+
+        # Admin retry
+        self.assertEqual(queue.retry_failed(Job.objects.all()), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 0))
+
+    def test_idle_poll_does_not_write(self):
+        record.enqueue(value=1, delay=60)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsNone(queue.claim('worker'))
+        self.assertEqual([query['sql'].split()[0] for query in queries], ['SELECT'])
+
+    def test_finish_is_retried_on_lock_errors(self):
+        job = record.enqueue(value=1)
+        delete = Job.objects.filter(id=job.id).delete
+        errors = iter([OperationalError('database is locked')])
+
+        def flaky_delete():
+            for error in errors:
+                raise error
+            return delete()
+
+        with mock.patch.object(queue.time, 'sleep') as sleep:
+            queue.finish(flaky_delete)
+        sleep.assert_called_once()
+        self.assertFalse(Job.objects.exists())
+
+    def test_backoff_doubles_up_to_max(self):
+        with self.settings(JOB_RETRY_BACKOFF=10, JOB_RETRY_BACKOFF_MAX=60):
+            self.assertEqual([queue.backoff(n) for n in range(1, 6)], [10, 20, 40, 60, 60])
+
+    def test_visibility_timeout(self):
+        explode.enqueue(message='never runs')
+        first = queue.claim('dead-worker')
+
+        # Worker মারা গেছে: timeout এর পরে অন্য worker আবার নেয়
+        self.assertIsNone(queue.claim('worker'))
+        with later(31):
+            second = queue.claim('worker')
+        self.assertEqual((second.id, second.attempts, second.locked_by), (first.id, 2, 'worker'))
+
+        # পুরনো claim শেষ হলেও নতুন claim এর job বদলায় না
+        self.assertEqual(queue.run(first), 'retry')
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.RUNNING)
+
+        # শেষ attempt ও timeout পেরোলে failed
+        with later(62):
+            self.assertIsNone(queue.claim('worker'))
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.FAILED)
+        self.assertIn('Timed out', second.last_error)
+
+    def test_run_worker_command(self):
+        for value in range(3):
+            record.enqueue(value=value)
+        explode.enqueue(message='boom')
+
+        output = io.StringIO()
+        call_command('run_worker', '--burst', '--concurrency', '1', stdout=output)
+
+        self.assertEqual(sorted(calls), [0, 1, 2])
+        self.assertIn('3 job(s) done, 1 retried, 0 failed', output.getvalue())
+        self.assertEqual(list(Job.objects.values_list('task', flat=True)), ['jobs.tests.explode'])
+
+        with self.assertRaises(CommandError):
+            call_command('run_worker', '--concurrency', '0')
+
+
+class ConcurrentWorkerTest(TransactionTestCase):
+    """একাধিক worker thread: প্রতিটা job ঠিক একবার চলে"""
+
+    JOBS = 40
+
+    def test_each_job_runs_once(self):
+        calls.clear()
+        for value in range(self.JOBS):
+            record.enqueue(value=value)
+
+        output = io.StringIO()
+        call_command('run_worker', '--burst', '--concurrency', '4', stdout=output)
+
+        self.assertEqual(sorted(calls), list(range(self.JOBS)))
+        # সব job শেষ হয়ে মুছে গেছে (running থেকে গেলে timeout এর পরে আবার চলত)
+        self.assertFalse(Job.objects.exists())
+        self.assertIn(f'{self.JOBS} job(s) done, 0 retried, 0 failed', output.getvalue())
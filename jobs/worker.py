@@ -0,0 +1,84 @@
+"""
+Job worker: concurrency সংখ্যক thread, প্রতিটা নিজে claim করে job চালায়
+
+Jobs গুলো I/O (email, HTTP, database), তাই একটা process এ threads যথেষ্ট;
+CPU এর কাজ হলে একাধিক run_worker process চালাও — claim database এ হয়, তাই
+একই job দুটো worker পায় না। stop() এর পরে চলতি job শেষ করে threads থামে।
+"""
+
+import logging
+import os
+import socket
+import threading
+from collections import Counter
+
+from django.db import DatabaseError, close_old_connections, connection, connections
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+
+    def __init__(self, concurrency=1, poll_interval=1.0, burst=False):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        # burst: queue খালি হলে থেমে যাও (cron / tests), না হলে poll করতে থাকো
+        self.burst = burst
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def run(self):
+        if self.concurrency == 1:
+            # একটা হলে আলাদা thread লাগে না (connection caller এর, খোলা থাকে)
+            self.work(f'{self.name}:1')
+            return self.stats
+
+        threads = [
+            threading.Thread(target=self.work_in_thread, args=(f'{self.name}:{number}',),
+                             name=f'job-worker-{number}')
+            for number in range(1, self.concurrency + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # Timeout দিয়ে join, যাতে main thread signal (SIGTERM/Ctrl+C) পায়
+            while thread.is_alive():
+                thread.join(timeout=1)
+        return self.stats
+
+    def stop(self):
+        self._stopping.set()
+
+    def work_in_thread(self, worker_id):
+        try:
+            self.work(worker_id)
+        finally:
+            # এই thread এর database connection খোলা রেখো না
+            connections.close_all()
+
+    def work(self, worker_id):
+        while not self._stopping.is_set():
+            # CONN_MAX_AGE / health check: পুরনো বা ভাঙা connection বদলাও
+            # (caller এর transaction এর ভেতরে চললে, যেমন tests, connection বদলানো যায় না)
+            if not connection.in_atomic_block:
+                close_old_connections()
+            try:
+                job = queue.claim(worker_id)
+                if job is None:
+                    if self.burst:
+                        break
+                    self._stopping.wait(self.poll_interval)
+                    continue
+                outcome = queue.run(job)
+            except DatabaseError:
+                # যেমন "database is locked": thread চালু থাকুক, একটু পরে আবার চেষ্টা।
+                # Job এর মাঝে হলে timeout এর পরে job আবার চলবে
+                logger.exception('Job worker %s: database error', worker_id)
+                self._stopping.wait(self.poll_interval)
+                continue
+            with self._lock:
+                self.stats[outcome] += 1
@@ -1,22 +1,38 @@
 # orders/admin.py
 
 from django.contrib import admin
+from glamgirl.changelist import CachedDistinctFilter, ScalableAdminMixin
 from .models import Order, OrderItem
 
 
+class CityFilter(CachedDistinctFilter):
+    """City filter: লাখ লাখ order এ DISTINCT city প্রতিবার না গুনে cache থেকে"""
+    title = 'city'
+    # Django এর field filter এর মতো একই param, পুরনো links চলবে
+    parameter_name = 'city__exact'
+    field_name = 'city'
+
+
 class OrderItemInline(admin.TabularInline):
     """Order এর মধ্যে items দেখাবে"""
     model = OrderItem
     extra = 0
     readonly_fields = ['product', 'product_name', 'product_price', 'quantity', 'get_subtotal']
     
+    def get_queryset(self, request):
+        # Product নাম দেখাতে প্রতি item এ আলাদা query না
+        return super().get_queryset(request).select_related('product')
+    
     def get_subtotal(self, obj):
+        # "Add another" এর খালি form এ price নেই
+        if obj.product_price is None:
+            return None
         return obj.get_subtotal()
     get_subtotal.short_description = 'Subtotal'
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = [
         'id', 
         'customer_name', 
@@ -28,7 +44,11 @@ class OrderAdmin(admin.ModelAdmin):
         'is_paid',
         'created_at'
     ]
-    list_filter = ['status', 'payment_method', 'is_paid', 'city', 'created_at']
+    list_filter = ['status', 'payment_method', 'is_paid', CityFilter]
+    # Year/month/day drill-down order_created_idx দিয়ে (glamgirl.changelist)
+    date_hierarchy = 'created_at'
+    # order_created_idx এর ক্রম; Django নিজে '-pk' যোগ করলে index এর পরে আবার sort লাগে
+    ordering = ['-created_at', 'id']
     search_fields = ['customer_name', 'customer_email', 'customer_phone']
     list_editable = ['status', 'is_paid']
     readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,56 @@
+"""
+Order read API এর async version (settings.ASYNC_VIEWS, glamgirl.async_urls)
+"""
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from glamgirl.async_api import async_api_view
+from glamgirl.db import replica_reads
+from .models import Order
+from .serializers import OrderSerializer
+from .views import order_queryset
+
+
+@async_api_view(['GET'])
+async def order_detail(request, order_id):
+    """
+    📄 Order details দেখাও
+    GET /api/orders/<order_id>/
+    """
+    serializer = OrderSerializer(context={'request': request})
+    try:
+        order = await order_queryset(serializer).aget(id=order_id)
+    except Order.DoesNotExist:
+        return Response(
+            {'error': 'Order not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    serializer.instance = order
+    return Response(serializer.data)
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def track_order(request, order_id):
+    """
+    🚚 Order track করো (views.track_order এর মতো read replica থেকে)
+    GET /api/orders/track/<order_id>/
+    """
+    try:
+        order = await Order.objects.aget(id=order_id)
+    except Order.DoesNotExist:
+        return Response(
+            {'error': 'Order not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response({
+        'order_id': order.id,
+        'status': order.status,
+        'status_display': order.get_status_display(),
+        'is_paid': order.is_paid,
+        'created_at': order.created_at,
+        'updated_at': order.updated_at,
+    })
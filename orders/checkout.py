@@ -0,0 +1,153 @@
+"""
+Checkout: cart থেকে order তৈরি
+
+Product গুলো একবারে lock করে পড়া হয়, stock একটা conditional UPDATE
+(available stock >= quantity হলেই কমবে) দিয়ে কমানো হয় এবং order items bulk_create
+হয় — cart এ যত item থাকুক, query সংখ্যা একই থাকে, আর একসাথে অনেক
+checkout হলেও stock negative বা lost update হয় না।
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+
+from analytics.rollups import record_order
+from cart import reservations
+from products import stock
+from products.models import Product
+from .models import Order, OrderItem
+from .tasks import send_order_confirmation
+
+
+class OutOfStockError(Exception):
+    def __init__(self, product):
+        self.product = product
+        super().__init__(f'Not enough stock for {product.name}')
+
+
+def shipping_cost_for(city):
+    return 60 if city.lower() != 'dhaka' else 0
+
+
+def place_order(cart, data):
+    """
+    Cart এর items দিয়ে order তৈরি করো ও stock কমাও (একটা transaction এ)
+    Stock না থাকলে OutOfStockError raise হয় এবং কিছুই save হয় না
+    """
+    quantities = Counter()
+    for product_id, quantity in cart.items.values_list('product_id', 'quantity'):
+        quantities[product_id] += quantity
+
+    with transaction.atomic():
+        # একবারে সব product lock করে পড়ো (SQLite এ write lock BEGIN IMMEDIATE এই নেওয়া হয়)
+        products = Product.objects.select_for_update().in_bulk(list(quantities))
+
+        # এই customer এর নিজের reservation available stock এর মধ্যে ধরা হয়
+        held = reservations.consume(cart.session_key, list(quantities))
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+            if product.stock - product.reserved + held[product_id] < quantity:
+                raise OutOfStockError(product)
+
+        decrement_stock(quantities, held, products)
+        available = {
+            product_id: product.stock - product.reserved
+            for product_id, product in products.items()
+        }
+
+        order = Order(
+            customer_name=data['customer_name'],
+            customer_email=data['customer_email'],
+            customer_phone=data['customer_phone'],
+            shipping_address=data['shipping_address'],
+            city=data['city'],
+            postal_code=data.get('postal_code', ''),
+            payment_method=data['payment_method'],
+            note=data.get('note', ''),
+            total_amount=sum(
+                products[product_id].price * quantity
+                for product_id, quantity in quantities.items()),
+            shipping_cost=shipping_cost_for(data['city']),
+        )
+        # Items সহ নিচে record_order হয়, post_save এ আলাদা করে rollup এ যোগ হবে না
+        order._rollup_recorded = True
+        order.save()
+
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product=products[product_id],
+                product_name=products[product_id].name,
+                product_price=products[product_id].price,
+                quantity=quantity,
+            )
+            for product_id, quantity in quantities.items()
+        ])
+
+        # Sales report এর rollup এই transaction এই update হয়
+        record_order(order, [
+            {
+                'product_id': product_id,
+                'category_id': products[product_id].category_id,
+                'product_name': products[product_id].name,
+                'price': products[product_id].price,
+                'quantity': quantity,
+            }
+            for product_id, quantity in quantities.items()
+        ])
+
+        cart.items.all().delete()
+
+        # Confirmation email worker পাঠায় (jobs): job একই transaction এ লেখা হয়,
+        # তাই order commit হলেই worker দেখে আর checkout email এর অপেক্ষা করে না
+        send_order_confirmation.enqueue(order_id=order.id)
+
+        # Stock UPDATE এ signal চলে না: শুধু এই products এর live stock মোছো;
+        # কোনোটা out of stock হলে in_stock pages ও facets ও (catalog version)
+        stock.changed(quantities, crossed_zero=stock.crosses_zero(available, {
+            product_id: available[product_id] - quantity + held[product_id]
+            for product_id, quantity in quantities.items()
+        }))
+
+    return order
+
+
+def decrement_stock(quantities, held, products):
+    """
+    এক UPDATE এ সব product এর stock ও নিজের reservation কমাও:
+    UPDATE ... SET stock = CASE id WHEN .. THEN stock - q END,
+                   reserved = CASE id WHEN .. THEN reserved - h END
+    WHERE (id = .. AND stock >= reserved - h + q) OR ...
+    কোনো row এর stock না থাকলে updated row কম হবে -> OutOfStockError
+    """
+    condition = Q()
+    for product_id, quantity in quantities.items():
+        condition |= Q(
+            id=product_id,
+            stock__gte=F('reserved') + (quantity - held[product_id]))
+
+    updated = Product.objects.filter(condition).update(
+        stock=Case(*[
+            When(id=product_id, then=F('stock') - quantity)
+            for product_id, quantity in quantities.items()
+        ]),
+        reserved=Case(*[
+            When(id=product_id, then=F('reserved') - held[product_id])
+            for product_id in quantities
+        ]),
+        updated_at=timezone.now(),
+    )
+    if updated != len(quantities):
+        # Lock ছাড়া backend এ অন্য checkout আগে stock নিয়ে গেছে
+        stock = {
+            product_id: available + held[product_id]
+            for product_id, available in Product.objects.filter(
+                id__in=list(quantities)).values_list(
+                    'id', F('stock') - F('reserved'))
+        }
+        for product_id, quantity in quantities.items():
+            if stock.get(product_id, 0) < quantity:
+                raise OutOfStockError(products[product_id])
+        raise OutOfStockError(next(iter(products.values())))
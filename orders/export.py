@@ -0,0 +1,95 @@
+"""
+Order export (CSV / NDJSON)
+
+Orders id অনুযায়ী keyset chunk এ পড়া হয় (WHERE id > last_id LIMIT n) আর
+প্রতিটা chunk এর items এক query তে আসে, তাই কত লাখ order export হচ্ছে তার
+উপর memory নির্ভর করে না। Rows generator থেকে yield হয় — StreamingHttpResponse
+ও export_orders command দুটোই এগুলো ব্যবহার করে।
+
+Export মাঝপথে থেমে গেলে শেষ order id দিয়ে (after_id) আবার শুরু করা যায়:
+CSV তে order_id column আর NDJSON এর প্রতিটা line এ id থাকে।
+"""
+
+import csv
+import json
+from collections import defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .filters import filter_orders
+from .models import Order, OrderItem
+
+FORMATS = ('csv', 'ndjson')
+
+ORDER_FIELDS = [
+    'id', 'created_at', 'status', 'payment_method', 'is_paid',
+    'customer_name', 'customer_email', 'customer_phone',
+    'shipping_address', 'city', 'postal_code',
+    'total_amount', 'shipping_cost', 'note',
+]
+ITEM_FIELDS = ['product_id', 'product_name', 'product_price', 'quantity']
+
+CSV_HEADER = (
+    ['order_id'] + ORDER_FIELDS[1:] + [f'item_{name}' for name in ITEM_FIELDS]
+)
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_orders(filters=None, after_id=0, chunk_size=1000):
+    """
+    Filter করা orders (items সহ dict হিসেবে) id এর ক্রমে yield করো
+    প্রতি chunk এ দুটো query: orders আর সেগুলোর items
+    """
+    orders = filter_orders(Order.objects.all(), filters or {}).order_by('id')
+    last_id = after_id or 0
+    while True:
+        chunk = list(orders.filter(id__gt=last_id).values(*ORDER_FIELDS)[:chunk_size])
+        if not chunk:
+            return
+
+        items = defaultdict(list)
+        for item in (OrderItem.objects
+                     .filter(order_id__in=[order['id'] for order in chunk])
+                     # (order_id, id) ক্রম order FK index থেকেই আসে, sort বা scan লাগে না
+                     .order_by('order_id', 'id')
+                     .values('order_id', *ITEM_FIELDS)):
+            items[item.pop('order_id')].append(item)
+
+        for order in chunk:
+            order['items'] = items[order['id']]
+            yield order
+        last_id = chunk[-1]['id']
+
+
+class Echo:
+    """csv.writer এর জন্য file এর মতো object: লেখা line টাই return করে"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(orders, header=True):
+    """প্রতিটা order item এর জন্য এক row; item ছাড়া order এর জন্য একটা খালি item row"""
+    writer = csv.writer(Echo())
+    if header:
+        yield writer.writerow(CSV_HEADER)
+    for order in orders:
+        base = [order[name] for name in ORDER_FIELDS]
+        for item in order['items'] or [dict.fromkeys(ITEM_FIELDS, '')]:
+            yield writer.writerow(base + [item[name] for name in ITEM_FIELDS])
+
+
+def ndjson_lines(orders):
+    """প্রতিটা order এক line JSON (items nested)"""
+    for order in orders:
+        yield json.dumps(order, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def export_lines(file_format, orders, header=True):
+    if file_format == 'csv':
+        return csv_lines(orders, header=header)
+    return ndjson_lines(orders)
@@ -0,0 +1,35 @@
+"""
+Order list, export endpoint ও export_orders command এর common filters
+(OrderFilterSerializer এর validated_data নেয়)
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_orders(queryset, filters):
+    for field in ('status', 'payment_method'):
+        if filters.get(field):
+            queryset = queryset.filter(**{field: filters[field]})
+    if filters.get('city'):
+        # Customer যেভাবে লিখেছে (dhaka / Dhaka), সব মিলবে। iexact SQLite এ LIKE
+        # হয় আর কোনো index পায় না; LOWER(city) এর expression index পায়
+        queryset = queryset.alias(city_lower=Lower('city')).filter(
+            city_lower=Lower(Value(filters['city'])))
+    if filters.get('is_paid') is not None:
+        # is_paid=True হয় WHERE "is_paid" (equality না), order_paid_created_idx পায় না
+        queryset = queryset.filter(is_paid__in=[filters['is_paid']])
+    # Date range কে datetime range বানাও যাতে created_at index ব্যবহার হয়
+    if filters.get('created_after'):
+        queryset = queryset.filter(created_at__gte=start_of_day(filters['created_after']))
+    if filters.get('created_before'):
+        queryset = queryset.filter(
+            created_at__lt=start_of_day(filters['created_before'] + timedelta(days=1)))
+    return queryset
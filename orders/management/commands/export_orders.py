@@ -0,0 +1,65 @@
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from orders.export import FORMATS, export_lines, iter_orders
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        'Orders ও তাদের items CSV / NDJSON এ export করো। Memory flat থাকে; '
+        'থেমে গেলে শেষ order id দিয়ে --after-id এ আবার চালাও'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv', dest='file_format')
+        parser.add_argument(
+            '--output', '-o',
+            help='File path (না দিলে stdout)। --after-id সহ দিলে file এ append হয়')
+        parser.add_argument(
+            '--status', choices=[value for value, _ in Order.STATUS_CHOICES])
+        parser.add_argument('--created-after', type=date.fromisoformat, help='YYYY-MM-DD')
+        parser.add_argument('--created-before', type=date.fromisoformat, help='YYYY-MM-DD')
+        parser.add_argument(
+            '--after-id', type=int, default=0,
+            help='এই id এর পরের orders থেকে শুরু করো (resume)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='প্রতি query তে কয়টা order পড়া হবে')
+
+    def handle(self, *args, **options):
+        filters = {
+            'status': options['status'],
+            'created_after': options['created_after'],
+            'created_before': options['created_before'],
+        }
+        after_id = options['after_id']
+        state = {'count': 0, 'last_id': after_id}
+
+        def tracked(orders):
+            for order in orders:
+                yield order
+                state['count'] += 1
+                state['last_id'] = order['id']
+
+        orders = tracked(iter_orders(
+            filters, after_id=after_id, chunk_size=options['chunk_size']))
+
+        path = options['output']
+        # Resume করলে আগের file এর শেষে লেখো, header আবার লিখো না
+        append = bool(path and after_id and os.path.exists(path) and os.path.getsize(path))
+        lines = export_lines(options['file_format'], orders, header=not append)
+        try:
+            if path:
+                with open(path, 'a' if append else 'w', encoding='utf-8', newline='') as output:
+                    for line in lines:
+                        output.write(line)
+            else:
+                for line in lines:
+                    self.stdout.write(line, ending='')
+        finally:
+            # থেমে গেলেও (Ctrl+C / error) কোথা থেকে resume করতে হবে সেটা জানাও
+            self.stderr.write(
+                f"{state['count']} order(s) exported, last order id: {state['last_id']}")
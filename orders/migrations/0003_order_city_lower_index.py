@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(django.db.models.functions.text.Lower('city'), models.OrderBy(models.F('created_at'), descending=True), models.F('id'), name='order_city_lower_created_idx'),
+        ),
+    ]
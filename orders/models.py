@@ -1,6 +1,8 @@
 # orders/models.py
 
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 from products.models import Product
 
@@ -65,6 +67,17 @@ class Order(models.Model):
     
     class Meta:
         ordering = ['-created_at']  # Latest orders first
+        # Order list এর cursor pagination ও filter গুলোর জন্য
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='order_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='order_status_created_idx'),
+            models.Index(fields=['payment_method', '-created_at'], name='order_payment_created_idx'),
+            models.Index(fields=['city', '-created_at'], name='order_city_created_idx'),
+            # ?city= case-insensitive (orders.filters)
+            models.Index(Lower('city'), F('created_at').desc(), 'id',
+                         name='order_city_lower_created_idx'),
+            models.Index(fields=['is_paid', '-created_at'], name='order_paid_created_idx'),
+        ]
     
     def __str__(self):
         return f"Order #{self.id} - {self.customer_name}"
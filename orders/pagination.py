@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Order list এর keyset (cursor) pagination: latest orders আগে
+    Order Meta তে (created_at, id) ও filter + created_at index আছে
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', 'id')
@@ -1,10 +1,11 @@
 # orders/serializers.py
 
 from rest_framework import serializers
+from glamgirl.serializers import SparseFieldsMixin
 from .models import Order, OrderItem
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     subtotal = serializers.SerializerMethodField()
     
     class Meta:
@@ -18,12 +19,13 @@ class OrderItemSerializer(serializers.ModelSerializer):
             'subtotal'
         ]
         read_only_fields = ['product_name', 'product_price']
+        field_dependencies = {'subtotal': ['product_price', 'quantity']}
     
     def get_subtotal(self, obj):
         return obj.get_subtotal()
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
     grand_total = serializers.SerializerMethodField()
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -52,11 +54,38 @@ class OrderSerializer(serializers.ModelSerializer):
             'created_at',
         ]
         read_only_fields = ['total_amount', 'status', 'is_paid', 'created_at']
+        # ?compact=1 এ items বাদ (?expand=items দিলে থাকবে)
+        compact_exclude = ['items', 'note']
+        field_dependencies = {
+            'grand_total': ['total_amount', 'shipping_cost'],
+            'status_display': ['status'],
+            'payment_method_display': ['payment_method'],
+        }
     
     def get_grand_total(self, obj):
         return obj.get_grand_total()
 
 
+class OrderFilterSerializer(serializers.Serializer):
+    """
+    Order list এর query params validate করার জন্য
+    ?status=&payment_method=&city=&is_paid=&created_after=&created_before=
+    """
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    payment_method = serializers.ChoiceField(choices=Order.PAYMENT_CHOICES, required=False)
+    city = serializers.CharField(max_length=50, required=False)
+    is_paid = serializers.BooleanField(required=False, allow_null=True, default=None)
+    created_after = serializers.DateField(required=False)
+    created_before = serializers.DateField(required=False)
+
+
+class OrderExportSerializer(OrderFilterSerializer):
+    """
+    Export endpoint এর query params: list এর filters + resume করার জন্য after_id
+    """
+    after_id = serializers.IntegerField(min_value=0, required=False, default=0)
+
+
 class CreateOrderSerializer(serializers.Serializer):
     """
     Order create করার জন্য আলাদা serializer
@@ -0,0 +1,34 @@
+"""Order এর পরের কাজ: checkout এর পরে run_worker এ চলে (jobs app)"""
+
+from django.core.mail import send_mail
+
+from jobs.queue import task
+from .models import Order
+
+
+@task
+def send_order_confirmation(order_id):
+    """
+    Customer কে order confirmation email
+    Job at-least-once চলে, তাই খুব কম ক্ষেত্রে email দুবার যেতে পারে
+    """
+    order = Order.objects.prefetch_related('items').filter(id=order_id).first()
+    if order is None:
+        # এর মধ্যে order মুছে গেছে
+        return
+
+    lines = [f'Hi {order.customer_name},', '', f'Thank you! Your order #{order.id} has been placed.', '']
+    lines += [
+        f'  {item.quantity} x {item.product_name}  ৳{item.get_subtotal()}'
+        for item in order.items.all()
+    ]
+    lines += [
+        '',
+        f'Shipping: ৳{order.shipping_cost}',
+        f'Total: ৳{order.get_grand_total()} ({order.get_payment_method_display()})',
+        '',
+        f'Shipping to: {order.shipping_address}, {order.city}',
+        '',
+        'GlamGirl',
+    ]
+    send_mail(f'Order #{order.id} confirmed', '\n'.join(lines), None, [order.customer_email])
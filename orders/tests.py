@@ -1,3 +1,450 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from cart.models import StockReservation
+from glamgirl.changelist import EstimatedCountPaginator, IndexedDateQuerySet
+from jobs.models import Job
+from products.cache import get_catalog_version
+from products.models import Category, Product
+from .models import Order, OrderItem
+
+ORDER_DATA = {
+    'customer_name': 'Test Customer',
+    'customer_email': 'test@example.com',
+    'customer_phone': '01700000000',
+    'shipping_address': 'Road 1, House 2',
+    'city': 'Dhaka',
+    'payment_method': 'cod',
+}
+
+
+def add_to_cart(client, product, quantity=1):
+    response = client.post(
+        '/api/cart/add/', {'product_id': product.id, 'quantity': quantity},
+        content_type='application/json')
+    assert response.status_code == 200, response.content
+
+
+def checkout(client):
+    return client.post(
+        '/api/orders/create/', ORDER_DATA, content_type='application/json')
+
+
+class CreateOrderTest(TestCase):
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Makeup')
+        self.products = [
+            Product.objects.create(
+                name=f'Product {i}', description='Test product',
+                price=100, category=self.category, stock=5)
+            for i in range(10)
+        ]
+
+    def test_order_decrements_stock_and_clears_cart(self):
+        add_to_cart(self.client, self.products[0], 2)
+        add_to_cart(self.client, self.products[1], 3)
+
+        response = checkout(self.client)
+
+        self.assertEqual(response.status_code, 201)
+        order = response.json()['order']
+        self.assertEqual(float(order['total_amount']), 500)
+        self.assertEqual(len(order['items']), 2)
+        self.products[0].refresh_from_db()
+        self.products[1].refresh_from_db()
+        self.assertEqual(self.products[0].stock, 3)
+        self.assertEqual(self.products[1].stock, 2)
+        self.assertEqual(self.client.get('/api/cart/').json()['total_items'], 0)
+
+    def test_out_of_stock_rolls_back(self):
+        add_to_cart(self.client, self.products[0], 2)
+        add_to_cart(self.client, self.products[1], 5)
+        Product.objects.filter(id=self.products[1].id).update(stock=4)
+
+        response = checkout(self.client)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Product 1', response.json()['error'])
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Job.objects.exists())
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].stock, 5)
+
+    def test_confirmation_email_is_sent_by_worker(self):
+        add_to_cart(self.client, self.products[0], 2)
+
+        response = checkout(self.client)
+
+        # Checkout email পাঠায় না, শুধু job queue করে
+        order_id = response.json()['order']['id']
+        job = Job.objects.get()
+        self.assertEqual(job.task, 'orders.tasks.send_order_confirmation')
+        self.assertEqual(job.payload, {'order_id': order_id})
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('run_worker', '--burst', '--concurrency', '1', stdout=io.StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, f'Order #{order_id} confirmed')
+        self.assertEqual(mail.outbox[0].to, [ORDER_DATA['customer_email']])
+        self.assertIn('2 x Product 0', mail.outbox[0].body)
+        self.assertFalse(Job.objects.exists())
+
+    def test_checkout_query_count_is_constant(self):
+        def count_checkout_queries(item_count):
+            client = Client()
+            for product in self.products[:item_count]:
+                add_to_cart(client, product)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(checkout(client).status_code, 201)
+            return len(queries)
+
+        self.assertEqual(count_checkout_queries(1), count_checkout_queries(8))
+
+
+class CatalogStockTest(TestCase):
+    """Checkout এ পুরো catalog cache invalidate হয় না, শুধু ওই products এর stock"""
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Makeup')
+        self.lipstick = Product.objects.create(
+            name='Lipstick', description='Red', price=250, category=category, stock=5)
+        self.serum = Product.objects.create(
+            name='Serum', description='Face', price=900, category=category, stock=2)
+
+    def stock(self, product):
+        return self.client.get(f'/api/products/{product.id}/').json()['stock']
+
+    def place_order(self, product, quantity):
+        client = Client()
+        with self.captureOnCommitCallbacks(execute=True):
+            add_to_cart(client, product, quantity)
+            self.assertEqual(checkout(client).status_code, 201)
+
+    def test_checkout_updates_cached_stock_only(self):
+        self.assertEqual((self.stock(self.lipstick), self.stock(self.serum)), (5, 2))
+        version = get_catalog_version()
+
+        self.place_order(self.lipstick, 2)
+        self.assertEqual(get_catalog_version(), version)
+        # Cached response থেকে, শুধু live stock নতুন
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.stock(self.lipstick), 3)
+        self.assertEqual(len(queries), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.stock(self.serum), 2)
+        self.assertContains(self.client.get(f'/product/{self.lipstick.id}/'), '(3 available)')
+
+    def test_sold_out_invalidates_in_stock_pages(self):
+        in_stock = '/api/products/?in_stock=true'
+        self.assertEqual(len(self.client.get(in_stock).json()['results']), 2)
+        version = get_catalog_version()
+
+        self.place_order(self.serum, 2)
+        self.assertGreater(get_catalog_version(), version)
+        self.assertEqual(
+            [product['name'] for product in self.client.get(in_stock).json()['results']],
+            ['Lipstick'])
+
+
+class OrderListTest(TestCase):
+
+    def setUp(self):
+        for i in range(5):
+            order = Order.objects.create(
+                customer_name='Test Customer', customer_email='test@example.com',
+                customer_phone='01700000000', shipping_address='Road 1',
+                city='Dhaka' if i % 2 else 'Khulna', payment_method='cod',
+                total_amount=100, is_paid=i == 0)
+            for _ in range(3):
+                OrderItem.objects.create(
+                    order=order, product_name='Item', product_price=50, quantity=2)
+
+    def test_cursor_pagination_with_prefetched_items(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/orders/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(len(data['results'][0]['items']), 3)
+        # orders + items prefetch, order সংখ্যার উপর নির্ভর করে না
+        self.assertEqual(len(queries), 2)
+
+        seen = [order['id'] for order in data['results']]
+        url = data['next']
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(order['id'] for order in data['results'])
+            url = data['next']
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 5)
+
+    def test_sparse_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/orders/?fields=id,grand_total,items.quantity')
+        order = response.json()['results'][0]
+        self.assertEqual(sorted(order), ['grand_total', 'id', 'items'])
+        self.assertEqual(order['items'][0], {'quantity': 2})
+        # যেগুলো লাগবে না সেগুলো load ও হয় না
+        orders_sql, items_sql = [query['sql'] for query in queries]
+        self.assertNotIn('"customer_email"', orders_sql)
+        self.assertIn('"shipping_cost"', orders_sql)
+        self.assertNotIn('"product_name"', items_sql)
+
+        order_id = order['id']
+        response = self.client.get(f'/api/orders/{order_id}/?fields=id,status_display')
+        self.assertEqual(response.json(), {'id': order_id, 'status_display': 'Pending'})
+
+    def test_compact_expand(self):
+        order = self.client.get('/api/orders/?compact=1').json()['results'][0]
+        self.assertNotIn('items', order)
+        self.assertNotIn('note', order)
+        self.assertIn('customer_name', order)
+
+        with CaptureQueriesContext(connection) as queries:
+            order = self.client.get('/api/orders/?compact=1&expand=items').json()['results'][0]
+        self.assertEqual(len(order['items']), 3)
+        self.assertNotIn('note', order)
+        self.assertEqual(len(queries), 2)
+
+    def test_filters(self):
+        response = self.client.get('/api/orders/?city=Dhaka&compact=1')
+        results = response.json()['results']
+        self.assertEqual(len(results), 2)
+        self.assertNotIn('items', results[0])
+
+        response = self.client.get('/api/orders/?city=dhaka')
+        self.assertEqual(len(response.json()['results']), 2)
+
+        response = self.client.get('/api/orders/?is_paid=true')
+        self.assertEqual(len(response.json()['results']), 1)
+
+        response = self.client.get('/api/orders/?status=unknown')
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderExportTest(TestCase):
+
+    def setUp(self):
+        self.orders = []
+        for i in range(5):
+            order = Order.objects.create(
+                customer_name=f'Customer {i}', customer_email='test@example.com',
+                customer_phone='01700000000', shipping_address='Road 1, "House 2"',
+                city='Dhaka', payment_method='cod', total_amount=100,
+                status='delivered' if i % 2 else 'pending')
+            for j in range(2):
+                OrderItem.objects.create(
+                    order=order, product_name=f'Item {j}', product_price=50, quantity=1)
+            self.orders.append(order)
+        User.objects.create_user('finance', password='secret', is_staff=True)
+
+    def stream(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get('/api/orders/export.csv').status_code, 403)
+
+    def test_csv_streams_one_row_per_item(self):
+        self.client.login(username='finance', password='secret')
+        rows = list(csv.DictReader(io.StringIO(self.stream('/api/orders/export.csv'))))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]['order_id'], str(self.orders[0].id))
+        self.assertEqual(rows[0]['shipping_address'], 'Road 1, "House 2"')
+        self.assertEqual(rows[1]['item_product_name'], 'Item 1')
+
+    def test_ndjson_filter_and_resume(self):
+        self.client.login(username='finance', password='secret')
+        lines = self.stream(
+            f'/api/orders/export.ndjson?status=delivered&after_id={self.orders[1].id}'
+        ).splitlines()
+        orders = [json.loads(line) for line in lines]
+        self.assertEqual([order['id'] for order in orders], [self.orders[3].id])
+        self.assertEqual(len(orders[0]['items']), 2)
+
+    def test_command_chunks_and_resumes(self):
+        output = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('export_orders', format='ndjson', chunk_size=2,
+                         after_id=self.orders[0].id, stdout=output, stderr=io.StringIO())
+        ids = [json.loads(line)['id'] for line in output.getvalue().splitlines()]
+        self.assertEqual(ids, [order.id for order in self.orders[1:]])
+        # 2 টা করে chunk: প্রতি chunk এ orders + items, শেষে একটা খালি chunk
+        self.assertEqual(len(queries), 5)
+
+
+class ConcurrentCheckoutTest(TransactionTestCase):
+    """একসাথে অনেক checkout: stock কখনো negative হবে না, oversell হবে না"""
+
+    STOCK = 5
+    CUSTOMERS = 20
+
+    def test_concurrent_checkout_never_oversells(self):
+        category = Category.objects.create(name='Makeup')
+        product = Product.objects.create(
+            name='Sale Lipstick', description='Limited stock',
+            price=300, category=category, stock=self.CUSTOMERS)
+
+        clients = [Client() for _ in range(self.CUSTOMERS)]
+        for client in clients:
+            add_to_cart(client, product)
+
+        # Reservation expire হয়ে গেছে আর stock কমে গেছে: সবাই একই stock এর জন্য race করবে
+        StockReservation.objects.all().delete()
+        Product.objects.filter(id=product.id).update(stock=self.STOCK, reserved=0)
+
+        barrier = threading.Barrier(self.CUSTOMERS)
+        statuses = []
+
+        def run(client):
+            try:
+                barrier.wait()
+                statuses.append(checkout(client).status_code)
+            except Exception:
+                # যেমন database lock: নিচে None থাকলে test fail করবে
+                statuses.append(None)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(c,)) for c in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        product.refresh_from_db()
+        sold = sum(OrderItem.objects.filter(
+            product=product).values_list('quantity', flat=True))
+
+        self.assertGreaterEqual(product.stock, 0)
+        self.assertEqual(sold + product.stock, self.STOCK)
+        self.assertEqual(sold, Order.objects.count())
+        # প্রত্যেক customer উত্তর পায়: ঠিক STOCK জন order পায়, বাকিরা out of stock
+        self.assertEqual(
+            Counter(statuses), {201: self.STOCK, 400: self.CUSTOMERS - self.STOCK})
+
+
+class OrderAdminTest(TestCase):
+    DATES = [
+        datetime(2024, 3, 5, 10, tzinfo=timezone.utc),
+        datetime(2024, 3, 5, 23, tzinfo=timezone.utc),
+        datetime(2024, 3, 28, tzinfo=timezone.utc),
+        datetime(2024, 11, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 31, 23, 59, tzinfo=timezone.utc),
+        datetime(2026, 6, 15, tzinfo=timezone.utc),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        product = Product.objects.create(
+            name='Lipstick', description='Red', price=50,
+            category=Category.objects.create(name='Makeup'))
+        for i, created_at in enumerate(self.DATES):
+            order = Order.objects.create(
+                customer_name='Test Customer', customer_email='test@example.com',
+                customer_phone='01700000000', shipping_address='Road 1',
+                city=['Dhaka', 'Khulna', 'Sylhet'][i % 3], payment_method='cod',
+                total_amount=100)
+            Order.objects.filter(pk=order.pk).update(created_at=created_at)
+            for _ in range(3):
+                OrderItem.objects.create(
+                    order=order, product=product, product_name='Lipstick',
+                    product_price=50, quantity=1)
+        self.order = order
+
+    def test_indexed_datetimes_match_django(self):
+        queryset = Order.objects.all()
+        indexed = queryset._chain()
+        indexed.__class__ = IndexedDateQuerySet
+        for kind, lookups in [('year', {}), ('month', {'created_at__year': 2024}),
+                              ('day', {'created_at__year': 2024, 'created_at__month': 3})]:
+            self.assertEqual(
+                list(indexed.filter(**lookups).datetimes('created_at', kind)),
+                list(queryset.filter(**lookups).datetimes('created_at', kind)), kind)
+        self.assertEqual(list(indexed.filter(city='Paris').datetimes('created_at', 'year')), [])
+
+    def test_changelist_date_hierarchy(self):
+        url = '/admin/orders/order/'
+        response = self.client.get(url)
+        self.assertContains(response, '?created_at__year=2025')
+        response = self.client.get(url, {'created_at__year': 2024})
+        self.assertContains(response, 'created_at__month=11')
+        self.assertEqual(len(response.context['cl'].result_list), 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'created_at__year': 2024, 'created_at__month': 3})
+        self.assertContains(response, 'created_at__day=28')
+        self.assertFalse([query for query in queries if 'DISTINCT' in query['sql']])
+
+    def test_city_filter_is_cached(self):
+        url = '/admin/orders/order/'
+        self.assertContains(self.client.get(url), '?city__exact=Sylhet')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'city__exact': 'Khulna'})
+        self.assertFalse([query for query in queries if 'DISTINCT' in query['sql']])
+        self.assertEqual(
+            [order.city for order in response.context['cl'].result_list], ['Khulna', 'Khulna'])
+
+    def test_estimated_count(self):
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 2), \
+                mock.patch.object(EstimatedCountPaginator, 'SAMPLE_SIZE', 4):
+            # শেষের 4 টা id এর 3 টা match করে -> 6 * 3/4 ≈ 4
+            paginator = EstimatedCountPaginator(Order.objects.exclude(city='Khulna'), 1)
+            self.assertEqual(paginator.count, 4)
+            paginator = EstimatedCountPaginator(Order.objects.filter(city='Khulna'), 1)
+            self.assertEqual(paginator.count, 2)
+        self.assertEqual(EstimatedCountPaginator(Order.objects.all(), 1).count, 6)
+
+    def test_estimated_count_never_cuts_off_pages(self):
+        oldest = list(Order.objects.order_by('id').values_list('id', flat=True)[:3])
+        Order.objects.filter(id__in=oldest).update(status='delivered')
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 1), \
+                mock.patch.object(EstimatedCountPaginator, 'SAMPLE_SIZE', 3):
+            # শেষের 3 টা id এ কোনো match নেই -> exact count
+            paginator = EstimatedCountPaginator(Order.objects.filter(status='delivered'), 1)
+            self.assertEqual(paginator.count, 3)
+
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 2), \
+                mock.patch.object(EstimatedCountPaginator, 'SAMPLE_SIZE', 4):
+            # শেষের 4 টার 2 টা match -> 6 * 2/4 = 3, আসলে 4
+            queryset = Order.objects.filter(city__in=['Dhaka', 'Khulna']).order_by('id')
+            paginator = EstimatedCountPaginator(queryset, 1)
+            self.assertEqual(paginator.num_pages, 3)
+            seen, number = [], 1
+            while True:
+                page = paginator.page(number)
+                seen.extend(order.id for order in page)
+                if not page.has_next():
+                    break
+                number += 1
+        self.assertEqual(seen, list(queryset.values_list('id', flat=True)))
+
+    def test_change_page_items(self):
+        url = f'/admin/orders/order/{self.order.id}/change/'
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, 'Lipstick')
+        product_queries = [
+            query for query in queries if query['sql'].startswith('SELECT')
+            and 'FROM "products_product"' in query['sql']]
+        self.assertEqual(product_queries, [])
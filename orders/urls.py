@@ -6,6 +6,7 @@ from . import views
 urlpatterns = [
     path('', views.order_list, name='order-list'),
     path('create/', views.create_order, name='create-order'),
+    path('export.<slug:file_format>', views.export_orders, name='order-export'),
     path('<int:order_id>/', views.order_detail, name='order-detail'),
     path('track/<int:order_id>/', views.track_order, name='track-order'),
 ]
\ No newline at end of file
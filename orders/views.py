@@ -1,24 +1,37 @@
 # orders/views.py
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import transaction
 
+from . import export
+from .checkout import OutOfStockError, place_order
+from .filters import filter_orders
 from .models import Order, OrderItem
-from .serializers import OrderSerializer, CreateOrderSerializer
-from cart.models import Cart, CartItem
+from .pagination import OrderCursorPagination
+from .serializers import (
+    OrderSerializer, CreateOrderSerializer, OrderFilterSerializer, OrderExportSerializer,
+)
+from cart.storage import get_cart_store
+from glamgirl.db import replica_reads
 
 
-def get_cart_by_session(request):
-    """Session থেকে cart নিয়ে আসো"""
-    session_key = request.session.session_key
-    if not session_key:
-        return None
-    try:
-        return Cart.objects.get(session_key=session_key)
-    except Cart.DoesNotExist:
-        return None
+def order_queryset(serializer):
+    """
+    Serializer যা দেখাবে শুধু সেটুকু load করো (?fields= / ?compact=1)
+    Items চাইলে সব order এর items এক query তে prefetch হয়
+    """
+    queryset = Order.objects.defer(*serializer.deferred_fields())
+    items_field = serializer.fields.get('items')
+    if items_field is not None:
+        queryset = queryset.prefetch_related(Prefetch(
+            'items',
+            queryset=OrderItem.objects.defer(*items_field.child.deferred_fields()),
+        ))
+    return queryset
 
 
 @csrf_exempt
@@ -33,58 +46,28 @@ def create_order(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    # Cart নিয়ে আসো
-    cart = get_cart_by_session(request)
+    # Cart নিয়ে আসো (cache store হলে আগে DB তে flush হবে)
+    store = get_cart_store(request)
+    cart = store.get_checkout_cart()
     if not cart or not cart.items.exists():
         return Response(
             {'error': 'Cart is empty'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Stock check করো
-    for item in cart.items.all():
-        if item.product.stock < item.quantity:
-            return Response(
-                {'error': f'Not enough stock for {item.product.name}'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-    # Transaction দিয়ে order create করো (একসাথে সব হবে অথবা কিছুই হবে না)
-    with transaction.atomic():
-        # Order create করো
-        order = Order.objects.create(
-            customer_name=serializer.validated_data['customer_name'],
-            customer_email=serializer.validated_data['customer_email'],
-            customer_phone=serializer.validated_data['customer_phone'],
-            shipping_address=serializer.validated_data['shipping_address'],
-            city=serializer.validated_data['city'],
-            postal_code=serializer.validated_data.get('postal_code', ''),
-            payment_method=serializer.validated_data['payment_method'],
-            note=serializer.validated_data.get('note', ''),
-            total_amount=cart.get_total(),
-            shipping_cost=60 if serializer.validated_data['city'].lower(
-            ) != 'dhaka' else 0,
+    # Order তৈরি করো: stock lock, bulk insert, conditional decrement (একসাথে সব হবে অথবা কিছুই হবে না)
+    try:
+        order = place_order(cart, serializer.validated_data)
+    except OutOfStockError as error:
+        return Response(
+            {'error': str(error)},
+            status=status.HTTP_400_BAD_REQUEST
         )
 
-        # Order items create করো ও stock কমাও
-        for cart_item in cart.items.all():
-            OrderItem.objects.create(
-                order=order,
-                product=cart_item.product,
-                product_name=cart_item.product.name,
-                product_price=cart_item.product.price,
-                quantity=cart_item.quantity,
-            )
-
-            # Stock কমাও
-            cart_item.product.stock -= cart_item.quantity
-            cart_item.product.save()
-
-        # Cart clear করো
-        cart.items.all().delete()
+    store.checkout_complete()
 
     # Response দাও
-    order_serializer = OrderSerializer(order)
+    order_serializer = OrderSerializer(order, context={'request': request})
     return Response({
         'message': 'Order placed successfully!',
         'order': order_serializer.data
@@ -97,33 +80,71 @@ def order_detail(request, order_id):
     📄 Order details দেখাও
     GET /api/orders/<order_id>/
     """
+    serializer = OrderSerializer(context={'request': request})
     try:
-        order = Order.objects.get(id=order_id)
+        order = order_queryset(serializer).get(id=order_id)
     except Order.DoesNotExist:
         return Response(
             {'error': 'Order not found'},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = OrderSerializer(order)
+    serializer.instance = order
     return Response(serializer.data)
 
 
 @api_view(['GET'])
 def order_list(request):
     """
-    📋 সব orders দেখাও (Admin এর জন্য)
-    GET /api/orders/
+    📋 সব orders দেখাও (Admin এর জন্য, filter ও cursor pagination সহ)
+    GET /api/orders/?status=&payment_method=&city=&is_paid=&created_after=&created_before=&cursor=
     """
-    orders = Order.objects.all()
-    serializer = OrderSerializer(orders, many=True)
-    return Response(serializer.data)
+    params = OrderFilterSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    filters = params.validated_data
+
+    context = {'request': request}
+    orders = filter_orders(order_queryset(OrderSerializer(context=context)), filters)
+
+    paginator = OrderCursorPagination()
+    page = paginator.paginate_queryset(orders, request)
+    serializer = OrderSerializer(page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_orders(request, file_format):
+    """
+    📤 Orders ও তাদের items stream করে export করো (Finance এর জন্য, staff only)
+    GET /api/orders/export.csv?status=&created_after=&created_before=&after_id=
+    GET /api/orders/export.ndjson?...
+    """
+    if file_format not in export.FORMATS:
+        return Response(
+            {'error': f'Unsupported format: {file_format}'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    params = OrderExportSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    filters = params.validated_data
+
+    orders = export.iter_orders(filters, after_id=filters['after_id'])
+    response = StreamingHttpResponse(
+        export.export_lines(file_format, orders),
+        content_type=export.CONTENT_TYPES[file_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="orders.{file_format}"'
+    return response
 
 
+@replica_reads
 @api_view(['GET'])
 def track_order(request, order_id):
     """
-    🚚 Order track করো
+    🚚 Order track করো (polling হয়, তাই read replica থেকে;
+    নিজের order দেওয়ার পরপরই session pinned থাকে)
     GET /api/orders/track/<order_id>/
     """
     try:
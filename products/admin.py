@@ -1,4 +1,6 @@
 from django.contrib import admin
+from glamgirl.changelist import ScalableAdminMixin
+from . import search
 from .models import Category, Product
 
 
@@ -9,9 +11,30 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'price',
+class ProductAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ['name', 'sku', 'category', 'price',
                     'stock', 'is_active', 'created_at']
     list_filter = ['category', 'is_active']
+    list_select_related = ['category']
+    # Inlines (cart/order items) product বেছে নেয় autocomplete দিয়ে, এটা লাগে
     search_fields = ['name', 'description']
     list_editable = ['price', 'stock', 'is_active']
+
+    def get_search_results(self, request, queryset, search_term):
+        # FTS5 index থাকলে LIKE '%...%' scan এর বদলে index ব্যবহার করো
+        if search_term and search.fts_available():
+            if not search.tokenize(search_term):
+                return queryset.none(), False
+            return queryset.filter(id__in=search.fts_match_ids(search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def save_model(self, request, obj, form, change):
+        # `reserved` cart reservation এর running total, `renditions` background এ
+        # update হয় — admin এর পুরনো copy দিয়ে overwrite করো না
+        if change:
+            obj.save(update_fields=[
+                field.name for field in obj._meta.concrete_fields
+                if not field.primary_key and field.name not in ('reserved', 'renditions')
+            ])
+        else:
+            obj.save()
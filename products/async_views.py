@@ -0,0 +1,86 @@
+"""
+Catalog read API এর async version (settings.ASYNC_VIEWS, glamgirl.async_urls)
+
+views.py এর মতোই response: একই serializers, filter, cursor pagination ও
+catalog cache, শুধু database/cache async API দিয়ে পড়া হয়। Search এখনও
+sync view (FTS raw cursor)।
+"""
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from rest_framework.response import Response
+
+from glamgirl.async_api import async_api_view
+from glamgirl.db import replica_reads
+from .cache import acached_catalog_response
+from .facets import acatalog_facets
+from .models import Category, Product
+from .pagination import ProductCursorPagination
+from .serializers import CategorySerializer, ProductSerializer
+from .views import filter_products, list_deferred_fields
+
+
+async def paginated_products(request, queryset):
+    """ProductListView এর মতো ?fields= defer, filter ও cursor page"""
+    context = {'request': request}
+    queryset = filter_products(
+        queryset.select_related('category').defer(
+            *list_deferred_fields(ProductSerializer(context=context))),
+        request.query_params)
+
+    # DRF pagination নিজেই query চালায়: async ORM এর মতো এক বার thread এ
+    paginator = ProductCursorPagination()
+    page = await sync_to_async(paginator.paginate_queryset)(queryset, request)
+    serializer = ProductSerializer(page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def category_list(request):
+    """সব Categories দেখাও (CategoryListView)"""
+    async def build():
+        categories = [category async for category in Category.objects.all()]
+        return Response(CategorySerializer(
+            categories, many=True, context={'request': request}).data)
+    return await acached_catalog_response(request, build)
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def product_list(request):
+    """সব Products দেখাও (ProductListView)"""
+    return await acached_catalog_response(request, lambda: paginated_products(
+        request, Product.objects.filter(is_active=True)))
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def products_by_category(request, category_id):
+    """Category অনুযায়ী Products দেখাও (views.products_by_category)"""
+    return await acached_catalog_response(request, lambda: paginated_products(
+        request, Product.objects.filter(category_id=category_id, is_active=True)))
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def product_detail(request, pk):
+    """একটা Product এর details দেখাও (ProductDetailView)"""
+    async def build():
+        context = {'request': request}
+        serializer = ProductSerializer(context=context)
+        serializer.instance = await aget_object_or_404(
+            Product.objects.filter(is_active=True).select_related('category').defer(
+                *serializer.deferred_fields()),
+            pk=pk)
+        return Response(serializer.data)
+    return await acached_catalog_response(request, build)
+
+
+@replica_reads
+@async_api_view(['GET'])
+async def product_facets(request):
+    """Category counts ও price histogram (views.product_facets)"""
+    async def build():
+        return Response(await acatalog_facets())
+    return await acached_catalog_response(request, build)
@@ -0,0 +1,132 @@
+"""
+Catalog response cache
+
+Serialized catalog responses Django cache এ রাখা হয়। প্রতিটা key তে catalog
+version থাকে; Product/Category save বা delete হলে version বাড়ে (signals.py),
+ফলে পুরনো সব key একসাথে invalid হয়ে যায় — আলাদা করে delete করতে হয় না।
+
+Replica থেকে পড়া view এ version বাড়ার পরে REPLICA_PIN_SECONDS পর্যন্ত replica
+তে নতুন data না-ও থাকতে পারে; সেই সময়ের cache miss primary থেকে build হয়, না
+হলে পুরনো data নতুন version এ CATALOG_CACHE_TIMEOUT পর্যন্ত cache থেকে যেত।
+
+Product এর `stock` cached response থেকে না, serve করার সময় stock.py এর
+per-product keys থেকে বসে; তাই checkout এ পুরো catalog invalidate হয় না।
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from glamgirl.db import primary_reads
+from . import stock
+
+VERSION_KEY = 'catalog:version'
+# শেষবার কখন version বাড়ল (time.time())
+BUMPED_AT_KEY = 'catalog:bumped_at'
+
+
+def get_catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # প্রথমবার (বা cache clear হলে) version শুরু করো
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key নেই: নতুন version দিয়ে শুরু করো
+        cache.set(VERSION_KEY, 2, timeout=None)
+    cache.set(BUMPED_AT_KEY, time.time(), timeout=None)
+
+
+def _recently_bumped(bumped_at):
+    """Replica তে হয়তো এখনো শেষ version এর writes পৌঁছায়নি"""
+    return bumped_at is not None and time.time() - bumped_at < settings.REPLICA_PIN_SECONDS
+
+
+async def aget_catalog_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, timeout=None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+
+def _digest(parts):
+    raw = ':'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def catalog_cache_key(*parts, version=None):
+    return f'catalog:{version or get_catalog_version()}:{_digest(parts)}'
+
+
+async def acatalog_cache_key(*parts, version=None):
+    return f'catalog:{version or await aget_catalog_version()}:{_digest(parts)}'
+
+
+def cached_catalog_response(request, build_response):
+    """
+    Cache এ থাকলে সেখান থেকে response দাও (live stock সহ), না থাকলে build
+    করে cache করো; শুধু 200 response cache হয়
+    """
+    version = get_catalog_version()
+    key = catalog_cache_key(request.get_host(), request.get_full_path(), version=version)
+    data = cache.get(key)
+    if data is not None:
+        return Response(stock.overlay(data, version))
+
+    if _recently_bumped(cache.get(BUMPED_AT_KEY)):
+        with primary_reads():
+            response = build_response()
+    else:
+        response = build_response()
+    if response.status_code == 200:
+        cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        stock.remember(response.data, version)
+    return response
+
+
+async def acached_catalog_response(request, build_response):
+    """cached_catalog_response এর async version (build_response একটা coroutine function)"""
+    version = await aget_catalog_version()
+    key = await acatalog_cache_key(
+        request.get_host(), request.get_full_path(), version=version)
+    data = await cache.aget(key)
+    if data is not None:
+        return Response(await stock.aoverlay(data, version))
+
+    if _recently_bumped(await cache.aget(BUMPED_AT_KEY)):
+        with primary_reads():
+            response = await build_response()
+    else:
+        response = await build_response()
+    if response.status_code == 200:
+        await cache.aset(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        await stock.aremember(response.data, version)
+    return response
+
+
+def catalog_cached(view_func):
+    """Function based catalog API view এর জন্য decorator"""
+    @wraps(view_func)
+    def wrapped(request, *args, **kwargs):
+        return cached_catalog_response(
+            request, lambda: view_func(request, *args, **kwargs))
+    return wrapped
+
+
+class CatalogCacheMixin:
+    """Generic catalog API view এর জন্য mixin"""
+
+    def get(self, request, *args, **kwargs):
+        return cached_catalog_response(
+            request, lambda: super(CatalogCacheMixin, self).get(request, *args, **kwargs))
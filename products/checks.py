@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Catalog version (products.cache) cache এ থাকে: LocMemCache এ সেটা প্রতিটা
+    process এর নিজের, তাই অন্য process এর save/import/job এ cache invalid হয় না
+    """
+    if settings.CACHES.get('default', {}).get('BACKEND') != LOCMEM:
+        return []
+    return [Warning(
+        'The default cache is LocMemCache, which is not shared between processes.',
+        hint='Catalog cache invalidation from other workers, run_worker or '
+             'import_catalog will not reach this process; use FileBasedCache or Redis.',
+        id='products.W001',
+    )]
@@ -0,0 +1,87 @@
+"""
+Catalog facets: category অনুযায়ী product counts ও price histogram
+
+Products page এর filters এর জন্য — সব active product client এ না এনে
+একটা grouped query তে (Category LEFT JOIN Product, GROUP BY category)
+প্রতিটা category এর active, in-stock ও price bucket counts গোনা হয়।
+Response টা বাকি catalog API এর মতো catalog version দিয়ে cache হয়
+(cache.py), তাই Product/Category বদলালে বা কোনো product in/out of stock
+হলে (checkout, cart reservation — stock.py) নতুন করে গোনা হয়।
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, F, Q
+
+from .models import Category
+
+# Products page এর price filter; min/max ProductFilterSerializer এর
+# min_price/max_price এর মতো inclusive, তাই count ও filter result মেলে
+PRICE_BUCKETS = [
+    {'key': 'under_500', 'label': 'Under ৳500', 'min_price': None, 'max_price': '499.99'},
+    {'key': '500_1000', 'label': '৳500 - ৳1000', 'min_price': '500.00', 'max_price': '1000.00'},
+    {'key': 'over_1000', 'label': 'Above ৳1000', 'min_price': '1000.01', 'max_price': None},
+]
+
+
+def bucket_filter(bucket):
+    condition = Q(products__is_active=True)
+    if bucket['min_price'] is not None:
+        condition &= Q(products__price__gte=Decimal(bucket['min_price']))
+    if bucket['max_price'] is not None:
+        condition &= Q(products__price__lte=Decimal(bucket['max_price']))
+    return condition
+
+
+def facet_queryset():
+    """প্রতি category একটা row: products, in_stock ও bucket_<key> counts"""
+    active = Q(products__is_active=True)
+    return Category.objects.annotate(
+        product_count=Count('products', filter=active),
+        in_stock_count=Count('products', filter=active & Q(products__stock__gt=F('products__reserved'))),
+        **{
+            f"bucket_{bucket['key']}": Count('products', filter=bucket_filter(bucket))
+            for bucket in PRICE_BUCKETS
+        },
+    ).values('id', 'name', 'product_count', 'in_stock_count',
+             *(f"bucket_{bucket['key']}" for bucket in PRICE_BUCKETS))
+
+
+def facet(products, in_stock, bucket_counts):
+    return {
+        'products': products,
+        'in_stock': in_stock,
+        'price_buckets': [
+            {**bucket, 'count': count}
+            for bucket, count in zip(PRICE_BUCKETS, bucket_counts)
+        ],
+    }
+
+
+def build_facets(rows):
+    """Grouped rows থেকে response: সব category মিলিয়ে total সহ"""
+    categories = []
+    total_products = total_in_stock = 0
+    total_buckets = [0] * len(PRICE_BUCKETS)
+    for row in rows:
+        bucket_counts = [row[f"bucket_{bucket['key']}"] for bucket in PRICE_BUCKETS]
+        categories.append({
+            'id': row['id'],
+            'name': row['name'],
+            **facet(row['product_count'], row['in_stock_count'], bucket_counts),
+        })
+        total_products += row['product_count']
+        total_in_stock += row['in_stock_count']
+        total_buckets = [total + count for total, count in zip(total_buckets, bucket_counts)]
+    return {
+        'total': facet(total_products, total_in_stock, total_buckets),
+        'categories': categories,
+    }
+
+
+def catalog_facets():
+    return build_facets(facet_queryset())
+
+
+async def acatalog_facets():
+    return build_facets([row async for row in facet_queryset()])
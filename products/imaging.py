@@ -0,0 +1,50 @@
+"""
+Product image resize (শুধু Pillow, Django import নেই)
+
+এই function গুলো renditions.py এর process pool এ চলে — তাই module টা
+Django setup ছাড়াই import করা যায়, আর input/output শুধু bytes।
+"""
+
+import io
+
+from PIL import Image, ImageOps
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def target_widths(original_width, widths):
+    """Upscale করো না; ছবি সব width এর চেয়ে ছোট হলে নিজের width এ একটা"""
+    usable = sorted(width for width in widths if width < original_width)
+    return usable or [original_width]
+
+
+def render(data, widths):
+    """
+    Image bytes থেকে প্রতিটা width ও format এর rendition বানাও
+    Return: {(width, extension): bytes}
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    results = {}
+    for width in target_widths(image.width, widths):
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, (format_name, options) in FORMATS.items():
+            output = resized
+            if format_name == 'JPEG' and output.mode == 'RGBA':
+                # JPEG এ transparency নেই: সাদা background এ বসাও
+                background = Image.new('RGB', output.size, (255, 255, 255))
+                background.paste(output, mask=output.getchannel('A'))
+                output = background
+            buffer = io.BytesIO()
+            output.save(buffer, format_name, **options)
+            results[(width, extension)] = buffer.getvalue()
+    return results
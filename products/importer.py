@@ -0,0 +1,296 @@
+"""
+Catalog bulk import (CSV / NDJSON)
+
+Supplier feed এর file row by row stream করে পড়া হয় আর chunk ধরে লেখা হয়,
+তাই লাখ লাখ row এও memory flat থাকে। প্রতিটা chunk একটা transaction:
+
+- Category name -> id একটা in-memory map থেকে; নতুন নাম হলে bulk_create
+- Chunk এর sku গুলোর বর্তমান values এক query তে এনে content hash মেলানো হয়;
+  কিছু না বদলালে row skip (nightly feed এর বেশিরভাগ row এমন)
+- বাকিগুলো একটা INSERT ... ON CONFLICT(sku) DO UPDATE (bulk_create upsert)
+
+Product signals bulk query তে চলে না: FTS index trigger দিয়ে sync থাকে
+(search.py), catalog cache version প্রতি chunk commit এর পরে বাড়ানো হয়।
+`reserved`, `renditions` ও image import এ হাত দেওয়া হয় না; file এর stock
+বর্তমান reserved এর কম হলে reserved পর্যন্ত তোলা হয় (stats['clamped'])।
+
+Product columns: sku, name, description, price, category, stock, is_active
+Category columns: name, description
+"""
+
+import csv
+import hashlib
+import json
+import os
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+
+from .cache import bump_catalog_version
+from .models import Category, Product
+
+FORMATS = ('csv', 'ndjson')
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+PRODUCT_FIELDS = ['name', 'description', 'price', 'category_id', 'stock', 'is_active']
+# Upsert এ conflict হলে এগুলো overwrite হয় (created_at, reserved, image নয়)
+UPDATE_FIELDS = PRODUCT_FIELDS + ['updated_at']
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+
+class RowError(ValueError):
+    """একটা row import করা যায়নি (row skip হয়, import চলতে থাকে)"""
+
+
+def detect_format(path):
+    file_format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        raise ValueError(f'{path}: format বোঝা যাচ্ছে না, --format দাও')
+    return file_format
+
+
+def read_rows(stream, file_format):
+    """(line number, dict) yield করো — file কখনো পুরোটা memory তে আসে না"""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                yield line_number, RowError(f'invalid JSON: {error}')
+                continue
+            yield line_number, row
+
+
+def open_rows(path, file_format=None):
+    """File path থেকে rows (format না দিলে extension দেখে)"""
+    file_format = file_format or detect_format(path)
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        yield from read_rows(stream, file_format)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _text(row, name, max_length=None, required=True):
+    value = row.get(name)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f'{name}: required')
+    if max_length and len(value) > max_length:
+        raise RowError(f'{name}: {max_length} অক্ষরের বেশি')
+    return value
+
+
+def _price(value):
+    try:
+        price = Decimal(str(value).strip()).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise RowError(f'price: invalid ({value!r})') from None
+    if price < 0 or price.adjusted() >= 8:
+        raise RowError(f'price: invalid ({value!r})')
+    return price
+
+
+def _stock(value):
+    if value in (None, ''):
+        return 0
+    try:
+        stock = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'stock: invalid ({value!r})') from None
+    if stock < 0:
+        raise RowError(f'stock: invalid ({value!r})')
+    return stock
+
+
+def _bool(value, default=True):
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(f'is_active: invalid ({value!r})')
+
+
+def parse_product(row):
+    """File row -> (sku, values, category name); ভুল থাকলে RowError"""
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError('row একটা object হতে হবে')
+    values = {
+        'name': _text(row, 'name', max_length=200),
+        'description': _text(row, 'description', required=False),
+        'price': _price(row.get('price')),
+        'stock': _stock(row.get('stock')),
+        'is_active': _bool(row.get('is_active')),
+    }
+    return (_text(row, 'sku', max_length=64), values,
+            _text(row, 'category', max_length=100))
+
+
+def content_hash(values):
+    """Product এর import করা fields এর hash (file row বা database row)"""
+    raw = json.dumps([
+        values['name'], values['description'],
+        str(Decimal(values['price']).quantize(Decimal('0.01'))),
+        values['category_id'], values['stock'], bool(values['is_active']),
+    ])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+class CategoryMap:
+    """Category name -> id (একই নামে একাধিক থাকলে পুরনোটা)"""
+
+    def __init__(self):
+        self.ids = {}
+        for category_id, name in Category.objects.order_by('id').values_list('id', 'name'):
+            self.ids.setdefault(name, category_id)
+
+    def resolve(self, names):
+        """নেই এমন নামগুলো তৈরি করো; transaction এর ভেতরে ডাকো"""
+        missing = sorted(set(names) - self.ids.keys())
+        if missing:
+            for category in Category.objects.bulk_create(
+                    [Category(name=name) for name in missing]):
+                self.ids[category.name] = category.id
+        return self.ids
+
+    def forget(self, names):
+        """Rollback হওয়া transaction এ তৈরি categories map থেকে সরাও"""
+        for name in names:
+            self.ids.pop(name, None)
+
+
+def new_stats():
+    return {'rows': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'clamped': 0}
+
+
+def import_products(rows, categories=None, chunk_size=1000, on_error=None, on_chunk=None):
+    """
+    (line number, row) গুলো chunk ধরে upsert করো
+    on_error(line, message) প্রতিটা skip করা row এ, on_chunk(stats) প্রতি chunk এর পরে
+    """
+    categories = categories or CategoryMap()
+    stats = new_stats()
+    for chunk in chunked(rows, chunk_size):
+        stats['rows'] += len(chunk)
+        parsed = {}
+        for line_number, row in chunk:
+            try:
+                sku, values, category = parse_product(row)
+            except RowError as error:
+                stats['skipped'] += 1
+                if on_error:
+                    on_error(line_number, str(error))
+                continue
+            if sku in parsed:
+                # একই chunk এ একই sku: শেষেরটা থাকে
+                stats['skipped'] += 1
+            parsed[sku] = (values, category)
+
+        if parsed:
+            write_products(parsed, categories, stats)
+        if on_chunk:
+            on_chunk(stats)
+    return stats
+
+
+def write_products(parsed, categories, stats):
+    """একটা chunk: categories, বদলানো rows বাছাই ও upsert — এক transaction এ"""
+    names = {category for _, category in parsed.values()}
+    known = set(categories.ids)
+    try:
+        with transaction.atomic():
+            category_ids = categories.resolve(names)
+            existing = {
+                row['sku']: row for row in Product.objects.filter(
+                    sku__in=list(parsed)).values('sku', 'reserved', *PRODUCT_FIELDS)
+            }
+            products = []
+            for sku, (values, category) in parsed.items():
+                values['category_id'] = category_ids[category]
+                current = existing.get(sku)
+                if current is not None and values['stock'] < current['reserved']:
+                    # Cart এ ধরে রাখা units এর চেয়ে কম stock হলে checkout আটকে যেত
+                    values['stock'] = current['reserved']
+                    stats['clamped'] += 1
+                if current is not None and content_hash(current) == content_hash(values):
+                    stats['unchanged'] += 1
+                    continue
+                stats['updated' if current is not None else 'created'] += 1
+                products.append(Product(sku=sku, **values))
+
+            if products:
+                Product.objects.bulk_create(
+                    products, update_conflicts=True,
+                    unique_fields=['sku'], update_fields=UPDATE_FIELDS)
+                transaction.on_commit(bump_catalog_version)
+    except Exception:
+        categories.forget(names - known)
+        raise
+
+
+def import_categories(rows, categories=None, chunk_size=1000, on_error=None, on_chunk=None):
+    """Category rows name দিয়ে upsert করো (description বদলালে bulk_update)"""
+    categories = categories or CategoryMap()
+    stats = new_stats()
+    for chunk in chunked(rows, chunk_size):
+        stats['rows'] += len(chunk)
+        parsed = {}
+        for line_number, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                if not isinstance(row, dict):
+                    raise RowError('row একটা object হতে হবে')
+                name = _text(row, 'name', max_length=100)
+                parsed[name] = _text(row, 'description', required=False)
+            except RowError as error:
+                stats['skipped'] += 1
+                if on_error:
+                    on_error(line_number, str(error))
+
+        with transaction.atomic():
+            current = dict(Category.objects.filter(
+                id__in=[categories.ids[name] for name in parsed if name in categories.ids]
+            ).values_list('id', 'description'))
+            changed = []
+            for name, description in parsed.items():
+                category_id = categories.ids.get(name)
+                if category_id is None:
+                    continue
+                if current.get(category_id) == description:
+                    stats['unchanged'] += 1
+                else:
+                    changed.append(Category(id=category_id, name=name, description=description))
+            new = [Category(name=name, description=description)
+                   for name, description in parsed.items() if name not in categories.ids]
+            if changed:
+                Category.objects.bulk_update(changed, ['description'])
+            if new:
+                for category in Category.objects.bulk_create(new):
+                    categories.ids[category.name] = category.id
+            if changed or new:
+                transaction.on_commit(bump_catalog_version)
+        stats['updated'] += len(changed)
+        stats['created'] += len(new)
+        if on_chunk:
+            on_chunk(stats)
+    return stats
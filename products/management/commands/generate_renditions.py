@@ -0,0 +1,66 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from products import imaging
+from products.models import Product
+from products.renditions import is_current, read_image, save_renditions
+
+
+class Command(BaseCommand):
+    help = 'যেসব product image এর resized WebP/JPEG নেই সেগুলো process pool এ বানাও (backfill)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='আগে থেকে থাকলেও আবার বানাও (PRODUCT_IMAGE_WIDTHS বদলালে)')
+        parser.add_argument(
+            '--workers', type=int, default=settings.PRODUCT_IMAGE_WORKERS,
+            help='কয়টা process এ resize হবে')
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='একবারে কয়টা image memory তে পড়া হবে (default: workers x 4)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or options['workers'] * 4
+        products = (
+            Product.objects.exclude(image='').exclude(image__isnull=True)
+            .only('id', 'image', 'renditions').order_by('id')
+        )
+        done = skipped = failed = 0
+        last_id = 0
+        with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=multiprocessing.get_context('spawn')) as pool:
+            while True:
+                batch = list(products.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                pending = []
+                for product in batch:
+                    if is_current(product) and not options['force']:
+                        skipped += 1
+                        continue
+                    try:
+                        data = read_image(product)
+                    except OSError as error:
+                        self.stderr.write(f'Product {product.id}: {error}')
+                        failed += 1
+                        continue
+                    pending.append((product, pool.submit(
+                        imaging.render, data, settings.PRODUCT_IMAGE_WIDTHS)))
+
+                for product, future in pending:
+                    try:
+                        save_renditions(product.id, product.image.name, future.result())
+                        done += 1
+                    except Exception as error:
+                        self.stderr.write(f'Product {product.id}: {error}')
+                        failed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{done} generated, {skipped} already up to date, {failed} failed'))
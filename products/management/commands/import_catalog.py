@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importer import (
+    FORMATS, CategoryMap, detect_format, import_categories, import_products, open_rows)
+
+
+class Command(BaseCommand):
+    help = (
+        'Supplier feed (CSV / NDJSON) থেকে categories ও products bulk import করো। '
+        'Products sku দিয়ে upsert হয়, না বদলানো rows skip হয়; প্রতি chunk আলাদা transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'products', nargs='?',
+            help='Products file (sku, name, description, price, category, stock, is_active)')
+        parser.add_argument(
+            '--categories', help='Categories file (name, description), products এর আগে চলে')
+        parser.add_argument(
+            '--format', choices=FORMATS, dest='file_format',
+            help='না দিলে extension দেখে (.csv, .ndjson/.jsonl)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='প্রতি transaction এ কয়টা row')
+        parser.add_argument(
+            '--progress-every', type=int, default=10000,
+            help='কত row পর পর progress দেখাবে (0 হলে শুধু শেষে)')
+
+    def handle(self, *args, **options):
+        if not options['products'] and not options['categories']:
+            raise CommandError('Products file বা --categories দাও')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size অন্তত 1')
+
+        categories = CategoryMap()
+        if options['categories']:
+            self.run('categories', import_categories, options['categories'], categories, options)
+        if options['products']:
+            self.run('products', import_products, options['products'], categories, options)
+
+    def run(self, label, importer, path, categories, options):
+        try:
+            file_format = options['file_format'] or detect_format(path)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        start = time.monotonic()
+        every = options['progress_every']
+        reported = {'rows': 0}
+
+        def on_error(line_number, message):
+            self.stderr.write(self.style.WARNING(f'{path}:{line_number}: {message} (skipped)'))
+
+        def on_chunk(stats):
+            if every and stats['rows'] - reported['rows'] >= every:
+                reported['rows'] = stats['rows']
+                self.stdout.write(f'  {label}: {self.summary(stats, start)}')
+
+        try:
+            stats = importer(
+                open_rows(path, file_format), categories=categories,
+                chunk_size=options['chunk_size'], on_error=on_error, on_chunk=on_chunk)
+        except OSError as error:
+            raise CommandError(f'{path}: {error}')
+        self.stdout.write(self.style.SUCCESS(f'{label}: {self.summary(stats, start)}'))
+
+    def summary(self, stats, start):
+        elapsed = max(time.monotonic() - start, 1e-6)
+        summary = (
+            f"{stats['rows']} row(s) in {elapsed:.1f}s ({stats['rows'] / elapsed:.0f} rows/s): "
+            f"{stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['skipped']} skipped"
+        )
+        if stats['clamped']:
+            summary += f", {stats['clamped']} stock raised to reserved"
+        return summary
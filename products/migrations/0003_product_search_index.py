@@ -0,0 +1,72 @@
+# Product full-text search index (SQLite FTS5)
+
+from django.db import migrations
+
+FTS_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts USING fts5(
+        name, description,
+        content='products_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    # Product insert/update/delete হলে FTS index sync রাখো
+    """
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_ai
+    AFTER INSERT ON products_product BEGIN
+        INSERT INTO products_product_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_ad
+    AFTER DELETE ON products_product BEGIN
+        INSERT INTO products_product_fts(products_product_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_product_fts_au
+    AFTER UPDATE OF name, description ON products_product BEGIN
+        INSERT INTO products_product_fts(products_product_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_product_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    # আগের products index করো
+    "INSERT INTO products_product_fts(products_product_fts) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    'DROP TRIGGER IF EXISTS products_product_fts_ai',
+    'DROP TRIGGER IF EXISTS products_product_fts_ad',
+    'DROP TRIGGER IF EXISTS products_product_fts_au',
+    'DROP TABLE IF EXISTS products_product_fts',
+]
+
+
+def create_fts(apps, schema_editor):
+    # শুধু SQLite এ; অন্য backend এ search.py fallback ব্যবহার করবে
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
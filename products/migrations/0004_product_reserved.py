@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:30
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite এ field যোগ করতে Django table নতুন করে বানায় (copy + rename), তাতে
+# table এর FTS sync triggers মুছে যায়; AddField এর পরে আবার বানাও
+search_index = import_module('products.migrations.0003_product_search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='reserved',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(search_index.create_fts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:42
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# AddField SQLite এ table নতুন করে বানায়: FTS sync triggers আবার বানাও (0004 দেখো)
+search_index = import_module('products.migrations.0003_product_search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_reserved'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(search_index.create_fts, migrations.RunPython.noop),
+    ]
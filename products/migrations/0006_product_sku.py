@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:08
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite এ field যোগ করতে Django table নতুন করে বানায় (copy + rename), তাতে
+# table এর triggers মুছে যায়। Triggers আবার বানাও ও index rebuild করো (পরের
+# migrations এর জন্য post_migrate এ search.ensure_fts_triggers এটা করে)।
+search_index = import_module('products.migrations.0003_product_search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(search_index.create_fts, migrations.RunPython.noop),
+    ]
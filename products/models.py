@@ -13,15 +13,40 @@ class Category(models.Model):
 
 
 class Product(models.Model):
+    # Supplier এর product code; import_catalog এটা দিয়ে upsert করে
+    sku = models.CharField(max_length=64, unique=True, null=True, blank=True)
     name = models.CharField(max_length=200)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    # Resized WebP/JPEG files (products.renditions দেখো)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
     stock = models.PositiveIntegerField(default=0)
+    # Cart reservation এর running total (cart.reservations দেখো); available = stock - reserved
+    reserved = models.PositiveIntegerField(default=0, editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Product list এর filter/sort combination গুলোর জন্য composite index
+        indexes = [
+            models.Index(fields=['is_active', '-created_at', '-id'],
+                         name='product_active_newest_idx'),
+            models.Index(fields=['is_active', 'price', 'id'],
+                         name='product_active_price_idx'),
+            models.Index(fields=['is_active', 'name', 'id'],
+                         name='product_active_name_idx'),
+            models.Index(fields=['is_active', 'category', '-created_at', '-id'],
+                         name='product_cat_newest_idx'),
+            models.Index(fields=['is_active', 'category', 'price', 'id'],
+                         name='product_cat_price_idx'),
+        ]
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    @property
+    def available_stock(self):
+        return max(self.stock - self.reserved, 0)
\ No newline at end of file
@@ -0,0 +1,25 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for product lists.
+    `?sort=` অনুযায়ী ordering ঠিক হয়, প্রতিটা ordering এর জন্য Product এ index আছে
+    """
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    SORT_ORDERINGS = {
+        'newest': ('-created_at', '-id'),
+        'price_low': ('price', 'id'),
+        'price_high': ('-price', '-id'),
+        'name': ('name', 'id'),
+    }
+    ordering = SORT_ORDERINGS['newest']
+    # Cursor বানাতে এগুলো পড়া হয়, তাই defer করা যাবে না
+    ORDERING_FIELDS = {'created_at', 'price', 'name'}
+
+    def get_ordering(self, request, queryset, view):
+        sort = request.query_params.get('sort', 'newest')
+        return self.SORT_ORDERINGS.get(sort, self.ordering)
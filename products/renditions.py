@@ -0,0 +1,159 @@
+"""
+Product image renditions
+
+Upload করা ছবি full size এ না পাঠিয়ে কয়েকটা width (PRODUCT_IMAGE_WIDTHS)
+এর WebP ও JPEG version বানানো হয়, আর ProductSerializer srcset দেয় যাতে
+browser grid এর জন্য ছোট ছবি নেয়।
+
+    image save/change -> signals.py -> schedule() (commit এর পরে)
+    schedule()        -> process pool এ imaging.render(), শেষ হলে save_renditions()
+    generate_renditions command -> পুরনো products এর জন্য backfill
+
+Product.renditions এ কোন image এর জন্য কোন files তৈরি হয়েছে সেটা থাকে:
+    {'source': 'products/x.jpg', 'webp': {'320': 'renditions/products/x-320w.webp'}, 'jpg': {...}}
+Image বদলালে source মেলে না, তাই নতুন renditions তৈরি না হওয়া পর্যন্ত
+শুধু original image দেখানো হয়।
+"""
+
+import logging
+import multiprocessing
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+
+from . import imaging
+from .cache import bump_catalog_version
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = 'renditions'
+EXTENSIONS = tuple(imaging.FORMATS)
+
+_executor = None
+
+
+def get_executor():
+    """Process pool একবার তৈরি হয়ে থেকে যায় (spawn: worker এ Django লাগে না)"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PRODUCT_IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def rendition_name(image_name, width, extension):
+    stem = posixpath.splitext(image_name)[0]
+    return f'{RENDITION_DIR}/{stem}-{width}w.{extension}'
+
+
+def is_current(product):
+    """Product এর এখনকার image এর renditions তৈরি আছে কিনা"""
+    return bool(product.image) and product.renditions.get('source') == product.image.name
+
+
+def read_image(product):
+    with product.image.open('rb') as image_file:
+        return image_file.read()
+
+
+def generate(product):
+    """এখনই (এই process এ) renditions বানাও"""
+    rendered = imaging.render(read_image(product), settings.PRODUCT_IMAGE_WIDTHS)
+    return save_renditions(product.id, product.image.name, rendered)
+
+
+def schedule(product):
+    """
+    Background process pool এ renditions বানাও
+    PRODUCT_IMAGE_ASYNC = False হলে (tests / management shell) সাথে সাথে
+    """
+    if not product.image:
+        return
+    if not settings.PRODUCT_IMAGE_ASYNC:
+        generate(product)
+        return
+    future = get_executor().submit(
+        imaging.render, read_image(product), settings.PRODUCT_IMAGE_WIDTHS)
+    future.add_done_callback(partial(_finish, product.id, product.image.name))
+
+
+def _finish(product_id, image_name, future):
+    """Pool এর callback thread এ চলে: files save করো ও product update করো"""
+    try:
+        save_renditions(product_id, image_name, future.result())
+    except Exception:
+        logger.exception('Image renditions failed for product %s', product_id)
+    finally:
+        # এই thread এর database connection খোলা রেখো না
+        connections.close_all()
+
+
+def save_renditions(product_id, image_name, rendered):
+    """
+    Rendered bytes storage এ লেখো ও Product.renditions update করো
+    এর মধ্যে image আবার বদলে গেলে update হয় না (False return করে)
+    """
+    renditions = {'source': image_name}
+    for (width, extension), data in sorted(rendered.items()):
+        name = rendition_name(image_name, width, extension)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        name = default_storage.save(name, ContentFile(data))
+        renditions.setdefault(extension, {})[str(width)] = name
+
+    previous = Product.objects.filter(id=product_id).values_list('renditions', flat=True).first()
+    updated = Product.objects.filter(id=product_id, image=image_name).update(
+        renditions=renditions)
+    if not updated:
+        delete_files(renditions)
+        return False
+
+    # পুরনো image এর files মুছে ফেলো
+    delete_files(previous or {}, keep=renditions)
+    # Cached product lists এ নতুন srcset আসুক
+    bump_catalog_version()
+    return True
+
+
+def delete_files(renditions, keep=None):
+    keep_names = {
+        name for extension in EXTENSIONS
+        for name in (keep or {}).get(extension, {}).values()
+    }
+    for extension in EXTENSIONS:
+        for name in renditions.get(extension, {}).values():
+            if name not in keep_names:
+                default_storage.delete(name)
+
+
+def srcset(product, build_url=None):
+    """
+    Serializer এর জন্য: {'webp': 'url 160w, url 320w', 'jpg': ..., 'src': ছোট jpg url}
+    Renditions তৈরি না হলে None
+    """
+    if not is_current(product):
+        return None
+    build_url = build_url or (lambda url: url)
+    result = {}
+    for extension in EXTENSIONS:
+        widths = sorted(
+            (int(width), name) for width, name in product.renditions.get(extension, {}).items())
+        if not widths:
+            continue
+        result[extension] = ', '.join(
+            f'{build_url(default_storage.url(name))} {width}w' for width, name in widths)
+        if extension == 'jpg':
+            # Grid এর default src: thumbnail width এর সমান বা বড় সবচেয়ে ছোটটা
+            name = next(
+                (name for width, name in widths if width >= settings.PRODUCT_IMAGE_THUMBNAIL_WIDTH),
+                widths[-1][1])
+            result['src'] = build_url(default_storage.url(name))
+    return result
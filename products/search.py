@@ -0,0 +1,188 @@
+"""
+Product full-text search
+
+SQLite এ FTS5 virtual table (products_product_fts) ব্যবহার হয়, যেটা
+Product table এর সাথে trigger দিয়ে sync থাকে (migration 0003 দেখো)। SQLite এ
+Product এর field বদলানো migration table নতুন করে বানায় আর triggers মুছে যায়;
+প্রতিটা migrate এর পরে ensure_fts_triggers() সেগুলো আবার বানায় (post_migrate)।
+অন্য database backend বা FTS5 না থাকলে icontains fallback চলে।
+"""
+
+import re
+from importlib import import_module
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+FTS_TABLE = 'products_product_fts'
+FTS_TRIGGERS = ('products_product_fts_ad', 'products_product_fts_ai', 'products_product_fts_au')
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+# FTS5 এ raw marker বসিয়ে পরে HTML escape করা হয়, তারপর <mark> দেওয়া হয়
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+SNIPPET_TOKENS = 16
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_fts_available = None
+
+
+def fts_available():
+    """FTS5 table আছে কিনা (process এ একবারই check হয়)"""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+def ensure_fts_triggers(using=DEFAULT_DB_ALIAS):
+    """
+    FTS table থাকলে তার sync triggers ও আছে কিনা দেখো; না থাকলে বানাও ও index
+    rebuild করো। Triggers আবার বানাতে হলে True
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return False
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN "
+            f"({', '.join(['%s'] * (len(FTS_TRIGGERS) + 1))})", [FTS_TABLE, *FTS_TRIGGERS])
+        names = {name for name, in cursor.fetchall()}
+        if FTS_TABLE not in names or names.issuperset(FTS_TRIGGERS):
+            return False
+        index = import_module('products.migrations.0003_product_search_index')
+        for statement in index.FTS_STATEMENTS:
+            cursor.execute(statement)
+    return True
+
+
+def tokenize(query):
+    return _TOKEN_RE.findall(query.lower())
+
+
+def build_match_query(query):
+    """
+    User input থেকে safe FTS5 MATCH expression বানাও
+    প্রতিটা word quote করা হয়, শেষ word টা prefix search ("lip"*)
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return ''
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def fts_match_ids(query):
+    """Admin/queryset filter এর জন্য matching product id গুলোর subquery"""
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [build_match_query(query)],
+    )
+
+
+def search_products(query, limit, offset=0):
+    """
+    Ranked search result দাও: [(product_id, highlighted_name, snippet), ...]
+    limit + offset দিয়ে paginate করা
+    """
+    if not tokenize(query):
+        return []
+    if fts_available():
+        return _search_fts(query, limit, offset)
+    return _search_fallback(query, limit, offset)
+
+
+def _search_fts(query, limit, offset):
+    from .models import Product
+
+    # bm25 weight: name match description match এর চেয়ে বেশি গুরুত্বপূর্ণ
+    sql = f"""
+        SELECT p.id,
+               highlight({FTS_TABLE}, 0, %s, %s),
+               snippet({FTS_TABLE}, 1, %s, %s, '…', %s)
+        FROM {FTS_TABLE}
+        JOIN products_product p ON p.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s AND p.is_active = 1
+        ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), p.id
+        LIMIT %s OFFSET %s
+    """
+    params = [
+        _MARK_START, _MARK_END,
+        _MARK_START, _MARK_END, SNIPPET_TOKENS,
+        build_match_query(query), limit, offset,
+    ]
+    # Raw SQL ও router মেনে চলুক (read replica)
+    with connections[router.db_for_read(Product)].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [(pk, _apply_marks(name), _apply_marks(snippet)) for pk, name, snippet in rows]
+
+
+def _apply_marks(text):
+    return (
+        escape(text)
+        .replace(_MARK_START, HIGHLIGHT_START)
+        .replace(_MARK_END, HIGHLIGHT_END)
+    )
+
+
+def _search_fallback(query, limit, offset):
+    from .models import Product
+
+    tokens = tokenize(query)
+    condition = Q()
+    name_hits = []
+    for token in tokens:
+        condition &= Q(name__icontains=token) | Q(description__icontains=token)
+        name_hits.append(When(name__icontains=token, then=Value(1)))
+
+    # যত বেশি word name এ match করে, rank তত উপরে
+    rank = sum(
+        (Case(hit, default=Value(0), output_field=IntegerField()) for hit in name_hits),
+        Value(0),
+    )
+    rows = (
+        Product.objects.filter(condition, is_active=True)
+        .annotate(rank=rank)
+        .order_by('-rank', 'id')
+        .values_list('id', 'name', 'description')[offset:offset + limit]
+    )
+    return [
+        (pk, highlight_text(name, tokens), make_snippet(description, tokens))
+        for pk, name, description in rows
+    ]
+
+
+def highlight_text(text, tokens):
+    """
+    Fallback search এর জন্য python এ highlight
+    আগে raw text এ marker বসাও, পরে escape — না হলে 'amp' এর মতো token
+    escape করা entity (&amp;) এর ভেতরে match করে HTML ভেঙে দেয়
+    """
+    if not tokens:
+        return escape(text)
+    pattern = re.compile('|'.join(re.escape(t) for t in tokens), re.IGNORECASE)
+    return _apply_marks(pattern.sub(lambda m: f'{_MARK_START}{m.group(0)}{_MARK_END}', text))
+
+
+def make_snippet(text, tokens):
+    """প্রথম match এর চারপাশের কয়েকটা word নিয়ে snippet বানাও"""
+    words = text.split()
+    start = 0
+    for index, word in enumerate(words):
+        if any(token in word.lower() for token in tokens):
+            start = max(index - SNIPPET_TOKENS // 2, 0)
+            break
+    chunk = words[start:start + SNIPPET_TOKENS]
+    snippet = highlight_text(' '.join(chunk), tokens)
+    if start > 0:
+        snippet = '…' + snippet
+    if start + SNIPPET_TOKENS < len(words):
+        snippet += '…'
+    return snippet
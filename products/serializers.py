@@ -1,16 +1,22 @@
 from rest_framework import serializers
+from glamgirl.serializers import SparseFieldsMixin
+from . import renditions
 from .models import Category, Product
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'description']
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(
         source='category.name', read_only=True)
+    # Resized WebP/JPEG: {'webp': 'url 160w, ...', 'jpg': '...', 'src': thumbnail url}
+    image_srcset = serializers.SerializerMethodField()
+    # Cart এ reserve হওয়া বাদে কতগুলো কেনা যাবে (stock - reserved)
+    stock = serializers.IntegerField(source='available_stock', read_only=True)
 
     class Meta:
         model = Product
@@ -20,9 +26,55 @@ class ProductSerializer(serializers.ModelSerializer):
             'description',
             'price',
             'image',
+            'image_srcset',
             'category',
             'category_name',
             'stock',
             'is_active',
             'created_at'
         ]
+        # ?compact=1 এ বড় description ও কম দরকারি fields বাদ
+        compact_exclude = ['description', 'is_active', 'created_at']
+        field_dependencies = {
+            'image_srcset': ['image', 'renditions'],
+            'stock': ['stock', 'reserved'],
+        }
+
+    def get_image_srcset(self, product):
+        request = self.context.get('request')
+        return renditions.srcset(
+            product, request.build_absolute_uri if request is not None else None)
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    """
+    Product list এর query params validate করার জন্য
+    ?category=&min_price=&max_price=&in_stock=&sort=
+    """
+    SORT_CHOICES = ['newest', 'price_low', 'price_high', 'name']
+
+    category = serializers.IntegerField(required=False, min_value=1)
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False, min_value=0)
+    max_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False, min_value=0)
+    in_stock = serializers.BooleanField(required=False, default=False)
+    sort = serializers.ChoiceField(
+        choices=SORT_CHOICES, required=False, default='newest')
+
+
+class ProductSearchResultSerializer(ProductSerializer):
+    """Search result: product + highlighted name ও description snippet"""
+    highlighted_name = serializers.CharField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ['highlighted_name', 'snippet']
+
+
+class ProductSearchSerializer(serializers.Serializer):
+    """Search query params: ?q=&page=&page_size="""
+    q = serializers.CharField(max_length=200)
+    page = serializers.IntegerField(required=False, default=1, min_value=1)
+    page_size = serializers.IntegerField(
+        required=False, default=20, min_value=1, max_value=50)
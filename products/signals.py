@@ -0,0 +1,37 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import renditions, search
+from .cache import bump_catalog_version
+from .models import Category, Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Catalog change হলে cache version বাড়াও (admin list_editable সহ)
+    Commit এর পরে বাড়ানো হয়, যাতে পুরনো data নতুন version এ cache না হয়
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Product)
+def queue_image_renditions(sender, instance, update_fields=None, **kwargs):
+    """নতুন বা বদলানো image এর renditions commit এর পরে background এ বানাও"""
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if 'renditions' not in instance.__dict__ or renditions.is_current(instance):
+        return
+    if instance.image:
+        transaction.on_commit(partial(renditions.schedule, instance))
+
+
+def repair_search_triggers(sender, using, **kwargs):
+    """Migration এ products table নতুন করে বানানো হলে FTS triggers আবার বানাও"""
+    search.ensure_fts_triggers(using)
@@ -0,0 +1,136 @@
+"""
+Live available stock (stock - reserved) catalog cache এর বাইরে
+
+Checkout ও cart reservation এ stock প্রায় প্রতি request এ বদলায়; তার জন্য
+catalog version বাড়ালে প্রতিটা order এর পরে সব cached page আবার build হতো।
+তাই cached catalog response এ `stock` serve করার সময় per-product key থেকে
+বসানো হয় (overlay), আর stock বদলালে শুধু সেই products এর key মোছা হয়।
+
+Catalog version বাড়ে শুধু যখন কোনো product in stock থেকে out of stock হয় (বা
+উল্টো): তখন in_stock filter এর pages ও facets এর counts বদলায়। Stock keys এও
+catalog version থাকে, তাই version বাড়লে (admin save, import) এগুলোও নতুন হয়।
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from . import cache as catalog_cache
+
+
+def stock_key(version, product_id):
+    return f'stock:{version}:{product_id}'
+
+
+def _products(data):
+    """Response data র মধ্যে যেসব product dict এ stock আছে (list, page বা detail)"""
+    if isinstance(data, dict):
+        items = data.get('results', [data])
+    else:
+        items = data
+    if not isinstance(items, list):
+        return []
+    return [item for item in items
+            if isinstance(item, dict) and 'id' in item and 'stock' in item]
+
+
+def _available_query(product_ids):
+    from .models import Product
+
+    # Primary থেকে: replica একটু পিছিয়ে থাকতে পারে
+    return Product.objects.using(DEFAULT_DB_ALIAS).filter(
+        id__in=product_ids).values_list('id', F('stock') - F('reserved'))
+
+
+def _stock_values(version, available):
+    return {stock_key(version, pk): max(value, 0) for pk, value in available.items()}
+
+
+def _apply(products, available):
+    for product in products:
+        if product['id'] in available:
+            product['stock'] = available[product['id']]
+
+
+def get_available(product_ids, version=None):
+    """{product_id: available stock}; cache এ না থাকলে primary থেকে এক query"""
+    version = version or catalog_cache.get_catalog_version()
+    keys = {stock_key(version, pk): pk for pk in product_ids}
+    available = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    missing = [pk for pk in product_ids if pk not in available]
+    if missing:
+        fresh = _stock_values(version, dict(_available_query(missing)))
+        cache.set_many(fresh, settings.CATALOG_STOCK_TIMEOUT)
+        available.update({keys[key]: value for key, value in fresh.items()})
+    return available
+
+
+async def aget_available(product_ids, version):
+    keys = {stock_key(version, pk): pk for pk in product_ids}
+    available = {keys[key]: value for key, value in (await cache.aget_many(list(keys))).items()}
+    missing = [pk for pk in product_ids if pk not in available]
+    if missing:
+        fresh = _stock_values(
+            version, {pk: value async for pk, value in _available_query(missing)})
+        await cache.aset_many(fresh, settings.CATALOG_STOCK_TIMEOUT)
+        available.update({keys[key]: value for key, value in fresh.items()})
+    return available
+
+
+def overlay(data, version):
+    """Cached response (catalog version এর) products এ live stock বসাও"""
+    products = _products(data)
+    if products:
+        _apply(products, get_available({product['id'] for product in products}, version))
+    return data
+
+
+async def aoverlay(data, version):
+    products = _products(data)
+    if products:
+        _apply(products, await aget_available(
+            {product['id'] for product in products}, version))
+    return data
+
+
+def remember(data, version):
+    """
+    নতুন build করা response এর stock keys এ রাখো (পরের overlay এ query লাগে না)
+    add: এর মধ্যে অন্য কেউ নতুন value রাখলে সেটা থাকে
+    """
+    for product in _products(data):
+        cache.add(stock_key(version, product['id']), product['stock'],
+                  settings.CATALOG_STOCK_TIMEOUT)
+
+
+async def aremember(data, version):
+    for product in _products(data):
+        await cache.aadd(stock_key(version, product['id']), product['stock'],
+                         settings.CATALOG_STOCK_TIMEOUT)
+
+
+def forget(product_ids):
+    version = catalog_cache.get_catalog_version()
+    cache.delete_many([stock_key(version, pk) for pk in product_ids])
+
+
+def changed(product_ids, crossed_zero=False):
+    """
+    Stock/reserved বদলেছে (transaction commit এর পরে cache এ লাগবে)
+    crossed_zero: কোনো product এর available 0 হয়েছে বা 0 থেকে বেড়েছে
+    """
+    product_ids = list(product_ids)
+
+    def invalidate():
+        if crossed_zero:
+            catalog_cache.bump_catalog_version()
+        else:
+            forget(product_ids)
+
+    transaction.on_commit(invalidate)
+
+
+def crosses_zero(before, after):
+    """{product_id: available} আগে ও পরে: কোনোটা in/out of stock হলো কিনা"""
+    return any((before[pk] > 0) != (after.get(pk, 0) > 0) for pk in before)
@@ -1,3 +1,614 @@
-from django.test import TestCase
+import io
+import json
+import re
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import checks, search
+from .cache import get_catalog_version
+from .models import Category, Product
+from .pagination import ProductCursorPagination
+
+
+class SparseFieldsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Lipstick', description='A very long description ' * 20,
+            price=250, category=category, stock=10)
+
+    def test_compact_list_skips_description(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/?compact=1')
+
+        result = response.json()['results'][0]
+        self.assertNotIn('description', result)
+        self.assertEqual(result['name'], 'Lipstick')
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"description"', queries[0]['sql'])
+
+    def test_fields_param(self):
+        response = self.client.get(f'/api/products/{self.product.id}/?fields=id,price')
+        self.assertEqual(response.json(), {'id': self.product.id, 'price': '250.00'})
+
+
+class ProductListTest(TestCase):
+    """Product list এর filters, sorting ও cursor pagination"""
+
+    def setUp(self):
+        cache.clear()
+        self.makeup = Category.objects.create(name='Makeup')
+        self.skincare = Category.objects.create(name='Skincare')
+        self.products = {}
+        # (name, price, stock, category) — নতুন থেকে পুরনো
+        for age, (name, price, stock, category) in enumerate([
+            ('Lipstick', 250, 10, self.makeup),
+            ('Blush', 700, 0, self.makeup),
+            ('Serum', 900, 3, self.skincare),
+            ('Cleanser', 250, 5, self.skincare),
+            ('Mascara', 1200, 2, self.makeup),
+        ]):
+            product = Product.objects.create(
+                name=name, description='Test', price=price, category=category, stock=stock)
+            Product.objects.filter(id=product.id).update(
+                created_at=timezone.now() - timedelta(days=age))
+            self.products[name] = product
+        Product.objects.create(
+            name='Hidden', description='Inactive', price=100, category=self.makeup,
+            stock=5, is_active=False)
+
+    def names(self, url, params=None):
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return [product['name'] for product in response.json()['results']]
+
+    def test_filters(self):
+        self.assertEqual(
+            self.names('/api/products/', {'category': self.makeup.id}),
+            ['Lipstick', 'Blush', 'Mascara'])
+        self.assertEqual(
+            self.names('/api/products/', {'min_price': 250, 'max_price': 700}),
+            ['Lipstick', 'Blush', 'Cleanser'])
+        self.assertEqual(
+            self.names('/api/products/', {'in_stock': 'true'}),
+            ['Lipstick', 'Serum', 'Cleanser', 'Mascara'])
+        self.assertEqual(
+            self.names(f'/api/products/category/{self.makeup.id}/', {'in_stock': 'true'}),
+            ['Lipstick', 'Mascara'])
+
+    def test_in_stock_uses_available_stock(self):
+        # Cart reservation বাদে: Serum এর 3 টাই reserve, Mascara র 1 টা
+        Product.objects.filter(name='Serum').update(reserved=3)
+        Product.objects.filter(name='Mascara').update(reserved=1)
+        self.assertEqual(
+            self.names('/api/products/', {'in_stock': 'true'}),
+            ['Lipstick', 'Cleanser', 'Mascara'])
+        mascara = self.client.get(f"/api/products/{self.products['Mascara'].id}/").json()
+        self.assertEqual(mascara['stock'], 1)
+
+        facets = self.client.get('/api/products/facets/').json()
+        self.assertEqual(facets['total']['in_stock'], 3)
+        page = self.client.get(f"/product/{self.products['Serum'].id}/")
+        self.assertContains(page, 'Out of Stock')
+
+    def test_invalid_params(self):
+        for params in ({'min_price': 'cheap'}, {'sort': 'random'}, {'category': 0}):
+            response = self.client.get('/api/products/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+    SORTED = {
+        'newest': ['Lipstick', 'Blush', 'Serum', 'Cleanser', 'Mascara'],
+        # একই price এ id দিয়ে tie-break
+        'price_low': ['Lipstick', 'Cleanser', 'Blush', 'Serum', 'Mascara'],
+        'price_high': ['Mascara', 'Serum', 'Blush', 'Cleanser', 'Lipstick'],
+        'name': ['Blush', 'Cleanser', 'Lipstick', 'Mascara', 'Serum'],
+    }
+
+    def test_sorting(self):
+        for sort, names in self.SORTED.items():
+            self.assertEqual(self.names('/api/products/', {'sort': sort}), names, sort)
+
+    def test_cursor_pages_are_stable(self):
+        for sort, names in self.SORTED.items():
+            data = self.client.get('/api/products/', {'sort': sort, 'page_size': 2}).json()
+            seen = [product['name'] for product in data['results']]
+            # প্রথম page এর পরে নতুন product (সবচেয়ে নতুন, সবচেয়ে সস্তা) এলেও
+            # বাকি pages সরে যায় না: কোনো product বাদ পড়ে না বা দুবার আসে না
+            new = Product.objects.create(
+                name='Aaa new', description='Test', price=1, category=self.makeup, stock=1)
+            while data['next']:
+                data = self.client.get(data['next']).json()
+                seen += [product['name'] for product in data['results']]
+            self.assertEqual([name for name in seen if name != new.name], names, sort)
+            new.delete()
+
+    def test_page_size_limit(self):
+        data = self.client.get('/api/products/', {'page_size': 2}).json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNone(data['previous'])
+        self.assertIn('cursor=', data['next'])
+
+
+class SearchTest(TestCase):
+    """FTS5 search: ranking, trigger sync, fallback ও highlight"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Makeup')
+        self.serum = Product.objects.create(
+            name='Vitamin Serum', description='Gives a natural glow', price=900,
+            category=self.category, stock=3)
+        self.glow = Product.objects.create(
+            name='Glow Highlighter', description='Shimmer for cheeks', price=650,
+            category=self.category, stock=5)
+        Product.objects.create(
+            name='Glow Palette', description='Discontinued', price=100,
+            category=self.category, stock=5, is_active=False)
+
+    def ids(self, query):
+        return [pk for pk, _, _ in search.search_products(query, limit=10)]
+
+    def test_name_match_ranks_above_description(self):
+        self.assertTrue(search.fts_available())
+        self.assertEqual(self.ids('glow'), [self.glow.id, self.serum.id])
+        # শেষ word prefix match করে
+        self.assertEqual(self.ids('highl'), [self.glow.id])
+        self.assertEqual(self.ids('vitamin glo'), [self.serum.id])
+        self.assertEqual(self.ids('"*) OR'), [])
+
+        results = self.client.get('/api/products/search/', {'q': 'glow'}).json()['results']
+        self.assertEqual(results[0]['highlighted_name'], '<mark>Glow</mark> Highlighter')
+        self.assertIn('natural <mark>glow</mark>', results[1]['snippet'])
+
+    def test_index_follows_product_changes(self):
+        kajal = Product.objects.create(
+            name='Kohl Kajal', description='Black', price=150, category=self.category)
+        self.assertEqual(self.ids('kohl'), [kajal.id])
+
+        kajal.name = 'Smudge Pencil'
+        kajal.save()
+        self.assertEqual(self.ids('kohl'), [])
+        self.assertEqual(self.ids('smudge'), [kajal.id])
+
+        kajal.delete()
+        self.assertEqual(self.ids('smudge'), [])
+
+    def test_fallback_without_fts(self):
+        with mock.patch.object(search, 'fts_available', return_value=False):
+            rows = search.search_products('glow', limit=10)
+        self.assertEqual([pk for pk, _, _ in rows], [self.glow.id, self.serum.id])
+        self.assertEqual(rows[0][1], '<mark>Glow</mark> Highlighter')
+        self.assertEqual(rows[1][2], 'Gives a natural <mark>glow</mark>')
+
+    def test_highlight_escapes_after_marking(self):
+        self.assertEqual(
+            search.highlight_text('Tom & Jerry', ['amp']), 'Tom &amp; Jerry')
+        self.assertEqual(
+            search.highlight_text('<b>Rose</b> & Oud', ['rose', 'b']),
+            '&lt;<mark>b</mark>&gt;<mark>Rose</mark>&lt;/<mark>b</mark>&gt; &amp; Oud')
+
+
+class CatalogCacheTest(TestCase):
+    """Warm cache থেকে catalog API কোনো SQL চালায় না; save হলে invalidate"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Makeup')
+        self.product = Product.objects.create(
+            name='Lipstick', description='Red', price=250, category=self.category, stock=10)
+        self.urls = [
+            '/api/products/',
+            f'/api/products/{self.product.id}/',
+            '/api/products/categories/',
+            f'/api/products/category/{self.category.id}/',
+        ]
+
+    def test_warm_cache_runs_no_queries(self):
+        for url in self.urls:
+            first = self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                second = self.client.get(url)
+            self.assertEqual(len(queries), 0, url)
+            self.assertEqual(second.json(), first.json())
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/products/999/').status_code, 404)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/products/999/')
+        self.assertGreater(len(queries), 0)
+
+    def test_product_save_invalidates(self):
+        url = f'/api/products/{self.product.id}/'
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price = 199
+            self.product.save()
+        self.assertEqual(self.client.get(url).json()['price'], '199.00')
+
+    def test_category_save_invalidates(self):
+        self.client.get('/api/products/categories/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Face'
+            self.category.save()
+        names = [c['name'] for c in self.client.get('/api/products/categories/').json()]
+        self.assertEqual(names, ['Face'])
+
+    def test_process_local_cache_warns(self):
+        self.assertEqual(checks.check_shared_cache(None), [])
+        locmem = {'default': {'BACKEND': checks.LOCMEM}}
+        with self.settings(CACHES=locmem):
+            self.assertEqual(
+                [warning.id for warning in checks.check_shared_cache(None)], ['products.W001'])
+
+
+class SearchMigrationTest(TransactionTestCase):
+    """যেসব migration products table নতুন করে বানায়, তার পরেও FTS triggers থাকে"""
+
+    TRIGGERS = ['products_product_fts_ad', 'products_product_fts_ai', 'products_product_fts_au']
+
+    def triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s "
+                "ORDER BY name", ['products_product_fts_%'])
+            return [name for name, in cursor.fetchall()]
+
+    def test_triggers_survive_each_migration(self):
+        executor = MigrationExecutor(connection)
+        graph = executor.loader.graph
+        leaves = graph.leaf_nodes()
+        latest = next(key for key in leaves if key[0] == 'products')
+        start = ('products', '0002_product_list_indexes')
+        targets = [key for key in graph.forwards_plan(latest)
+                   if key[0] == 'products' and key not in graph.forwards_plan(start)]
+        try:
+            # FTS এর আগে পর্যন্ত ফিরে গিয়ে একটা একটা করে সামনে যাও
+            executor.migrate([start])
+            for target in targets:
+                executor.loader.build_graph()
+                executor.migrate([target])
+                self.assertEqual(self.triggers(), self.TRIGGERS, target)
+        finally:
+            executor.loader.build_graph()
+            executor.migrate(leaves)
+
+    def test_migrate_recreates_missing_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER products_product_fts_ai')
+        self.assertNotIn('products_product_fts_ai', self.triggers())
+
+        call_command('migrate', verbosity=0)
+        self.assertEqual(self.triggers(), self.TRIGGERS)
+        self.assertFalse(search.ensure_fts_triggers())
+
+        category = Category.objects.create(name='Skincare')
+        serum = Product.objects.create(
+            name='Glow Serum', description='Vitamin C', price=900, category=category)
+        self.assertEqual([row[0] for row in search.search_products('glow', 10)], [serum.id])
+
+
+def make_image(width, height, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'JPEG')
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(PRODUCT_IMAGE_ASYNC=False, PRODUCT_IMAGE_WIDTHS=[160, 320, 640])
+class ImageRenditionTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media_root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media_root.cleanup)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root.name))
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Makeup')
+
+    def create_product(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                name='Lipstick', description='Red', price=250,
+                category=self.category, stock=10, image=image)
+        product.refresh_from_db()
+        return product
+
+    def test_upload_generates_resized_webp_and_jpeg(self):
+        product = self.create_product(make_image(800, 400))
+
+        self.assertEqual(product.renditions['source'], product.image.name)
+        self.assertEqual(sorted(product.renditions['webp']), ['160', '320', '640'])
+        with default_storage.open(product.renditions['jpg']['320']) as rendition:
+            self.assertEqual(Image.open(rendition).size, (320, 160))
+        with default_storage.open(product.renditions['webp']['640']) as rendition:
+            self.assertEqual(Image.open(rendition).format, 'WEBP')
+
+    def test_small_images_are_not_upscaled(self):
+        product = self.create_product(make_image(200, 200))
+        self.assertEqual(sorted(product.renditions['jpg']), ['160'])
+
+    def test_list_exposes_srcset_without_extra_queries(self):
+        self.create_product(make_image(800, 400))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/?compact=1')
+        self.assertEqual(len(queries), 1)
+        srcset = response.json()['results'][0]['image_srcset']
+        self.assertIn('-160w.webp 160w', srcset['webp'])
+        self.assertTrue(srcset['src'].endswith('-320w.jpg'))
+
+    def test_changing_image_replaces_renditions(self):
+        product = self.create_product(make_image(800, 400))
+        old_files = list(product.renditions['jpg'].values())
+
+        product.image = make_image(400, 400, 'blue')
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        product.refresh_from_db()
+
+        self.assertEqual(product.renditions['source'], product.image.name)
+        for name in old_files:
+            self.assertFalse(default_storage.exists(name))
+
+    def test_backfill_command(self):
+        product = self.create_product(make_image(800, 400))
+        Product.objects.filter(id=product.id).update(renditions={})
+        self.assertIsNone(
+            self.client.get(f'/api/products/{product.id}/').json()['image_srcset'])
+
+        output = io.StringIO()
+        call_command('generate_renditions', workers=1, stdout=output)
+        self.assertIn('1 generated', output.getvalue())
+        product.refresh_from_db()
+        self.assertEqual(product.renditions['source'], product.image.name)
+
+
+class ServerRenderedPagesTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.makeup = Category.objects.create(name='Makeup')
+        self.skincare = Category.objects.create(name='Skincare')
+        self.lipstick = Product.objects.create(
+            name='Lipstick <Red>', description='Matte', price=250, category=self.makeup, stock=10)
+        Product.objects.create(
+            name='Serum', description='Face', price=900, category=self.skincare, stock=0)
+
+    def initial_data(self, response, element_id):
+        """Page এর json_script data — main.js যা পড়ে"""
+        html = response.content.decode()
+        match = re.search(
+            rf'<script id="{element_id}" type="application/json">(.*?)</script>', html, re.S)
+        return json.loads(match.group(1))
+
+    def test_home(self):
+        response = self.client.get('/')
+        self.assertContains(response, 'Lipstick &lt;Red&gt;')
+        self.assertContains(response, '/products/?category=%d' % self.skincare.id)
+        self.assertEqual(
+            [category['name'] for category in self.initial_data(response, 'initialCategories')],
+            ['Makeup', 'Skincare'])
+
+    def test_products_page_matches_api(self):
+        response = self.client.get(f'/products/?category={self.makeup.id}')
+        self.assertContains(response, 'Lipstick &lt;Red&gt;')
+        self.assertNotContains(response, 'Serum</a>')
+        self.assertContains(response, '(1 items)')
+        api = self.client.get(f'/api/products/?compact=1&category={self.makeup.id}')
+        self.assertEqual(self.initial_data(response, 'initialProducts'), api.json())
+
+    def test_product_detail(self):
+        response = self.client.get(f'/product/{self.lipstick.id}/')
+        self.assertContains(response, '<h1 class="mb-3">Lipstick &lt;Red&gt;</h1>', html=True)
+        self.assertContains(response, '(10 available)')
+        self.assertEqual(self.initial_data(response, 'initialProduct'),
+                         self.client.get(f'/api/products/{self.lipstick.id}/').json())
+
+        response = self.client.get('/product/999999/')
+        self.assertContains(response, 'Product not found')
+        self.assertIsNone(self.initial_data(response, 'initialProduct'))
+
+    def test_fragments_are_cached_until_catalog_changes(self):
+        self.client.get('/products/')
+        self.client.get(f'/product/{self.lipstick.id}/')
+        with self.assertNumQueries(0):
+            self.client.get('/products/')
+            self.client.get(f'/product/{self.lipstick.id}/')
+
+        # Save এ catalog version বাড়ে, নতুন fragment render হয়
+        self.lipstick.name = 'Gloss'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lipstick.save()
+        self.assertContains(self.client.get('/products/'), 'Gloss')
+        self.assertContains(self.client.get(f'/product/{self.lipstick.id}/'), 'Gloss')
+
+
+class FacetsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.makeup = Category.objects.create(name='Makeup')
+        self.skincare = Category.objects.create(name='Skincare')
+        self.empty = Category.objects.create(name='Haircare')
+        for price, stock in [(499.99, 5), (500, 0), (1000, 2), (1000.01, 1)]:
+            Product.objects.create(
+                name=f'Lipstick {price}', description='Matte', price=price,
+                category=self.makeup, stock=stock)
+        Product.objects.create(
+            name='Serum', description='Face', price=900, category=self.skincare, stock=3)
+        Product.objects.create(
+            name='Old cream', description='Face', price=100, category=self.skincare,
+            stock=9, is_active=False)
+
+    def bucket_counts(self, facet):
+        return {bucket['key']: bucket['count'] for bucket in facet['price_buckets']}
+
+    def test_counts(self):
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/products/facets/').json()
+
+        self.assertEqual(data['total']['products'], 5)
+        self.assertEqual(data['total']['in_stock'], 4)
+        self.assertEqual(self.bucket_counts(data['total']),
+                         {'under_500': 1, '500_1000': 3, 'over_1000': 1})
+
+        categories = {category['name']: category for category in data['categories']}
+        self.assertEqual(categories['Makeup']['products'], 4)
+        self.assertEqual(categories['Makeup']['in_stock'], 3)
+        self.assertEqual(self.bucket_counts(categories['Skincare']),
+                         {'under_500': 0, '500_1000': 1, 'over_1000': 0})
+        self.assertEqual(categories['Haircare']['products'], 0)
+
+    def test_buckets_match_list_filters(self):
+        data = self.client.get('/api/products/facets/').json()
+        for bucket in data['total']['price_buckets']:
+            params = {'page_size': 50}
+            if bucket['min_price']:
+                params['min_price'] = bucket['min_price']
+            if bucket['max_price']:
+                params['max_price'] = bucket['max_price']
+            results = self.client.get('/api/products/', params).json()['results']
+            self.assertEqual(len(results), bucket['count'], bucket['key'])
+
+    def test_cached_until_catalog_changes(self):
+        self.client.get('/api/products/facets/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/products/facets/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(
+                name='Toner', description='Face', price=1500, category=self.skincare)
+        data = self.client.get('/api/products/facets/').json()
+        self.assertEqual(data['total']['products'], 6)
+        self.assertEqual(data['total']['in_stock'], 4)
+
+    def test_products_page_filters(self):
+        response = self.client.get(f'/products/?category={self.skincare.id}')
+        self.assertContains(response, 'Makeup <span class="text-muted small">(4)</span>', html=True)
+        self.assertContains(response, 'data-min-price="500.00"')
+        # Price counts selected category এর
+        self.assertContains(
+            response, '৳500 - ৳1000 <span class="text-muted small">(1)</span>', html=True)
+        self.assertEqual(
+            self.initial_facets(response)['categories'],
+            self.client.get('/api/products/facets/').json()['categories'])
+
+    def initial_facets(self, response):
+        match = re.search(
+            r'<script id="initialFacets" type="application/json">(.*?)</script>',
+            response.content.decode(), re.S)
+        return json.loads(match.group(1))
+
+
+class ImportCatalogTest(TestCase):
+    CSV_HEADER = 'sku,name,description,price,category,stock,is_active\n'
+
+    def setUp(self):
+        self.makeup = Category.objects.create(name='Makeup')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = f'{self.directory.name}/{name}'
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        return path
+
+    def run_import(self, *args, **options):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_catalog', *args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_upsert_and_skip_unchanged(self):
+        path = self.write('feed.csv', self.CSV_HEADER + (
+            'LIP-1,Velvet Lipstick,Matte finish,450,Makeup,10,1\n'
+            'SER-1,Glow Serum,Vitamin C,1200.5,Skincare,0,true\n'
+        ))
+        stdout, _ = self.run_import(path, chunk_size=1)
+        self.assertIn('2 created, 0 updated, 0 unchanged, 0 skipped', stdout)
+        serum = Product.objects.get(sku='SER-1')
+        self.assertEqual(serum.category.name, 'Skincare')
+        self.assertEqual(str(serum.price), '1200.50')
+        self.assertEqual(Product.objects.get(sku='LIP-1').category, self.makeup)
+        # FTS index trigger দিয়ে sync
+        results = self.client.get('/api/products/search/?q=glow').json()['results']
+        self.assertEqual([product['id'] for product in results], [serum.id])
+
+        version = get_catalog_version()
+        stdout, _ = self.run_import(path)
+        self.assertIn('0 created, 0 updated, 2 unchanged', stdout)
+        self.assertEqual(get_catalog_version(), version)
+
+        Product.objects.filter(sku='LIP-1').update(reserved=3)
+        path = self.write('feed.csv', self.CSV_HEADER + (
+            'LIP-1,Velvet Lipstick,Matte finish,399,Makeup,8,0\n'
+            'SER-1,Glow Serum,Vitamin C,1200.50,Skincare,0,true\n'
+        ))
+        stdout, _ = self.run_import(path)
+        self.assertIn('0 created, 1 updated, 1 unchanged', stdout)
+        self.assertGreater(get_catalog_version(), version)
+        lipstick = Product.objects.get(sku='LIP-1')
+        self.assertEqual((str(lipstick.price), lipstick.stock, lipstick.is_active, lipstick.reserved),
+                         ('399.00', 8, False, 3))
+        self.assertEqual(Category.objects.filter(name='Skincare').count(), 1)
+
+    def test_stock_is_not_set_below_reserved(self):
+        path = self.write('feed.csv', self.CSV_HEADER + 'LIP-1,Velvet Lipstick,,450,Makeup,10,1\n')
+        self.run_import(path)
+        Product.objects.filter(sku='LIP-1').update(reserved=4)
+
+        path = self.write('feed.csv', self.CSV_HEADER + 'LIP-1,Velvet Lipstick,,450,Makeup,1,1\n')
+        stdout, _ = self.run_import(path)
+        self.assertIn('0 skipped, 1 stock raised to reserved', stdout)
+        lipstick = Product.objects.get(sku='LIP-1')
+        self.assertEqual((lipstick.stock, lipstick.available_stock), (4, 0))
+
+    def test_bad_rows_are_skipped(self):
+        path = self.write('feed.jsonl', '\n'.join([
+            json.dumps({'sku': 'A', 'name': 'Kajal', 'price': '150', 'category': 'Makeup'}),
+            json.dumps({'sku': 'B', 'name': 'Broken', 'price': 'free', 'category': 'Makeup'}),
+            '{not json',
+            json.dumps({'sku': 'C', 'price': '10', 'category': 'Makeup'}),
+        ]) + '\n')
+        stdout, stderr = self.run_import(path)
+        self.assertIn('1 created, 0 updated, 0 unchanged, 3 skipped', stdout)
+        self.assertIn('feed.jsonl:2: price: invalid', stderr)
+        self.assertIn('feed.jsonl:3: invalid JSON', stderr)
+        self.assertIn('feed.jsonl:4: name: required', stderr)
+        product = Product.objects.get(sku='A')
+        self.assertEqual((product.stock, product.is_active, product.description), (0, True, ''))
+
+    def test_categories_file(self):
+        categories = self.write('categories.ndjson', '\n'.join([
+            json.dumps({'name': 'Makeup', 'description': 'Face & eyes'}),
+            json.dumps({'name': 'Haircare', 'description': 'Shampoo'}),
+        ]))
+        products = self.write('feed.csv', self.CSV_HEADER + 'H-1,Shampoo,,300,Haircare,4,\n')
+        stdout, _ = self.run_import(products, categories=categories)
+        self.assertIn('categories: 2 row(s)', stdout)
+        self.assertIn('1 created, 1 updated', stdout)
+        self.makeup.refresh_from_db()
+        self.assertEqual(self.makeup.description, 'Face & eyes')
+        self.assertEqual(Product.objects.get(sku='H-1').category.description, 'Shampoo')
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            call_command('import_catalog')
+        with self.assertRaises(CommandError):
+            call_command('import_catalog', self.write('feed.txt', ''))
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('categories/', views.CategoryListView.as_view(), name='category-list'),
     path('', views.ProductListView.as_view(), name='product-list'),
+    path('facets/', views.product_facets, name='product-facets'),
+    path('search/', views.product_search, name='product-search'),
     path('<int:pk>/', views.ProductDetailView.as_view(), name='product-detail'),
     path('category/<int:category_id>/', views.products_by_category, name='products-by-category'),
 ]
\ No newline at end of file
@@ -1,55 +1,262 @@
+import copy
+from functools import partial
+
 from rest_framework import generics
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, authentication_classes
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.conf import settings
+from django.db.models import F
+from django.http import QueryDict
 from django.shortcuts import render
+from django.urls import reverse
+from glamgirl.db import replica_reads
+from . import search
+from .facets import catalog_facets
+from .cache import CatalogCacheMixin, catalog_cached, get_catalog_version
 from .models import Category, Product
-from .serializers import CategorySerializer, ProductSerializer
+from .pagination import ProductCursorPagination
+from .serializers import (
+    CategorySerializer, ProductSerializer, ProductFilterSerializer,
+    ProductSearchSerializer, ProductSearchResultSerializer)
+
+
+def list_deferred_fields(serializer):
+    """Product list এ যেসব column load করার দরকার নেই (pagination ordering বাদে)"""
+    return [
+        name for name in serializer.deferred_fields()
+        if name not in ProductCursorPagination.ORDERING_FIELDS
+    ]
+
+
+def filter_products(queryset, query_params):
+    """
+    Query params অনুযায়ী products filter করো
+    Invalid params হলে ValidationError (400) raise হবে
+    """
+    params = ProductFilterSerializer(data=query_params)
+    params.is_valid(raise_exception=True)
+    filters = params.validated_data
+
+    if 'category' in filters:
+        queryset = queryset.filter(category_id=filters['category'])
+    if 'min_price' in filters:
+        queryset = queryset.filter(price__gte=filters['min_price'])
+    if 'max_price' in filters:
+        queryset = queryset.filter(price__lte=filters['max_price'])
+    if filters.get('in_stock'):
+        # Available stock: cart এ reserve হওয়া বাদে
+        queryset = queryset.filter(stock__gt=F('reserved'))
+    return queryset
 
 
 # ============================================
 # Template Views (HTML Pages)
 # ============================================
+# প্রথম product grid / product detail server এ render হয় ({% cache %} fragment,
+# catalog version ও category অনুযায়ী key), সাথে একই API response JSON হিসেবে
+# (json_script) থাকে যাতে main.js আবার fetch না করে সেখান থেকে শুরু করে।
+# Data গুলো callable হিসেবে template এ যায়: fragment cache এ না থাকলেই
+# API view চলে (যার নিজের catalog cache ও আছে), নাহলে কোনো query হয় না।
+# Product detail এর stock live (products.stock), তাই সেই অংশ fragment এর বাইরে
+# আর API view প্রতিবার চলে (warm cache এ query ছাড়াই)।
+
+HOME_PRODUCTS = 6
+
+
+def api_data(request, view, url_name, params=None, **kwargs):
+    """
+    Page request থেকে catalog API view চালিয়ে তার response data দাও
+    (একই host/scheme, শুধু path ও query API এর) — 200 না হলে None
+    """
+    api_request = copy.copy(request)
+    api_request.path = api_request.path_info = reverse(url_name, kwargs=kwargs)
+    api_request.GET = QueryDict(mutable=True)
+    api_request.GET.update(params or {})
+    api_request.META = {**request.META, 'QUERY_STRING': api_request.GET.urlencode()}
+    response = view(api_request, **kwargs)
+    return response.data if response.status_code == 200 else None
+
+
+def page_context(request, **extra):
+    return {
+        'catalog_version': get_catalog_version(),
+        'cache_timeout': settings.CATALOG_CACHE_TIMEOUT,
+        'host': request.get_host(),
+        **extra,
+    }
+
+
+def selected_category(request):
+    """?category= (products page এর filter), ভুল হলে None"""
+    try:
+        return int(request.GET['category'])
+    except (KeyError, ValueError):
+        return None
+
 
 def home(request):
-    """Homepage"""
-    return render(request, 'home.html')
+    """Homepage (categories ও featured products server rendered)"""
+    return render(request, 'home.html', page_context(
+        request,
+        categories=partial(api_data, request, CategoryListView.as_view(), 'category-list'),
+        products=partial(api_data, request, ProductListView.as_view(), 'product-list',
+                         {'compact': 1, 'page_size': HOME_PRODUCTS}),
+    ))
+
+
+def filter_facets(request, category):
+    """Sidebar filters: facets API + selected category (না থাকলে total) এর counts"""
+    facets = api_data(request, product_facets, 'product-facets')
+    if facets is None:
+        return None
+    selected = next(
+        (facet for facet in facets['categories'] if facet['id'] == category), facets['total'])
+    return {**facets, 'selected': selected}
 
 
 def products_page(request):
-    """Products listing page"""
-    return render(request, 'products.html')
+    """Products listing page (category filter সহ প্রথম page server rendered)"""
+    category = selected_category(request)
+    params = {'compact': 1}
+    if category is not None:
+        params['category'] = category
+    return render(request, 'products.html', page_context(
+        request,
+        category=category,
+        facets=partial(filter_facets, request, category),
+        products=partial(api_data, request, ProductListView.as_view(), 'product-list', params),
+    ))
 
 
 def product_detail_page(request, pk):
     """Single product detail page"""
-    return render(request, 'product_detail.html', {'product_id': pk})
+    return render(request, 'product_detail.html', page_context(
+        request,
+        product_id=pk,
+        product=partial(api_data, request, ProductDetailView.as_view(), 'product-detail', pk=pk),
+    ))
 
 
 # ============================================
 # API Views (JSON Data)
 # ============================================
 
-class CategoryListView(generics.ListAPIView):
+# Catalog API public read-only: authentication লাগে না, তাই warm cache এ
+# session lookup সহ কোনো SQL query হয় না; cache miss হলে read replica থেকে পড়ে
+
+class CategoryListView(CatalogCacheMixin, generics.ListAPIView):
     """সব Categories দেখাও"""
+    authentication_classes = []
+    replica_reads = True
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
 
-class ProductListView(generics.ListAPIView):
-    """সব Products দেখাও"""
-    queryset = Product.objects.filter(is_active=True)
+class ProductListView(CatalogCacheMixin, generics.ListAPIView):
+    """
+    সব Products দেখাও (filter, sort ও cursor pagination সহ)
+    GET /api/products/?category=&min_price=&max_price=&in_stock=&sort=&cursor=
+    """
+    authentication_classes = []
+    replica_reads = True
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
 
+    def get_queryset(self):
+        # ?fields= / ?compact=1 এ যেসব column লাগবে না সেগুলো load করো না
+        queryset = Product.objects.filter(
+            is_active=True).select_related('category').defer(
+                *list_deferred_fields(self.get_serializer()))
+        return filter_products(queryset, self.request.query_params)
 
-class ProductDetailView(generics.RetrieveAPIView):
+
+class ProductDetailView(CatalogCacheMixin, generics.RetrieveAPIView):
     """একটা Product এর details দেখাও"""
-    queryset = Product.objects.filter(is_active=True)
+    authentication_classes = []
+    replica_reads = True
     serializer_class = ProductSerializer
 
+    def get_queryset(self):
+        return Product.objects.filter(is_active=True).select_related(
+            'category').defer(*self.get_serializer().deferred_fields())
+
 
+@replica_reads
 @api_view(['GET'])
+@authentication_classes([])
+@catalog_cached
 def products_by_category(request, category_id):
-    """Category অনুযায়ী Products দেখাও"""
-    products = Product.objects.filter(category_id=category_id, is_active=True)
-    serializer = ProductSerializer(products, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    """Category অনুযায়ী Products দেখাও (ProductListView এর মতো filter ও pagination)"""
+    context = {'request': request}
+    products = Product.objects.filter(
+        category_id=category_id, is_active=True).select_related('category').defer(
+            *list_deferred_fields(ProductSerializer(context=context)))
+    products = filter_products(products, request.query_params)
+
+    paginator = ProductCursorPagination()
+    page = paginator.paginate_queryset(products, request)
+    serializer = ProductSerializer(page, many=True, context=context)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@replica_reads
+@api_view(['GET'])
+@authentication_classes([])
+@catalog_cached
+def product_facets(request):
+    """
+    Category অনুযায়ী active/in-stock product counts ও price histogram
+    GET /api/products/facets/
+    """
+    return Response(catalog_facets())
+
+
+@replica_reads
+@api_view(['GET'])
+@authentication_classes([])
+@catalog_cached
+def product_search(request):
+    """
+    Product full-text search (ranked, highlighted)
+    GET /api/products/search/?q=&page=&page_size=
+    """
+    params = ProductSearchSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    query = params.validated_data['q']
+    page = params.validated_data['page']
+    page_size = params.validated_data['page_size']
+
+    # একটা বেশি নিয়ে দেখো next page আছে কিনা (COUNT query লাগে না)
+    rows = search.search_products(
+        query, limit=page_size + 1, offset=(page - 1) * page_size)
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    context = {'request': request}
+    products = Product.objects.select_related('category').defer(
+        *ProductSearchResultSerializer(context=context).deferred_fields(),
+    ).in_bulk([pk for pk, _, _ in rows])
+    results = []
+    for pk, highlighted_name, snippet in rows:
+        product = products.get(pk)
+        if product is None:
+            continue
+        product.highlighted_name = highlighted_name
+        product.snippet = snippet
+        results.append(product)
+
+    url = request.build_absolute_uri()
+    previous_url = None
+    if page > 1:
+        previous_url = (replace_query_param(url, 'page', page - 1)
+                        if page > 2 else remove_query_param(url, 'page'))
+
+    return Response({
+        'query': query,
+        'page': page,
+        'next': replace_query_param(url, 'page', page + 1) if has_next else None,
+        'previous': previous_url,
+        'results': ProductSearchResultSerializer(
+            results, many=True, context=context).data,
+    })
\ No newline at end of file
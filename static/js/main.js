@@ -53,6 +53,12 @@ function showToast(message, type = 'success') {
     }, 3000);
 }
 
+// Server rendered page এর সাথে আসা API data (json_script), না থাকলে undefined
+function readInitialData(id) {
+    const element = document.getElementById(id);
+    return element ? JSON.parse(element.textContent) : undefined;
+}
+
 // ============================================
 // API Functions
 // ============================================
@@ -68,18 +74,41 @@ async function fetchCategories() {
     }
 }
 
-async function fetchProducts(categoryId = null) {
+async function fetchFacets() {
+    // Category counts ও price histogram (server এ এক query তে গোনা, cached)
     try {
-        let url = `${API_URL}/products/`;
-        if (categoryId) {
-            url = `${API_URL}/products/category/${categoryId}/`;
-        }
+        const response = await fetch(`${API_URL}/products/facets/`);
+        if (!response.ok) return null;
+        return await response.json();
+    } catch (error) {
+        console.error('Error fetching facets:', error);
+        return null;
+    }
+}
+
+async function fetchProducts(params = {}) {
+    // Server-side filter/sort/pagination: returns { next, previous, results }
+    // compact: product cards don't need the description
+    try {
+        const query = new URLSearchParams({ compact: 1, ...params }).toString();
+        const url = `${API_URL}/products/?${query}`;
         const response = await fetch(url);
         const data = await response.json();
         return data;
     } catch (error) {
         console.error('Error fetching products:', error);
-        return [];
+        return { next: null, previous: null, results: [] };
+    }
+}
+
+async function fetchProductsPage(url) {
+    try {
+        const response = await fetch(url);
+        const data = await response.json();
+        return data;
+    } catch (error) {
+        console.error('Error fetching products:', error);
+        return { next: null, previous: null, results: [] };
     }
 }
 
@@ -96,7 +125,7 @@ async function fetchProduct(productId) {
 
 async function fetchCart() {
     try {
-        const response = await fetch(`${API_URL}/cart/`, {
+        const response = await fetch(`${API_URL}/cart/?compact=1`, {
             method: 'GET',
             credentials: 'same-origin',
             headers: {
@@ -113,7 +142,7 @@ async function fetchCart() {
 
 async function addToCartAPI(productId, quantity = 1) {
     try {
-        const response = await fetch(`${API_URL}/cart/add/`, {
+        const response = await fetch(`${API_URL}/cart/add/?compact=1`, {
             method: 'POST',
             credentials: 'same-origin',
             headers: {
@@ -136,7 +165,7 @@ async function addToCartAPI(productId, quantity = 1) {
 
 async function updateCartItemAPI(itemId, quantity) {
     try {
-        const response = await fetch(`${API_URL}/cart/update/${itemId}/`, {
+        const response = await fetch(`${API_URL}/cart/update/${itemId}/?compact=1`, {
             method: 'PUT',
             credentials: 'same-origin',
             headers: {
@@ -155,7 +184,7 @@ async function updateCartItemAPI(itemId, quantity) {
 
 async function removeFromCartAPI(itemId) {
     try {
-        const response = await fetch(`${API_URL}/cart/remove/${itemId}/`, {
+        const response = await fetch(`${API_URL}/cart/remove/${itemId}/?compact=1`, {
             method: 'DELETE',
             credentials: 'same-origin',
             headers: {
@@ -171,6 +200,26 @@ async function removeFromCartAPI(itemId) {
     }
 }
 
+async function batchCartAPI(operations) {
+    // operations: [{ op: 'add', product_id, quantity }, { op: 'update', item_id, quantity }, { op: 'remove', item_id }]
+    try {
+        const response = await fetch(`${API_URL}/cart/batch/?compact=1`, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRFToken(),
+            },
+            body: JSON.stringify({ operations: operations })
+        });
+        const data = await response.json();
+        return { success: response.ok, data: data };
+    } catch (error) {
+        console.error('Error updating cart:', error);
+        return { success: false, data: null };
+    }
+}
+
 async function createOrderAPI(orderData) {
     try {
         const response = await fetch(`${API_URL}/orders/create/`, {
@@ -208,7 +257,9 @@ async function updateCartCount() {
 
 async function loadNavCategories() {
     try {
-        const categories = await fetchCategories();
+        const facets = readInitialData('initialFacets');
+        const categories = readInitialData('initialCategories')
+            || (facets && facets.categories) || await fetchCategories();
         const dropdown = document.getElementById('categoryDropdown');
         const footerCategories = document.getElementById('footerCategories');
         
@@ -228,13 +279,29 @@ async function loadNavCategories() {
     }
 }
 
+// Grid card এর জন্য resized image (image_srcset না থাকলে original)
+function productImageTag(product, sizes, className) {
+    const srcset = product.image_srcset;
+    if (!srcset) {
+        const imageUrl = product.image || 'https://via.placeholder.com/300x300?text=No+Image';
+        return `<img src="${imageUrl}" class="${className}" alt="${product.name}" loading="lazy">`;
+    }
+    return `
+        <picture>
+            <source type="image/webp" srcset="${srcset.webp}" sizes="${sizes}">
+            <img src="${srcset.src}" srcset="${srcset.jpg}" sizes="${sizes}"
+                 class="${className}" alt="${product.name}" loading="lazy">
+        </picture>`;
+}
+
 function createProductCard(product) {
-    const imageUrl = product.image || 'https://via.placeholder.com/300x300?text=No+Image';
+    const image = productImageTag(
+        product, '(min-width: 768px) 33vw, (min-width: 576px) 50vw, 100vw', 'card-img-top');
     return `
         <div class="col-md-4 col-sm-6 mb-4">
             <div class="card product-card h-100 shadow-sm">
                 <a href="/product/${product.id}/">
-                    <img src="${imageUrl}" class="card-img-top" alt="${product.name}">
+                    ${image}
                 </a>
                 <div class="card-body">
                     <span class="category-badge">${product.category_name}</span>
@@ -278,13 +345,19 @@ async function quickAddToCart(productId) {
 async function initHomePage() {
     console.log('Initializing Home Page...');
     
+    // Categories ও featured products server এ render হয়ে এসেছে
+    if (readInitialData('initialCategories') !== undefined) {
+        return;
+    }
+    
     try {
-        const products = await fetchProducts();
+        const page = await fetchProducts({ page_size: 6 });
+        const products = page.results;
         const container = document.getElementById('featuredProducts');
         
         if (container) {
             if (products && products.length > 0) {
-                container.innerHTML = products.slice(0, 6).map(p => createProductCard(p)).join('');
+                container.innerHTML = products.map(p => createProductCard(p)).join('');
             } else {
                 container.innerHTML = '<div class="col-12 text-center"><p class="text-muted">No products found. Add products from admin panel.</p></div>';
             }
@@ -318,9 +391,10 @@ async function initHomePage() {
 // Page: PRODUCTS (with All Filters)
 // ============================================
 
-let allProducts = [];
 let allCategories = [];
-let filteredProducts = [];
+let catalogFacets = null;
+let loadedProducts = [];
+let nextProductsUrl = null;
 
 async function initProductsPage() {
     console.log('Initializing Products Page...');
@@ -330,25 +404,26 @@ async function initProductsPage() {
         const urlParams = new URLSearchParams(window.location.search);
         const categoryId = urlParams.get('category');
         
-        // Fetch all products and categories
-        allProducts = await fetchProducts();
-        allCategories = await fetchCategories();
+        // Server rendered page: filters ও প্রথম page আগেই আছে, শুধু state নাও
+        const initialPage = readInitialData('initialProducts');
+        catalogFacets = readInitialData('initialFacets') || await fetchFacets();
+        allCategories = catalogFacets ? catalogFacets.categories : await fetchCategories();
         
-        // Initial filter
-        if (categoryId) {
-            filteredProducts = allProducts.filter(p => p.category == categoryId);
-        } else {
-            filteredProducts = [...allProducts];
-        }
+        // Setup event listeners for sorting and price filter
+        setupFilterListeners();
         
-        // Render products
-        renderProducts(filteredProducts);
+        if (initialPage) {
+            loadedProducts = initialPage.results || [];
+            nextProductsUrl = initialPage.next;
+            return;
+        }
         
-        // Render category filters
+        // Render category ও price filters (counts সহ)
         renderCategoryFilters(categoryId);
+        renderPriceFilters(categoryId);
         
-        // Setup event listeners for sorting and price filter
-        setupFilterListeners();
+        // First page (server-side filtered)
+        await applyFilters();
         
     } catch (error) {
         console.error('Error initializing products page:', error);
@@ -363,77 +438,53 @@ function setupFilterListeners() {
             applyFilters();
         });
     }
-    
-    // Price range listeners
-    const priceRadios = document.querySelectorAll('input[name="priceRange"]');
-    priceRadios.forEach(radio => {
-        radio.addEventListener('change', function() {
-            applyFilters();
-        });
-    });
 }
 
-function applyFilters() {
+function getFilterParams() {
     // Get selected category
     const selectedCategory = document.querySelector('input[name="categoryFilter"]:checked');
     const categoryId = selectedCategory ? selectedCategory.value : '';
     
     // Get selected price range
     const selectedPrice = document.querySelector('input[name="priceRange"]:checked');
-    const priceRange = selectedPrice ? selectedPrice.id : 'priceAll';
     
     // Get selected sort
     const sortSelect = document.getElementById('sortSelect');
     const sortValue = sortSelect ? sortSelect.value : 'newest';
     
-    // Start with all products
-    let results = [...allProducts];
-    
-    // Filter by category
+    const params = { sort: sortValue, ...priceRangeParams(selectedPrice) };
     if (categoryId) {
-        results = results.filter(p => p.category == categoryId);
+        params.category = categoryId;
     }
-    
-    // Filter by price range
-    results = filterByPriceRange(results, priceRange);
-    
-    // Sort products
-    results = sortProducts(results, sortValue);
-    
-    // Update filtered products
-    filteredProducts = results;
-    
-    // Render
-    renderProducts(filteredProducts);
+    return params;
 }
 
-function filterByPriceRange(products, priceRange) {
-    switch(priceRange) {
-        case 'price1': // Under ৳500
-            return products.filter(p => parseFloat(p.price) < 500);
-        case 'price2': // ৳500 - ৳1000
-            return products.filter(p => parseFloat(p.price) >= 500 && parseFloat(p.price) <= 1000);
-        case 'price3': // Above ৳1000
-            return products.filter(p => parseFloat(p.price) > 1000);
-        default: // All prices
-            return products;
-    }
+async function applyFilters() {
+    const page = await fetchProducts(getFilterParams());
+    loadedProducts = page.results || [];
+    nextProductsUrl = page.next;
+    renderProducts(loadedProducts);
 }
 
-function sortProducts(products, sortValue) {
-    const sorted = [...products];
+async function loadMoreProducts() {
+    if (!nextProductsUrl) return;
     
-    switch(sortValue) {
-        case 'price_low':
-            return sorted.sort((a, b) => parseFloat(a.price) - parseFloat(b.price));
-        case 'price_high':
-            return sorted.sort((a, b) => parseFloat(b.price) - parseFloat(a.price));
-        case 'name':
-            return sorted.sort((a, b) => a.name.localeCompare(b.name));
-        case 'newest':
-        default:
-            return sorted.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+    const page = await fetchProductsPage(nextProductsUrl);
+    loadedProducts = loadedProducts.concat(page.results || []);
+    nextProductsUrl = page.next;
+    renderProducts(loadedProducts);
+}
+
+function priceRangeParams(radio) {
+    // Price bucket এর min/max facets API থেকে আসে (data-min-price/data-max-price)
+    const params = {};
+    if (radio && radio.dataset.minPrice) {
+        params.min_price = radio.dataset.minPrice;
     }
+    if (radio && radio.dataset.maxPrice) {
+        params.max_price = radio.dataset.maxPrice;
+    }
+    return params;
 }
 
 function renderProducts(products) {
@@ -443,6 +494,13 @@ function renderProducts(products) {
     if (container) {
         if (products && products.length > 0) {
             container.innerHTML = products.map(p => createProductCard(p)).join('');
+            if (nextProductsUrl) {
+                container.innerHTML += `
+                    <div class="col-12 text-center my-4">
+                        <button class="btn btn-outline-pink" onclick="loadMoreProducts()">Load More</button>
+                    </div>
+                `;
+            }
         } else {
             container.innerHTML = '<div class="col-12 text-center py-5"><p class="text-muted">No products found matching your criteria.</p></div>';
         }
@@ -462,7 +520,9 @@ function renderCategoryFilters(selectedCategoryId = null) {
                 <input class="form-check-input" type="radio" name="categoryFilter" 
                        id="catAll" value="" ${!selectedCategoryId ? 'checked' : ''}
                        onchange="filterByCategory('')">
-                <label class="form-check-label" for="catAll">All Categories</label>
+                <label class="form-check-label" for="catAll">
+                    All Categories ${catalogFacets ? `<span class="text-muted small">(${catalogFacets.total.products})</span>` : ''}
+                </label>
             </div>
         ` + allCategories.map(cat => `
             <div class="form-check">
@@ -470,12 +530,42 @@ function renderCategoryFilters(selectedCategoryId = null) {
                        id="cat${cat.id}" value="${cat.id}" 
                        ${selectedCategoryId == cat.id ? 'checked' : ''}
                        onchange="filterByCategory('${cat.id}')">
-                <label class="form-check-label" for="cat${cat.id}">${cat.name}</label>
+                <label class="form-check-label" for="cat${cat.id}">
+                    ${cat.name} ${cat.products !== undefined ? `<span class="text-muted small">(${cat.products})</span>` : ''}
+                </label>
             </div>
         `).join('');
     }
 }
 
+function renderPriceFilters(categoryId = null) {
+    // Selected category (বা সব) এর price bucket counts; selected bucket থাকে
+    const filterContainer = document.getElementById('priceFilters');
+    if (!filterContainer || !catalogFacets) return;
+    
+    const facet = catalogFacets.categories.find(cat => cat.id == categoryId) || catalogFacets.total;
+    const selected = document.querySelector('input[name="priceRange"]:checked');
+    const selectedKey = selected ? selected.value : '';
+    
+    filterContainer.innerHTML = `
+        <div class="form-check">
+            <input class="form-check-input" type="radio" name="priceRange" id="priceAll" value=""
+                   ${!selectedKey ? 'checked' : ''} onchange="applyFilters()">
+            <label class="form-check-label" for="priceAll">All Prices</label>
+        </div>
+    ` + facet.price_buckets.map((bucket, index) => `
+        <div class="form-check">
+            <input class="form-check-input" type="radio" name="priceRange"
+                   id="price${index + 1}" value="${bucket.key}"
+                   data-min-price="${bucket.min_price || ''}" data-max-price="${bucket.max_price || ''}"
+                   ${selectedKey === bucket.key ? 'checked' : ''} onchange="applyFilters()">
+            <label class="form-check-label" for="price${index + 1}">
+                ${bucket.label} <span class="text-muted small">(${bucket.count})</span>
+            </label>
+        </div>
+    `).join('');
+}
+
 function filterByCategory(categoryId) {
     // Update URL
     if (categoryId) {
@@ -484,6 +574,9 @@ function filterByCategory(categoryId) {
         window.history.pushState({}, '', '/products/');
     }
     
+    // Price counts selected category অনুযায়ী
+    renderPriceFilters(categoryId);
+    
     // Apply all filters
     applyFilters();
 }
@@ -509,10 +602,10 @@ function clearFilters() {
     
     // Update URL
     window.history.pushState({}, '', '/products/');
+    renderPriceFilters();
     
     // Show all products
-    filteredProducts = [...allProducts];
-    renderProducts(filteredProducts);
+    applyFilters();
 }
 
 
@@ -525,6 +618,13 @@ let currentProduct = null;
 async function initProductDetailPage(productId) {
     console.log('Initializing Product Detail Page for ID:', productId);
     
+    // Server rendered: product (বা না পাওয়া গেলে null) page এর সাথেই এসেছে
+    const initialProduct = readInitialData('initialProduct');
+    if (initialProduct !== undefined) {
+        currentProduct = initialProduct;
+        return;
+    }
+    
     try {
         currentProduct = await fetchProduct(productId);
         const container = document.getElementById('productDetail');